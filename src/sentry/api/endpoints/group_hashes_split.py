@@ -16,6 +16,7 @@ from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases import GroupEndpoint
 from sentry.api.serializers import EventSerializer, serialize
+from sentry.grouping.grouphash_cache import invalidate_grouphashes
 from sentry.grouping.variants import ComponentVariant
 from sentry.models.group import Group
 from sentry.models.grouphash import GroupHash
@@ -144,6 +145,7 @@ def _split_group(group: Group, hash: str, hierarchical_hashes: Sequence[str] | N
     grouphash.state = GroupHash.State.SPLIT
     grouphash.group_id = group.id
     grouphash.save()
+    invalidate_grouphashes(group.project_id, [hash])
 
 
 def _get_full_hierarchical_hashes(group: Group, hash: str) -> Sequence[str] | None:
@@ -221,6 +223,11 @@ def _unsplit_group(group: Group, hash: str, hierarchical_hashes: Sequence[str] |
         if grouphash_to_delete is not None:
             grouphash_to_delete.delete()
 
+        invalidate_grouphashes(
+            group.project_id,
+            [gh.hash for gh in (grouphash_to_unsplit, grouphash_to_delete) if gh is not None],
+        )
+
 
 def _get_group_filters(group: Group):
     return [
@@ -6,6 +6,7 @@ from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases import ProjectEndpoint
 from sentry.api.exceptions import ResourceDoesNotExist
+from sentry.grouping.grouphash_cache import invalidate_grouphashes
 from sentry.models.grouphash import GroupHash
 from sentry.models.grouptombstone import GroupTombstone
 
@@ -36,10 +37,16 @@ class GroupTombstoneDetailsEndpoint(ProjectEndpoint):
         except GroupTombstone.DoesNotExist:
             raise ResourceDoesNotExist
 
+        grouphashes = list(
+            GroupHash.objects.filter(
+                project_id=project.id, group_tombstone_id=tombstone_id
+            ).values_list("hash", flat=True)
+        )
         GroupHash.objects.filter(project_id=project.id, group_tombstone_id=tombstone_id).update(
             # will allow new events to be captured
             group_tombstone_id=None
         )
+        invalidate_grouphashes(project.id, grouphashes)
 
         tombstone.delete()
 
@@ -20,6 +20,7 @@ from sentry import analytics, features, options
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.db.models.query import create_or_update
+from sentry.grouping.grouphash_cache import invalidate_grouphashes
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.ignored import handle_archived_until_escalating, handle_ignored
 from sentry.issues.merge import handle_merge
@@ -93,9 +94,13 @@ def handle_discard(
             else:
                 groups_to_delete[group.project_id].append(group)
 
+                grouphashes = list(
+                    GroupHash.objects.filter(group=group).values_list("hash", flat=True)
+                )
                 GroupHash.objects.filter(group=group).update(
                     group=None, group_tombstone_id=tombstone.id
                 )
+                invalidate_grouphashes(group.project_id, grouphashes)
 
     for project in projects:
         delete_group_list(
@@ -1,6 +1,8 @@
+from collections.abc import Sequence
 from datetime import date, datetime
-from typing import Any
+from typing import Any, NamedTuple
 
+from django.db import connections, router
 from django.db.models import F
 
 from sentry.db import models
@@ -9,6 +11,75 @@ from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
 
 
+class BufferedUpdate(NamedTuple):
+    columns: dict[str, int]
+    filters: dict[str, str | datetime | date | int | float]
+    extra: dict[str, Any] | None = None
+    signal_only: bool | None = None
+
+
+def _bulk_update_by_pk(
+    model: type[models.Model], columns: Sequence[str], extra: Sequence[str], updates: Sequence[Any]
+) -> list[Any]:
+    """
+    Applies many buffered updates sharing the same set of columns to rows of
+    ``model`` with one ``UPDATE ... FROM (VALUES ...)`` statement. ``updates``
+    is a sequence of ``(pk, BufferedUpdate)`` tuples. Returns the primary keys
+    of the rows that were updated; rows that no longer exist are skipped.
+    """
+    from sentry.models.group import Group
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+
+    opts = model._meta
+    table = qn(opts.db_table)
+    pk_field = opts.pk
+    incr_fields = [opts.get_field(name) for name in columns]
+    extra_fields = [opts.get_field(name) for name in extra]
+    value_fields = [pk_field, *incr_fields, *extra_fields]
+
+    assignments = [
+        f"{qn(f.column)} = {table}.{qn(f.column)} + v.{qn(f.column)}" for f in incr_fields
+    ]
+    assignments.extend(f"{qn(f.column)} = v.{qn(f.column)}" for f in extra_fields)
+
+    # HACK(dcramer): mirrors the `ScoreClause` special case in `Buffer.process`
+    if model is Group and "last_seen" in extra and "times_seen" in columns:
+        assignments.append(
+            f"{qn('score')} = log({table}.{qn('times_seen')} + v.{qn('times_seen')}) * 600"
+            f" + floor(extract(epoch from v.{qn('last_seen')}))"
+        )
+
+    template = "({})".format(", ".join(f"%s::{f.rel_db_type(connection)}" for f in value_fields))
+    sql = """
+        UPDATE {table} SET {assignments}
+        FROM (VALUES {values}) AS v ({names})
+        WHERE {table}.{pk} = v.{pk}
+        RETURNING {table}.{pk}
+    """.format(
+        table=table,
+        assignments=", ".join(assignments),
+        values=", ".join([template] * len(updates)),
+        names=", ".join(qn(f.column) for f in value_fields),
+        pk=qn(pk_field.column),
+    )
+
+    params = []
+    for pk, update in updates:
+        params.append(pk_field.get_db_prep_save(pk, connection))
+        params.extend(f.get_db_prep_save(update.columns[f.name], connection) for f in incr_fields)
+        params.extend(f.get_db_prep_save(update.extra[f.name], connection) for f in extra_fields)
+
+    # Executed through Django's cursor wrapper (rather than psycopg2's
+    # `execute_values`), so that the query is seen by execute wrappers and
+    # query logging like any other.
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [r[0] for r in cursor.fetchall()]
+
+
 class Buffer(Service):
     """
     Buffers act as temporary stores for counters. The default implementation is just a passthru and
@@ -23,7 +94,20 @@ class Buffer(Service):
     keep up with the updates.
     """
 
-    __all__ = ("get", "incr", "process", "process_pending", "validate")
+    __all__ = (
+        "get",
+        "incr",
+        "flush",
+        "process",
+        "process_pending",
+        "validate",
+        "push_to_sorted_set",
+        "get_sorted_set",
+        "delete_key",
+        "push_to_hash",
+        "get_hash",
+        "delete_hash",
+    )
 
     def get(
         self,
@@ -61,9 +145,102 @@ class Buffer(Service):
             }
         )
 
+    def flush(self) -> None:
+        """
+        Writes out any increments held in-process by the buffer. Backends that
+        do not pre-aggregate increments have nothing to flush.
+        """
+        return
+
     def process_pending(self, partition: int | None = None) -> None:
         return
 
+    def push_to_sorted_set(self, key: str, value: int | str) -> None:
+        """
+        Adds ``value`` to the sorted set at ``key``, scored by the current
+        time. The base implementation does not store anything.
+        """
+        return
+
+    def get_sorted_set(self, key: str, min: float, max: float) -> list[tuple[int, float]]:
+        return []
+
+    def delete_key(self, key: str, min: float, max: float) -> None:
+        return
+
+    def push_to_hash(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        field: str,
+        value: str,
+    ) -> None:
+        return
+
+    def get_hash(
+        self, model: type[models.Model], field: dict[str, models.Model | str | int]
+    ) -> dict[str, str]:
+        return {}
+
+    def delete_hash(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        fields: list[str],
+    ) -> None:
+        return
+
+    def process_batch(self, model: type[models.Model], updates: Sequence[BufferedUpdate]) -> None:
+        """
+        Applies many buffered updates for ``model`` at once. Updates which
+        target a single row by primary key are written with one multi-row
+        ``UPDATE`` per distinct set of columns; everything else (signal only
+        updates, updates that might need to create the row) goes through
+        ``process`` one by one.
+        """
+        from sentry.models.group import Group
+
+        pk_names = ("pk", model._meta.pk.name)
+        grouped: dict[tuple[tuple[str, ...], tuple[str, ...]], list[Any]] = {}
+        seen_pks = set()
+        remainder = []
+        for update in updates:
+            pk = None
+            if len(update.filters) == 1 and not update.signal_only:
+                ((name, value),) = update.filters.items()
+                if name in pk_names:
+                    pk = value
+
+            # a row can only be joined once per statement
+            if pk is None or pk in seen_pks or not (update.columns or update.extra):
+                remainder.append(update)
+                continue
+
+            seen_pks.add(pk)
+            shape = (tuple(sorted(update.columns)), tuple(sorted(update.extra or ())))
+            grouped.setdefault(shape, []).append((pk, update))
+
+        for (columns, extra), batch in grouped.items():
+            updated = set(_bulk_update_by_pk(model, columns, extra, batch))
+            for pk, update in batch:
+                if pk not in updated:
+                    # If the row was deleted by the time we flush buffers we don't care
+                    continue
+                if model is Group:
+                    # `Group.update` would have pushed the new state into the cache
+                    Group.objects.uncache_object(pk)
+                buffer_incr_complete.send_robust(
+                    model=model,
+                    columns=update.columns,
+                    filters=update.filters,
+                    extra=update.extra,
+                    created=False,
+                    sender=model,
+                )
+
+        for update in remainder:
+            self.process(model, update.columns, update.filters, update.extra, update.signal_only)
+
     def process(
         self,
         model: type[models.Model],
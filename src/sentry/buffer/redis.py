@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import os
 import pickle
 import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from time import time
 from typing import Any
 
 from django.utils.encoding import force_bytes, force_str
 
-from sentry.buffer.base import Buffer
+from sentry.buffer.base import Buffer, BufferedUpdate
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr, process_pending
 from sentry.utils import json, metrics
@@ -76,18 +80,107 @@ class PendingBuffer:
         return rv
 
 
+@dataclass
+class CoalescedIncr:
+    """
+    In-process aggregate of all ``incr`` calls made against a single buffer
+    key since the last flush.
+    """
+
+    model: type[models.Model]
+    filters: dict[str, models.Model | str | int]
+    columns: dict[str, int] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    signal_only: bool = False
+    calls: int = 0
+
+    def merge(
+        self,
+        columns: dict[str, int],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+    ) -> None:
+        for column, amount in columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        if extra:
+            # last write wins, same as the ``hset`` done against Redis
+            self.extra.update(extra)
+        if signal_only is True:
+            self.signal_only = True
+        self.calls += 1
+
+    def merge_older(self, older: CoalescedIncr) -> None:
+        """
+        Folds the increments of an earlier, unwritten aggregate for the same
+        key back into this one.
+        """
+        for column, amount in older.columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        # the extra values of this aggregate are the more recent ones
+        self.extra = {**older.extra, **self.extra}
+        self.signal_only = self.signal_only or older.signal_only
+        self.calls += older.calls
+
+
 class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
+    # how long increments are held back at most if only `incr_coalesce_size`
+    # is set, so that a key that goes quiet is still written out
+    incr_coalesce_max_delay = 1.0
 
-    def __init__(self, pending_partitions: int = 1, incr_batch_size: int = 2, **options: object):
+    def __init__(
+        self,
+        pending_partitions: int = 1,
+        incr_batch_size: int = 2,
+        incr_coalesce_size: int = 0,
+        incr_coalesce_window: float = 0.0,
+        process_bulk: bool = False,
+        **options: object,
+    ):
+        """
+        ``incr_coalesce_size`` and ``incr_coalesce_window`` enable in-process
+        pre-aggregation of ``incr`` calls. When either is set, increments for
+        the same (model, filters) key are merged in memory and written to Redis
+        in one pipeline per node once ``incr_coalesce_size`` calls have been
+        buffered or ``incr_coalesce_window`` seconds have elapsed since the
+        first buffered call, whichever comes first. The writes are done by a
+        background thread of each process, so that ``incr`` never waits on
+        Redis and a key that goes quiet is not held back until the next
+        ``incr``. Increments that fail to be written are kept for the next
+        attempt, and anything still buffered is written out at interpreter
+        shutdown.
+
+        ``process_bulk`` makes each ``process_incr`` task read all of its
+        ``batch_keys`` with one pipeline per node and write them to the
+        database with one multi-row update per model, instead of handling the
+        keys one at a time. It pairs well with a larger ``incr_batch_size``.
+        """
         self.is_redis_cluster, self.cluster, options = get_dynamic_cluster_from_options(
             "SENTRY_BUFFER_OPTIONS", options
         )
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        self.incr_coalesce_size = incr_coalesce_size
+        self.incr_coalesce_window = incr_coalesce_window
+        self.process_bulk = process_bulk
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
+        assert self.incr_coalesce_size >= 0
+        assert self.incr_coalesce_window >= 0
+
+        self._coalesced: dict[str, CoalescedIncr] = {}
+        self._coalesced_calls = 0
+        self._coalesced_since: float | None = None
+        self._coalesced_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._flusher_pid: int | None = None
+        if self.coalesce_enabled:
+            atexit.register(self._flush_at_exit)
+
+    @property
+    def coalesce_enabled(self) -> bool:
+        return self.incr_coalesce_size > 0 or self.incr_coalesce_window > 0
 
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
@@ -98,7 +191,10 @@ class RedisBuffer(Buffer):
         return force_bytes(value, errors="replace")
 
     def _make_key(
-        self, model: type[models.Model], filters: dict[str, models.Model | str | int]
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        prefix: str = "b:k",
     ) -> str:
         """
         Returns a Redis-compatible key for the model given filters.
@@ -106,7 +202,22 @@ class RedisBuffer(Buffer):
         md5 = md5_text(
             "&".join(f"{k}={self._coerce_val(v)!r}" for k, v in sorted(filters.items()))
         ).hexdigest()
-        return f"b:k:{model._meta}:{md5}"
+        return f"{prefix}:{model._meta}:{md5}"
+
+    def _make_hash_key(
+        self, model: type[models.Model], filters: dict[str, models.Model | str | int]
+    ) -> str:
+        # Kept apart from the counter keys, which `process` expects to hold
+        # buffered increments only.
+        return self._make_key(model, filters, prefix="b:h")
+
+    def _get_client_for_key(self, key: str) -> Any:
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            return self.cluster
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            return self.cluster.get_local_client_for_key(key)
+        else:
+            raise AssertionError("unreachable")
 
     def _make_pending_key(self, partition: int | None = None) -> str:
         """
@@ -204,8 +315,13 @@ class RedisBuffer(Buffer):
             pipe.hget(key, f"i+{col}")
         results = pipe.execute()
 
+        with self._coalesced_lock:
+            pending = self._coalesced.get(key)
+            local = dict(pending.columns) if pending is not None else {}
+
         return {
-            col: (int(results[i]) if results[i] is not None else 0) for i, col in enumerate(columns)
+            col: (int(results[i]) if results[i] is not None else 0) + local.get(col, 0)
+            for i, col in enumerate(columns)
         }
 
     def incr(
@@ -225,20 +341,50 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
             - Perform a set on signal_only (only if True)
         - Add hashmap key to pending flushes
+
+        If coalescing is enabled the increment is merged into the in-process
+        aggregate for the key instead, and only written to Redis on flush.
         """
 
         key = self._make_key(model, filters)
-        pending_key = self._make_pending_key_from_key(key)
-        # We can't use conn.map() due to wanting to support multiple pending
-        # keys (one per Redis partition)
-        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-            conn = self.cluster
-        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
-            conn = self.cluster.get_local_client_for_key(key)
+
+        if self.coalesce_enabled:
+            self._coalesce_incr(key, model, columns, filters, extra, signal_only)
         else:
-            raise AssertionError("unreachable")
+            # We can't use conn.map() due to wanting to support multiple pending
+            # keys (one per Redis partition)
+            if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                conn = self.cluster
+            elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+                conn = self.cluster.get_local_client_for_key(key)
+            else:
+                raise AssertionError("unreachable")
+
+            pipe = conn.pipeline()
+            self._queue_incr(pipe, key, model, columns, filters, extra, signal_only)
+            pipe.execute()
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+    def _queue_incr(
+        self,
+        pipe: Any,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, models.Model | str | int],
+        extra: dict[str, Any] | None = None,
+        signal_only: bool | None = None,
+    ) -> None:
+        """
+        Queues the commands for a single key increment onto ``pipe``.
+        """
+        pending_key = self._make_pending_key_from_key(key)
 
-        pipe = conn.pipeline()
         pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
         _validate_json_roundtrip(filters, model)
 
@@ -266,13 +412,213 @@ class RedisBuffer(Buffer):
 
         pipe.expire(key, self.key_expire)
         pipe.zadd(pending_key, {key: time()})
+
+    def _coalesce_incr(
+        self,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, models.Model | str | int],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+    ) -> None:
+        with self._coalesced_lock:
+            now = time()
+            if self._coalesced_since is None:
+                self._coalesced_since = now
+
+            pending = self._coalesced.get(key)
+            if pending is None:
+                pending = self._coalesced[key] = CoalescedIncr(model=model, filters=filters)
+            pending.merge(columns, extra, signal_only)
+            self._coalesced_calls += 1
+            size_reached = (
+                self.incr_coalesce_size > 0 and self._coalesced_calls >= self.incr_coalesce_size
+            )
+
+        self._ensure_flusher()
+        if size_reached:
+            self._flush_requested.set()
+
+    @property
+    def _coalesce_delay(self) -> float:
+        return self.incr_coalesce_window or self.incr_coalesce_max_delay
+
+    def _ensure_flusher(self) -> None:
+        # threads don't survive a fork, so every process needs its own
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._coalesced_lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        thread = threading.Thread(target=self._run_flusher, name="buffer-incr-flusher", daemon=True)
+        thread.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            with self._coalesced_lock:
+                since = self._coalesced_since
+            if since is None:
+                timeout = self._coalesce_delay
+            else:
+                timeout = max(since + self._coalesce_delay - time(), 0)
+            self._flush_requested.wait(timeout)
+            self._flush_requested.clear()
+            try:
+                self._flush_due()
+            except Exception:
+                logger.exception("buffer.incr.coalesce-flush-error")
+
+    def _flush_due(self) -> None:
+        """
+        Writes the buffered increments out to Redis if enough calls have been
+        buffered or the oldest of them has been held back long enough.
+        """
+        with self._coalesced_lock:
+            if self._coalesced_since is None:
+                return
+            due = (
+                self.incr_coalesce_size > 0 and self._coalesced_calls >= self.incr_coalesce_size
+            ) or time() - self._coalesced_since >= self._coalesce_delay
+            if not due:
+                return
+            batch, calls = self._take_coalesced()
+
+        self._flush_coalesced(batch, calls)
+
+    def _take_coalesced(self) -> tuple[dict[str, CoalescedIncr], int]:
+        # must be called with ``_coalesced_lock`` held
+        batch, calls = self._coalesced, self._coalesced_calls
+        self._coalesced = {}
+        self._coalesced_calls = 0
+        self._coalesced_since = None
+        return batch, calls
+
+    def flush(self) -> None:
+        """
+        Writes all increments buffered in-process out to Redis.
+        """
+        with self._coalesced_lock:
+            batch, calls = self._take_coalesced()
+        self._flush_coalesced(batch, calls)
+
+    def _flush_at_exit(self) -> None:
+        self.flush()
+        with self._coalesced_lock:
+            lost, calls = self._take_coalesced()
+        if lost:
+            logger.error("buffer.incr.coalesce-lost", extra={"keys": len(lost), "calls": calls})
+            metrics.incr("buffer.incr.coalesce-lost", amount=calls)
+
+    def _restore_coalesced(self, batch: dict[str, CoalescedIncr]) -> None:
+        """
+        Puts increments that could not be written back into the in-process
+        buffer, ahead of anything buffered since.
+        """
+        with self._coalesced_lock:
+            if self._coalesced_since is None:
+                self._coalesced_since = time()
+            for key, older in batch.items():
+                pending = self._coalesced.get(key)
+                if pending is None:
+                    self._coalesced[key] = older
+                else:
+                    pending.merge_older(older)
+                self._coalesced_calls += older.calls
+
+    def _flush_coalesced(self, batch: dict[str, CoalescedIncr], calls: int) -> None:
+        if not batch:
+            return
+
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            # the cluster pipeline routes each command to its node itself
+            pipelines = [(self.cluster.pipeline(transaction=False), list(batch))]
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            router = self.cluster.get_router()
+            hosts: dict[int, list[str]] = defaultdict(list)
+            for key in batch:
+                hosts[router.get_host_for_key(key)].append(key)
+            pipelines = [
+                (self.cluster.get_local_client(host).pipeline(), keys)
+                for host, keys in hosts.items()
+            ]
+        else:
+            raise AssertionError("unreachable")
+
+        failed: dict[str, CoalescedIncr] = {}
+        for pipe, keys in pipelines:
+            try:
+                for key in keys:
+                    pending = batch[key]
+                    self._queue_incr(
+                        pipe,
+                        key,
+                        pending.model,
+                        pending.columns,
+                        pending.filters,
+                        pending.extra,
+                        pending.signal_only,
+                    )
+                pipe.execute()
+            except Exception:
+                logger.exception("buffer.incr.coalesce-flush-failed", extra={"keys": len(keys)})
+                failed.update((key, batch[key]) for key in keys)
+
+        if failed:
+            metrics.incr("buffer.incr.coalesce-flush-failed", amount=len(failed))
+            self._restore_coalesced(failed)
+
+        metrics.distribution("buffer.incr.coalesced-calls", calls)
+        metrics.distribution("buffer.incr.coalesced-keys", len(batch))
+        metrics.distribution("buffer.incr.coalesce-ratio", calls / len(batch))
+
+    def push_to_sorted_set(self, key: str, value: int | str) -> None:
+        self._get_client_for_key(key).zadd(key, {value: time()})
+
+    def get_sorted_set(self, key: str, min: float, max: float) -> list[tuple[int, float]]:
+        results = self._get_client_for_key(key).zrangebyscore(key, min, max, withscores=True)
+        return [(int(value), score) for value, score in results]
+
+    def delete_key(self, key: str, min: float, max: float) -> None:
+        self._get_client_for_key(key).zremrangebyscore(key, min, max)
+
+    def push_to_hash(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        field: str,
+        value: str,
+    ) -> None:
+        key = self._make_hash_key(model, filters)
+        pipe = self._get_client_for_key(key).pipeline()
+        pipe.hset(key, field, value)
+        pipe.expire(key, self.key_expire)
         pipe.execute()
 
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
-        )
+    def get_hash(
+        self, model: type[models.Model], field: dict[str, models.Model | str | int]
+    ) -> dict[str, str]:
+        key = self._make_hash_key(model, field)
+        return {
+            force_str(k): force_str(v)
+            for k, v in self._get_client_for_key(key).hgetall(key).items()
+        }
+
+    def delete_hash(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        fields: list[str],
+    ) -> None:
+        if not fields:
+            return
+        key = self._make_hash_key(model, filters)
+        self._get_client_for_key(key).hdel(key, *fields)
 
     def process_pending(self, partition: int | None = None) -> None:
         if partition is None and self.pending_partitions > 1:
@@ -340,8 +686,11 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
-            for key in batch_keys:
-                self._process_single_incr(key)
+            if self.process_bulk and len(batch_keys) > 1:
+                self._process_batch_incr(batch_keys)
+            else:
+                for key in batch_keys:
+                    self._process_single_incr(key)
 
     def _process(
         self,
@@ -353,6 +702,50 @@ class RedisBuffer(Buffer):
     ) -> Any:
         return super().process(model, columns, filters, extra, signal_only)
 
+    def _process_batch(self, model: type[models.Model], updates: list[BufferedUpdate]) -> None:
+        super().process_batch(model, updates)
+
+    def _load_buffered_update(
+        self, key: str, values: dict[Any, Any]
+    ) -> tuple[type[models.Model], BufferedUpdate] | None:
+        """
+        Decodes the contents of a buffer hash as returned by ``hgetall``.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, BufferedUpdate(incr_values, filters, extra_values, signal_only)
+
     def _process_single_incr(self, key: str) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._make_lock_key(key)
@@ -378,39 +771,101 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            loaded = self._load_buffered_update(key, values)
+            if loaded is None:
                 return
 
-            model = import_string(force_str(values.pop("m")))
+            model, update = loaded
+            self._process(model, update.columns, update.filters, update.extra, update.signal_only)
+        finally:
+            client.delete(lock_key)
+
+    def _process_batch_incr(self, keys: list[str]) -> None:
+        """
+        Bulk version of ``_process_single_incr``: locks, reads and deletes all
+        keys with one pipeline per Redis node and applies the resulting updates
+        grouped by model.
+        """
+        lock_keys = {key: self._make_lock_key(key) for key in keys}
 
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        # prevent a stampede due to the way we use celery etas + duplicate
+        # tasks
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys.values():
+                pipe.set(lock_key, "1", nx=True, ex=10)
+            acquired = pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.map() as conn:
+                promises = [
+                    conn.set(lock_key, "1", nx=True, ex=10) for lock_key in lock_keys.values()
+                ]
+            acquired = [promise.value for promise in promises]
+        else:
+            raise AssertionError("unreachable")
+
+        locked_keys = []
+        for key, was_acquired in zip(keys, acquired):
+            if was_acquired:
+                locked_keys.append(key)
+            else:
+                metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+
+        if not locked_keys:
+            return
+
+        try:
+            if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                # the cluster pipeline routes each command to its node itself
+                pipe = self.cluster.pipeline(transaction=False)
+                for key in locked_keys:
+                    pipe.hgetall(key)
+                    pipe.zrem(self._make_pending_key_from_key(key), key)
+                    pipe.delete(key)
+                results = pipe.execute()
+                values_by_key = dict(zip(locked_keys, results[::3]))
+            elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+                # the pending set lives on the same host as the key (see
+                # `incr`), so route by the key rather than the pending key
+                router = self.cluster.get_router()
+                hosts: dict[int, list[str]] = defaultdict(list)
+                for key in locked_keys:
+                    hosts[router.get_host_for_key(key)].append(key)
+
+                values_by_key = {}
+                for host, host_keys in hosts.items():
+                    pipe = self.cluster.get_local_client(host).pipeline()
+                    for key in host_keys:
+                        pipe.hgetall(key)
+                        pipe.zrem(self._make_pending_key_from_key(key), key)
+                        pipe.delete(key)
+                    results = pipe.execute()
+                    values_by_key.update(zip(host_keys, results[::3]))
             else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+                raise AssertionError("unreachable")
+
+            updates_by_model: dict[type[models.Model], list[BufferedUpdate]] = defaultdict(list)
+            for key in locked_keys:
+                loaded = self._load_buffered_update(key, values_by_key[key])
+                if loaded is not None:
+                    model, update = loaded
+                    updates_by_model[model].append(update)
+
+            for model, updates in updates_by_model.items():
+                metrics.distribution(
+                    "buffer.process-batch-size",
+                    len(updates),
+                    tags={"module": model.__module__, "model": model.__name__},
+                )
+                self._process_batch(model, updates)
         finally:
-            client.delete(lock_key)
+            if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                pipe = self.cluster.pipeline(transaction=False)
+                for key in locked_keys:
+                    pipe.delete(lock_keys[key])
+                pipe.execute()
+            else:
+                with self.cluster.map() as conn:
+                    for key in locked_keys:
+                        conn.delete(lock_keys[key])
@@ -734,6 +734,7 @@ CELERY_IMPORTS = (
     "sentry.incidents.tasks",
     "sentry.snuba.tasks",
     "sentry.replays.tasks",
+    "sentry.rules.delayed_processing",
     "sentry.monitors.tasks.clock_pulse",
     "sentry.monitors.tasks.check_missed",
     "sentry.monitors.tasks.check_timeout",
@@ -848,6 +849,7 @@ CELERY_QUEUES_REGION = [
     Queue("cleanup", routing_key="cleanup"),
     Queue("code_owners", routing_key="code_owners"),
     Queue("commits", routing_key="commits"),
+    Queue("delayed_rules", routing_key="delayed_rules"),
     Queue("data_export", routing_key="data_export"),
     Queue("default", routing_key="default"),
     Queue("digests.delivery", routing_key="digests.delivery"),
@@ -1018,6 +1020,12 @@ CELERYBEAT_SCHEDULE_REGION = {
         "schedule": timedelta(seconds=10),
         "options": {"expires": 10, "queue": "buffers.process_pending"},
     },
+    "schedule-delayed-rule-processing": {
+        "task": "sentry.rules.delayed_processing.process_delayed_alert_conditions",
+        # Run every 1 minute
+        "schedule": crontab(minute="*/1"),
+        "options": {"expires": 60},
+    },
     "sync-options": {
         "task": "sentry.tasks.options.sync_options",
         # Run every 10 seconds
@@ -2255,6 +2263,15 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
 
+# Directory holding the trained zstd dictionaries used to compress nodestore
+# values, see `sentry.nodestore.dictionaries`.
+SENTRY_NODESTORE_DICTIONARY_DIR: str | None = None
+
+# Size in bytes (of encoded values) and TTL in seconds of the process-local
+# cache of decoded nodes in front of the `nodedata` cache. Disabled if 0.
+SENTRY_NODESTORE_LOCAL_CACHE_SIZE = 0
+SENTRY_NODESTORE_LOCAL_CACHE_TTL = 60
+
 # Node storage backend used for ArtifactBundle indexing (aka FlatFileIndex aka BundleIndex)
 SENTRY_INDEXSTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_INDEXSTORE_OPTIONS: dict[str, Any] = {}
@@ -123,6 +123,9 @@ def ingest_events_options() -> list[click.Option]:
     that were already persisted in the `processing_store` will be processed.
     Events that never made it to the store, and ones that already made it out of the store are skipped,
     same as attachments (which are not idempotent, and we would rather not duplicate them).
+
+    It also adds `--save-batch-size` and `--save-batch-time`, to save transaction events in batches
+    per project instead of one by one.
     """
     options = multiprocessing_options(default_max_batch_size=100)
     options.append(
@@ -133,6 +136,22 @@ def ingest_events_options() -> list[click.Option]:
             default=False,
         )
     )
+    options.append(
+        click.Option(
+            ["--save-batch-size", "save_batch_size"],
+            type=int,
+            default=None,
+            help="Save transaction events in batches of up to this many events per project.",
+        )
+    )
+    options.append(
+        click.Option(
+            ["--save-batch-time", "save_batch_time"],
+            type=float,
+            default=1.0,
+            help="Maximum time in seconds to collect a batch of transaction events to save.",
+        )
+    )
     return options
 
 
@@ -185,6 +204,18 @@ _POST_PROCESS_FORWARDER_OPTIONS = multiprocessing_options(
         type=click.Choice(["multithreaded", "multiprocess"]),
         help="Mode to run post process forwarder in.",
     ),
+    click.Option(
+        ["--post-process-batch-size", "post_process_batch_size"],
+        type=int,
+        default=None,
+        help="Post process events in batches of up to this many events per queue.",
+    ),
+    click.Option(
+        ["--post-process-batch-time", "post_process_batch_time"],
+        type=float,
+        default=1.0,
+        help="Maximum time in seconds to collect a batch of events to post process.",
+    ),
 ]
 
 # consumer name -> consumer definition
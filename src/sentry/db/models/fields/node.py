@@ -90,6 +90,13 @@ class NodeData(MutableMapping):
             return f"<{cls_name}: id={self.id} data={self._node_data!r}>"
         return f"<{cls_name}: id={self.id}>"
 
+    @property
+    def bound(self):
+        """
+        Whether the data was given or already fetched from nodestore.
+        """
+        return self._node_data is not None
+
     def get_ref(self, instance):
         if not self.ref_func:
             return
@@ -5,6 +5,7 @@ from collections import defaultdict
 
 from sentry import eventstore, eventstream, models, nodestore
 from sentry.eventstore.models import Event
+from sentry.grouping.grouphash_cache import invalidate_grouphashes
 from sentry.models.rulefirehistory import RuleFireHistory
 
 from ..base import BaseDeletionTask, BaseRelation, ModelDeletionTask, ModelRelation
@@ -127,6 +128,11 @@ class GroupDeletionTask(ModelDeletionTask):
         self.mark_deletion_in_progress(instance_list)
 
         group_ids = [group.id for group in instance_list]
+        grouphashes = list(
+            models.GroupHash.objects.filter(group_id__in=group_ids).values_list(
+                "project_id", "hash"
+            )
+        )
 
         # Remove child relations for all groups first.
         child_relations: list[BaseRelation] = []
@@ -141,6 +147,12 @@ class GroupDeletionTask(ModelDeletionTask):
 
         self.delete_children(child_relations)
 
+        hashes_by_project = defaultdict(list)
+        for project_id, hash in grouphashes:
+            hashes_by_project[project_id].append(hash)
+        for project_id, hashes in hashes_by_project.items():
+            invalidate_grouphashes(project_id, hashes)
+
         # Remove group objects with children removed.
         return self.delete_instance_bulk(instance_list)
 
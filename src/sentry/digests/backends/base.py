@@ -16,7 +16,7 @@ def load(options: Mapping[str, str]) -> Any:
     return import_string(options["path"])(**options.get("options", {}))
 
 
-DEFAULT_CODEC = {"path": "sentry.digests.codecs.CompressedPickleCodec"}
+DEFAULT_CODEC = {"path": "sentry.digests.codecs.NotificationCodec"}
 
 
 class InvalidState(Exception):
@@ -59,7 +59,16 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options: Any) -> None:
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -169,6 +178,34 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    def digest_many(
+        self, minimum_delays: Mapping[str, int | None], timestamp: float | None = None
+    ) -> Any:
+        """
+        Extract the contents of many timelines at once, keyed by timeline.
+
+        ``minimum_delays`` maps the keys of the timelines to digest to their
+        minimum delay (``None`` for the backend default). Like ``digest``, this
+        acts as a context manager. The target of the ``as`` clause is a
+        dictionary from key to the records of every timeline that could be
+        opened; timelines that are locked or not in the "ready" state are left
+        out.
+
+        Timelines are closed when the context manager exits, unless their key
+        was removed from the dictionary within the block, in which case their
+        records are preserved like after a failed ``digest``. After the block,
+        the dictionary only contains the timelines that were closed, so that
+        irrevocable actions can be limited to those::
+
+            with timelines.digest_many({'project:1': None}) as digests:
+                messages = {key: build_digest_email(records) for key, records in digests.items()}
+
+            for key in digests:
+                messages[key].send_async()
+
+        """
+        raise NotImplementedError
+
     def schedule(
         self, deadline: float, timestamp: float | None = None
     ) -> Iterable["ScheduleEntry"]:
@@ -1,7 +1,8 @@
 import logging
 import time
-from collections.abc import Iterable
-from contextlib import contextmanager
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from contextlib import ExitStack, contextmanager
 from typing import Any
 
 import rb
@@ -10,6 +11,8 @@ from redis.exceptions import ResponseError
 
 from sentry.digests import Record, ScheduleEntry
 from sentry.digests.backends.base import Backend, InvalidState
+from sentry.utils import metrics
+from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.backends.redis import RedisLockBackend
 from sentry.utils.locking.lock import Lock
 from sentry.utils.locking.manager import LockManager
@@ -71,6 +74,9 @@ class RedisBackend(Backend):
 
     """
 
+    # Seconds `digest_many` locks its timelines for, per timeline.
+    digest_many_lock_duration_per_timeline = 5
+
     def __init__(self, **options: Any) -> None:
         cluster, options = get_cluster_from_options("SENTRY_DIGESTS_OPTIONS", options)
         assert isinstance(cluster, rb.Cluster)
@@ -188,6 +194,34 @@ class RedisBackend(Backend):
                     error,
                 )
 
+    def __decode_records(
+        self, response: Iterable[tuple[bytes, bytes | None, bytes]]
+    ) -> list[Record]:
+        return [
+            Record(
+                key.decode(),
+                self.codec.decode(value) if value is not None else None,
+                float(timestamp),
+            )
+            for key, value, timestamp in response
+        ]
+
+    def __filter_missing_records(self, key: str, records: list[Record]) -> list[Record]:
+        # If the record value is `None`, this means the record data was
+        # missing (it was presumably evicted by Redis) so we don't need to
+        # return it here.
+        filtered_records = [record for record in records if record.value is not None]
+        if len(records) != len(filtered_records):
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(records),
+                    "filtered_record_count": len(filtered_records),
+                },
+            )
+        return filtered_records
+
     @contextmanager
     def digest(
         self, key: str, minimum_delay: int | None = None, timestamp: float | None = None
@@ -219,29 +253,8 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
-            ]
-
-            # If the record value is `None`, this means the record data was
-            # missing (it was presumably evicted by Redis) so we don't need to
-            # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
-            yield filtered_records
+            records = self.__decode_records(response)
+            yield self.__filter_missing_records(key, records)
 
             script(
                 connection,
@@ -250,6 +263,113 @@ class RedisBackend(Backend):
                 + [record.key for record in records],
             )
 
+    @contextmanager
+    def digest_many(
+        self, minimum_delays: Mapping[str, int | None], timestamp: float | None = None
+    ) -> Any:
+        if timestamp is None:
+            timestamp = time.time()
+
+        router = self.cluster.get_router()
+
+        # The timelines stay locked while all of their digests are built, so
+        # the locks are held for longer the more timelines there are.
+        lock_duration = max(30, self.digest_many_lock_duration_per_timeline * len(minimum_delays))
+        lock_deadline = time.monotonic() + lock_duration
+
+        with ExitStack() as locks:
+            keys_by_host: dict[int, list[str]] = defaultdict(list)
+            for key in minimum_delays:
+                try:
+                    locks.enter_context(
+                        self._get_timeline_lock(key, duration=lock_duration).acquire()
+                    )
+                except UnableToAcquireLock:
+                    logger.info("Skipped digest of locked timeline", extra={"key": key})
+                    continue
+                keys_by_host[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+            # All timelines of a host are opened and closed with one script
+            # call each, see `schedule`.
+            records_by_key: dict[str, list[Record]] = {}
+            record_keys: dict[str, list[str]] = {}
+            for host, keys in keys_by_host.items():
+                try:
+                    response = script(
+                        self.cluster.get_local_client(host),
+                        ["-"],
+                        [
+                            "DIGEST_OPEN_MANY",
+                            self.namespace,
+                            self.ttl,
+                            timestamp,
+                            self.capacity if self.capacity else -1,
+                            *keys,
+                        ],
+                    )
+                except Exception as error:
+                    logger.exception(
+                        "Failed to open digests on partition %s due to error: %s", host, error
+                    )
+                    continue
+
+                for key, ready, timeline_response in response:
+                    key = key.decode("utf-8")
+                    if not ready:
+                        logger.info(
+                            "Skipped digest delivery: Timeline is not in the ready state.",
+                            extra={"key": key},
+                        )
+                        continue
+                    records = self.__decode_records(timeline_response)
+                    record_keys[key] = [record.key for record in records]
+                    records_by_key[key] = self.__filter_missing_records(key, records)
+
+            yield records_by_key
+
+            if time.monotonic() >= lock_deadline:
+                # The locks may have expired and the timelines been digested
+                # by someone else since, so they must not be closed (or
+                # delivered) by us.
+                logger.warning(
+                    "Skipped closing digests: Timeline locks may have expired.",
+                    extra={"keys": list(records_by_key), "lock_duration": lock_duration},
+                )
+                metrics.incr("digests.digest_many.lock_expired", amount=len(records_by_key))
+                records_by_key.clear()
+                return
+
+            for host, keys in keys_by_host.items():
+                closed_keys = [key for key in keys if key in records_by_key]
+                arguments: list[Any] = []
+                for key in closed_keys:
+                    minimum_delay = minimum_delays[key]
+                    arguments.extend(
+                        [
+                            key,
+                            self.minimum_delay if minimum_delay is None else minimum_delay,
+                            len(record_keys[key]),
+                            *record_keys[key],
+                        ]
+                    )
+                if not closed_keys:
+                    continue
+
+                try:
+                    script(
+                        self.cluster.get_local_client(host),
+                        ["-"],
+                        ["DIGEST_CLOSE_MANY", self.namespace, self.ttl, timestamp, *arguments],
+                    )
+                except Exception as error:
+                    # The timelines stay in the ready state and will be
+                    # delivered again, so they must not be delivered now.
+                    logger.exception(
+                        "Failed to close digests on partition %s due to error: %s", host, error
+                    )
+                    for key in closed_keys:
+                        del records_by_key[key]
+
     def delete(self, key: str, timestamp: float | None = None) -> None:
         if timestamp is None:
             timestamp = time.time()
@@ -2,6 +2,13 @@ import pickle
 import zlib
 from typing import Any
 
+from sentry import options
+from sentry.digests.notifications import Notification
+from sentry.eventstore.models import Event, GroupEvent
+from sentry.models.group import Group
+from sentry.snuba.events import Columns
+from sentry.utils import json
+
 
 class Codec:
     def encode(self, value: Any) -> bytes:
@@ -17,3 +24,66 @@ class CompressedPickleCodec(Codec):
 
     def decode(self, value: bytes) -> Any:
         return pickle.loads(zlib.decompress(value))
+
+
+class NotificationCodec(Codec):
+    """
+    Encodes digest notifications as the ids they reference: the project,
+    event, group and occurrence ids of the event, the rule ids and the
+    notification UUID, prefixed with a version byte.
+
+    Decoded notifications contain a `GroupEvent` whose data and occurrence
+    have not been fetched yet, see `bind_records`, and whose group is only a
+    placeholder until the record is rewritten with the groups of the digest.
+    Other values, as well as records written by `CompressedPickleCodec` (a
+    zlib stream never starts with the version byte), are handled like
+    `CompressedPickleCodec` does. Notifications are only written in the new
+    format if `digests.notification-codec.write` is enabled, so that it can
+    be turned on once every worker is able to decode it.
+    """
+
+    VERSION = b"\x01"
+
+    def __init__(self) -> None:
+        self.fallback = CompressedPickleCodec()
+
+    def encode(self, value: Any) -> bytes:
+        if (
+            not options.get("digests.notification-codec.write")
+            or not isinstance(value, Notification)
+            or value.event.group_id is None
+        ):
+            return self.fallback.encode(value)
+
+        event = value.event
+        return self.VERSION + json.dumps(
+            [
+                event.project_id,
+                event.event_id,
+                event.group_id,
+                list(value.rules),
+                value.notification_uuid,
+                getattr(event, "occurrence_id", None),
+            ]
+        ).encode("utf-8")
+
+    def decode(self, value: bytes) -> Any:
+        if value[:1] != self.VERSION:
+            return self.fallback.decode(value)
+
+        project_id, event_id, group_id, rules, notification_uuid, occurrence_id = json.loads(
+            value[1:]
+        )
+        event = GroupEvent(
+            project_id,
+            event_id,
+            group=Group(id=group_id, project_id=project_id),
+            # The node of a plain event, fetched when the data is accessed
+            data=Event(project_id, event_id).data,
+            # Like for events loaded from Snuba, the occurrence is fetched by
+            # its id when it is accessed
+            snuba_data=(
+                {Columns.OCCURRENCE_ID.value.event_name: occurrence_id} if occurrence_id else None
+            ),
+        )
+        return Notification(event, rules, notification_uuid)
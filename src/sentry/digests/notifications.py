@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import copy
 import functools
 import itertools
 import logging
 from collections import defaultdict, namedtuple
-from collections.abc import Mapping, MutableMapping, MutableSequence, Sequence
+from collections.abc import Iterable, Mapping, MutableMapping, MutableSequence, Sequence
 from typing import Any
 
-from sentry import tsdb
+from sentry import eventstore, tsdb
 from sentry.digests import Digest, Record
-from sentry.eventstore.models import Event
+from sentry.eventstore.models import Event, GroupEvent
+from sentry.issues.issue_occurrence import IssueOccurrence
 from sentry.models.group import Group, GroupStatus
 from sentry.models.project import Project
 from sentry.models.rule import Rule
@@ -24,11 +26,11 @@ Notification = namedtuple(
 )
 
 
-def split_key(
+def _parse_key(
     key: str,
-) -> tuple[Project, ActionTargetType, str | None, FallthroughChoiceType | None]:
+) -> tuple[int, ActionTargetType, str | None, FallthroughChoiceType | None]:
     key_parts = key.split(":", 5)
-    project_id = key_parts[2]
+    project_id = int(key_parts[2])
     # XXX: We transitioned to new style keys (len == 5) a while ago on
     # sentry.io. But self-hosted users might transition at any time, so we need
     # to keep this transition code around for a while, maybe indefinitely.
@@ -47,9 +49,34 @@ def split_key(
         target_type = ActionTargetType.ISSUE_OWNERS
         target_identifier = None
         fallthrough_choice = None
+    return project_id, target_type, target_identifier, fallthrough_choice
+
+
+def split_key(
+    key: str,
+) -> tuple[Project, ActionTargetType, str | None, FallthroughChoiceType | None]:
+    project_id, target_type, target_identifier, fallthrough_choice = _parse_key(key)
     return Project.objects.get(pk=project_id), target_type, target_identifier, fallthrough_choice
 
 
+def split_keys(
+    keys: Iterable[str],
+) -> dict[str, tuple[Project, ActionTargetType, str | None, FallthroughChoiceType | None]]:
+    """
+    Like `split_key` for many keys, with one query for all projects. Keys of
+    projects that don't exist are left out.
+    """
+    parsed_keys = {key: _parse_key(key) for key in keys}
+    projects = Project.objects.in_bulk({parsed[0] for parsed in parsed_keys.values()})
+    return {
+        key: (projects[project_id], target_type, target_identifier, fallthrough_choice)
+        for key, (project_id, target_type, target_identifier, fallthrough_choice) in (
+            parsed_keys.items()
+        )
+        if project_id in projects
+    }
+
+
 def unsplit_key(
     project: Project,
     target_type: ActionTargetType,
@@ -74,6 +101,29 @@ def event_to_record(
     )
 
 
+def bind_records(records: Iterable[Record]) -> None:
+    """
+    Fetches the data and occurrences of the events of records decoded by
+    `NotificationCodec` with one nodestore request each (per project for
+    occurrences), instead of one per event when they are first accessed.
+    """
+    events = [record.value.event for record in records if not record.value.event.data.bound]
+    eventstore.backend.bind_nodes(events)
+
+    events_with_occurrence: dict[int, list[GroupEvent]] = defaultdict(list)
+    for event in events:
+        if isinstance(event, GroupEvent) and event.occurrence_id:
+            events_with_occurrence[event.project_id].append(event)
+
+    for project_id, project_events in events_with_occurrence.items():
+        occurrences = IssueOccurrence.fetch_multi(
+            [event.occurrence_id for event in project_events], project_id
+        )
+        for event, occurrence in zip(project_events, occurrences):
+            if occurrence is not None:
+                event.occurrence = occurrence
+
+
 def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any]:
     # This reads a little strange, but remember that records are returned in
     # reverse chronological order, and we query the database in chronological
@@ -82,6 +132,7 @@ def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any
     start = records[-1].datetime
     end = records[0].datetime
 
+    bind_records(records)
     groups = Group.objects.in_bulk(record.value.event.group_id for record in records)
     tenant_ids = {"organization_id": project.organization_id}
     return {
@@ -107,6 +158,70 @@ def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any
     }
 
 
+def fetch_states(
+    digests: Mapping[str, tuple[Project, Sequence[Record]]]
+) -> dict[str, Mapping[str, Any]]:
+    """
+    Like `fetch_state` for many digests, keyed like ``digests``. Groups and
+    rules are loaded with one query each for all digests, while event and
+    user counts are still fetched per digest as they depend on its records.
+    """
+    digests = {key: (project, records) for key, (project, records) in digests.items() if records}
+
+    bind_records(record for _, records in digests.values() for record in records)
+
+    all_groups = Group.objects.in_bulk(
+        {record.value.event.group_id for _, records in digests.values() for record in records}
+    )
+    all_rules = Rule.objects.in_bulk(
+        {
+            rule_id
+            for _, records in digests.values()
+            for record in records
+            for rule_id in record.value.rules
+        }
+    )
+
+    states = {}
+    for key, (project, records) in digests.items():
+        start = records[-1].datetime
+        end = records[0].datetime
+
+        # `attach_state` sets the counts of the digest on the groups, so every
+        # digest needs its own copies.
+        groups = {
+            group_id: copy.copy(all_groups[group_id])
+            for group_id in {record.value.event.group_id for record in records}
+            if group_id in all_groups
+        }
+        tenant_ids = {"organization_id": project.organization_id}
+        states[key] = {
+            "project": project,
+            "groups": groups,
+            "rules": {
+                rule_id: all_rules[rule_id]
+                for record in records
+                for rule_id in record.value.rules
+                if rule_id in all_rules
+            },
+            "event_counts": tsdb.get_sums(
+                TSDBModel.group,
+                list(groups.keys()),
+                start,
+                end,
+                tenant_ids=tenant_ids,
+            ),
+            "user_counts": tsdb.get_distinct_counts_totals(
+                TSDBModel.users_affected_by_group,
+                list(groups.keys()),
+                start,
+                end,
+                tenant_ids=tenant_ids,
+            ),
+        }
+    return states
+
+
 def attach_state(
     project: Project,
     groups: MutableMapping[int, Group],
@@ -50,6 +50,7 @@ from sentry.grouping.api import (
     GroupingConfig,
     get_grouping_config_dict_for_project,
 )
+from sentry.grouping.grouphash_cache import get_or_create_grouphashes
 from sentry.grouping.ingest import (
     add_group_id_to_grouphashes,
     check_for_category_mismatch,
@@ -932,10 +933,14 @@ def _get_group_processing_kwargs(job: Job) -> dict[str, Any]:
 
 @metrics.wraps("save_event.get_or_create_environment_many")
 def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    environments: dict[tuple[int, str | None], Environment] = {}
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
-        )
+        key = (job["project_id"], job["environment"])
+        if key not in environments:
+            environments[key] = Environment.get_or_create(
+                project=projects[job["project_id"]], name=job["environment"]
+            )
+        job["environment"] = environments[key]
 
 
 @metrics.wraps("save_event.get_or_create_group_environment_many")
@@ -1056,6 +1061,10 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
     # XXX: validate whether anybody actually uses those metrics
 
+    # Jobs that share an environment and a second (TSDB rolls up to whole
+    # seconds anyway) are written together.
+    batches: dict[tuple[int, datetime], tuple[list[Any], list[Any], list[Any]]] = {}
+
     for job in jobs:
         incrs = []
         frequencies = []
@@ -1094,16 +1103,22 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
             project_id = job["project_id"]
             records.append((TSDBModel.users_affected_by_project, project_id, (user.tag_value,)))
 
+        batch_incrs, batch_records, batch_frequencies = batches.setdefault(
+            (environment.id, event.datetime.replace(microsecond=0)), ([], [], [])
+        )
+        batch_incrs.extend(incrs)
+        batch_records.extend(records)
+        batch_frequencies.extend(frequencies)
+
+    for (environment_id, timestamp), (incrs, records, frequencies) in batches.items():
         if incrs:
-            tsdb.backend.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+            tsdb.backend.incr_multi(incrs, timestamp=timestamp, environment_id=environment_id)
 
         if records:
-            tsdb.backend.record_multi(
-                records, timestamp=event.datetime, environment_id=environment.id
-            )
+            tsdb.backend.record_multi(records, timestamp=timestamp, environment_id=environment_id)
 
         if frequencies:
-            tsdb.backend.record_frequency_multi(frequencies, timestamp=event.datetime)
+            tsdb.backend.record_frequency_multi(frequencies, timestamp=timestamp)
 
 
 @metrics.wraps("save_event.nodestore_save_many")
@@ -1379,9 +1394,7 @@ def _save_aggregate(
         and not primary_hashes.hierarchical_hashes
     )
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    flat_grouphashes = get_or_create_grouphashes(project, hashes.hashes)
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1394,9 +1407,9 @@ def _save_aggregate(
     )
 
     if root_hierarchical_hash is not None:
-        root_hierarchical_grouphash = GroupHash.objects.get_or_create(
-            project=project, hash=root_hierarchical_hash
-        )[0]
+        (root_hierarchical_grouphash,) = get_or_create_grouphashes(
+            project, [root_hierarchical_hash]
+        )
 
         metadata.update(
             hashes.group_metadata_from_hash(
@@ -1674,10 +1687,7 @@ def create_and_seek_grouphashes(
     grouping_config, hashes = hash_calculation_function(project, job, metric_tags)
 
     if extract_hashes(hashes):
-        grouphashes = [
-            GroupHash.objects.get_or_create(project=project, hash=hash)[0]
-            for hash in extract_hashes(hashes)
-        ]
+        grouphashes = get_or_create_grouphashes(project, extract_hashes(hashes))
 
         existing_grouphash = find_existing_grouphash_new(grouphashes)
 
@@ -2815,6 +2825,49 @@ def save_transaction_events(jobs: Sequence[Job], projects: ProjectsMapping) -> S
     return jobs
 
 
+@metrics.wraps("event_manager.save_transaction_batch")
+def save_transaction_batch(
+    project_id: int, events: Sequence[tuple[Mapping[str, Any], int | None]]
+) -> list[Event]:
+    """
+    Saves a batch of already normalized transaction events of one project,
+    given as ``(data, start_time)`` pairs. This is equivalent to calling
+    `EventManager.save` for every event, but release and environment lookups,
+    TSDB increments, nodestore writes and eventstream inserts are shared by the
+    whole batch.
+    """
+    with metrics.timer("event_manager.save_transaction_batch.project.get_from_cache"):
+        project = Project.objects.get_from_cache(id=project_id)
+
+    projects = {project.id: project}
+    jobs: list[Job] = [
+        {
+            "data": CanonicalKeyDict(data),
+            "project_id": project.id,
+            "raw": False,
+            "start_time": start_time,
+        }
+        for data, start_time in events
+    ]
+    if not jobs:
+        return []
+
+    with sentry_sdk.start_span(op="event_manager.save_transaction_batch.pull_out_data"):
+        _pull_out_data(jobs, projects)
+
+    for job in jobs:
+        job["data"]["project"] = project.id
+    jobs = save_transaction_events(jobs, projects)
+
+    if not project.flags.has_transactions:
+        first_transaction_received.send_robust(
+            project=project, event=jobs[0]["event"], sender=Project
+        )
+
+    metrics.distribution("event_manager.save_transaction_batch.size", len(jobs))
+    return [job["event"] for job in jobs]
+
+
 @metrics.wraps("event_manager.save_generic_events")
 def save_generic_events(jobs: Sequence[Job], projects: ProjectsMapping) -> Sequence[Job]:
     with metrics.timer("event_manager.save_generic.organization_ids"):
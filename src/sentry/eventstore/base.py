@@ -1,3 +1,4 @@
+from collections import defaultdict
 from collections.abc import Sequence
 from copy import deepcopy
 from datetime import datetime
@@ -279,11 +280,18 @@ class EventStorage(Service):
             if not node_ids:
                 return
 
-            node_results = nodestore.backend.get_multi(node_ids)
-
+            nodes_by_id = defaultdict(list)
             for item, node in object_node_list:
-                data = node_results.get(node.id) or {}
-                node.bind_data(data, ref=node.get_ref(item))
+                nodes_by_id[node.id].append((item, node))
+
+            # bind nodes as they arrive, the remaining ones were not found
+            for node_id, data in nodestore.backend.get_multi_iter(node_ids):
+                for item, node in nodes_by_id.pop(node_id, ()):
+                    node.bind_data(data or {}, ref=node.get_ref(item))
+
+            for pending in nodes_by_id.values():
+                for item, node in pending:
+                    node.bind_data({}, ref=node.get_ref(item))
 
     def get_unfetched_transactions(
         self,
@@ -1,8 +1,10 @@
+from collections.abc import Sequence
 from datetime import timedelta
 from typing import Any
 
 import sentry_sdk
 
+from sentry.utils import json
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.kvstore.abstract import KVStorage
 from sentry.utils.services import Service
@@ -46,6 +48,23 @@ class EventProcessingStore(Service):
             self.inner.set(key, event, self.timeout)
             return key
 
+    @sentry_sdk.tracing.trace
+    def store_encoded(self, event: Event, payload: str | bytes) -> str:
+        """
+        Like `store`, but stores ``payload``, the JSON encoded ``event``, as it
+        is instead of encoding ``event`` again. Only use this if ``event`` was
+        decoded from ``payload`` and hasn't been modified since.
+        """
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+
+        with sentry_sdk.start_span(op="eventstore.processing.store_encoded"):
+            key = cache_key_for_event(event)
+            # All processing stores JSON encode events, which leaves `RawJSON`
+            # values untouched.
+            self.inner.set(key, json.RawJSON(payload), self.timeout)
+            return key
+
     def get(self, key: str, unprocessed: bool = False) -> Event | None:
         with sentry_sdk.start_span(op="eventstore.processing.get"):
             if unprocessed:
@@ -57,6 +76,25 @@ class EventProcessingStore(Service):
             self.inner.delete(key)
             self.inner.delete(self.__get_unprocessed_key(key))
 
+    def delete_by_key_if_present(self, key: str) -> bool:
+        """
+        Like `delete_by_key`, but returns whether the processed event was
+        still stored at ``key``. Of several tasks handling the same event, only
+        the one this returns `True` for should go on to process it.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.delete_by_key"):
+            present = self.inner.delete_if_present(key)
+            self.inner.delete(self.__get_unprocessed_key(key))
+            return present
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, Event]:
+        """
+        Fetches the processed events stored at ``keys``. Keys without an
+        event are left out of the result.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.get_many"):
+            return dict(self.inner.get_many(keys))
+
     def delete(self, event: Event) -> None:
         key = cache_key_for_event(event)
         self.delete_by_key(key)
@@ -1,10 +1,12 @@
 import logging
 import random
+from collections import defaultdict
 from collections.abc import Generator, Mapping
 from contextlib import contextmanager
 from typing import Any
 
 from arroyo.backends.kafka.consumer import KafkaPayload
+from arroyo.processing.strategies.batching import ValuesBatch
 from arroyo.types import Message
 
 from sentry import options
@@ -14,7 +16,7 @@ from sentry.eventstream.kafka.protocol import (
     get_task_kwargs_for_message_from_headers,
 )
 from sentry.post_process_forwarder.post_process_forwarder import PostProcessForwarderStrategyFactory
-from sentry.tasks.post_process import post_process_group
+from sentry.tasks.post_process import post_process_group, post_process_group_batch
 from sentry.utils import metrics
 from sentry.utils.cache import cache_key_for_event
 
@@ -33,6 +35,32 @@ def _sampled_eventstream_timer(instance: str) -> Generator[None, None, None]:
         yield
 
 
+class PostProcessGroupBatch:
+    """
+    Collects the events of a forwarder batch by queue, and dispatches one
+    `post_process_group_batch` task per queue and up to ``max_size`` events
+    instead of one `post_process_group` task per event.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.events: dict[str, list[dict[str, Any]]] = defaultdict(list)
+
+    def add(self, queue: str, task_kwargs: dict[str, Any]) -> None:
+        self.events[queue].append(task_kwargs)
+        if len(self.events[queue]) >= self.max_size:
+            self._submit(queue)
+
+    def flush(self) -> None:
+        for queue in list(self.events):
+            self._submit(queue)
+
+    def _submit(self, queue: str) -> None:
+        events = self.events.pop(queue)
+        metrics.distribution("eventstream.post_process_batch.size", len(events))
+        post_process_group_batch.apply_async(kwargs={"events": events, "queue": queue}, queue=queue)
+
+
 def dispatch_post_process_group_task(
     event_id: str,
     project_id: int,
@@ -45,26 +73,28 @@ def dispatch_post_process_group_task(
     skip_consume: bool = False,
     group_states: GroupStates | None = None,
     occurrence_id: str | None = None,
+    batch: PostProcessGroupBatch | None = None,
 ) -> None:
     if skip_consume:
         logger.info("post_process.skip.raw_event", extra={"event_id": event_id})
     else:
         cache_key = cache_key_for_event({"project": project_id, "event_id": event_id})
 
-        post_process_group.apply_async(
-            kwargs={
-                "is_new": is_new,
-                "is_regression": is_regression,
-                "is_new_group_environment": is_new_group_environment,
-                "primary_hash": primary_hash,
-                "cache_key": cache_key,
-                "group_id": group_id,
-                "group_states": group_states,
-                "occurrence_id": occurrence_id,
-                "project_id": project_id,
-            },
-            queue=queue,
-        )
+        task_kwargs = {
+            "is_new": is_new,
+            "is_regression": is_regression,
+            "is_new_group_environment": is_new_group_environment,
+            "primary_hash": primary_hash,
+            "cache_key": cache_key,
+            "group_id": group_id,
+            "group_states": group_states,
+            "occurrence_id": occurrence_id,
+            "project_id": project_id,
+        }
+        if batch is not None:
+            batch.add(queue, task_kwargs)
+        else:
+            post_process_group.apply_async(kwargs=task_kwargs, queue=queue)
 
 
 def _get_task_kwargs(message: Message[KafkaPayload]) -> Mapping[str, Any] | None:
@@ -91,7 +121,26 @@ def _get_task_kwargs_and_dispatch(message: Message[KafkaPayload]) -> None:
     dispatch_post_process_group_task(**task_kwargs)
 
 
+def _get_task_kwargs_and_dispatch_batch(
+    raw_batch: Message[ValuesBatch[KafkaPayload]], max_batch_size: int
+) -> None:
+    batch = PostProcessGroupBatch(max_batch_size)
+
+    for value in raw_batch.payload:
+        task_kwargs = _get_task_kwargs(Message(value))
+        if task_kwargs:
+            dispatch_post_process_group_task(**task_kwargs, batch=batch)
+
+    batch.flush()
+
+
 class EventPostProcessForwarderStrategyFactory(PostProcessForwarderStrategyFactory):
     @staticmethod
     def _dispatch_function(message: Message[KafkaPayload]) -> None:
         return _get_task_kwargs_and_dispatch(message)
+
+    @staticmethod
+    def _dispatch_batch_function(
+        message: Message[ValuesBatch[KafkaPayload]], max_batch_size: int
+    ) -> None:
+        return _get_task_kwargs_and_dispatch_batch(message, max_batch_size)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Sequence
+import threading
+from collections.abc import Callable, Hashable, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, TypedDict
+from typing import TYPE_CHECKING, Generic, TypedDict, TypeVar
 
 import sentry_sdk
+from cachetools import LRUCache
 
 from sentry import options
 from sentry.db.models.fields.node import NodeData
@@ -32,6 +34,7 @@ from sentry.grouping.variants import (
     SaltedComponentVariant,
 )
 from sentry.models.grouphash import GroupHash
+from sentry.utils import metrics
 from sentry.utils.safe import get_path
 
 if TYPE_CHECKING:
@@ -79,6 +82,56 @@ class GroupingConfigNotFound(LookupError):
     pass
 
 
+T = TypeVar("T")
+
+
+class LoadedConfigCache(Generic[T]):
+    """
+    Bounded, process-local cache of fully loaded grouping configuration
+    objects, keyed by the serialized configuration they were loaded from.
+
+    Loading enhancements and fingerprinting rules (including the Rust
+    enhancements) is expensive, while the number of distinct configurations
+    a worker sees is small. Cached objects are shared between events and must
+    not be mutated.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1000):
+        self.name = name
+        self._cache: LRUCache[Hashable, T] = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], T]) -> T:
+        with self._lock:
+            rv = self._cache.get(key)
+        if rv is not None:
+            metrics.incr("grouping.config_cache.hit", tags={"cache": self.name})
+            return rv
+
+        metrics.incr("grouping.config_cache.miss", tags={"cache": self.name})
+        with metrics.timer("grouping.config_cache.load", tags={"cache": self.name}):
+            rv = load()
+        with self._lock:
+            self._cache[key] = rv
+        return rv
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_enhancements_cache: LoadedConfigCache[str] = LoadedConfigCache("enhancements")
+_strategy_config_cache: LoadedConfigCache[StrategyConfiguration] = LoadedConfigCache(
+    "strategy_config"
+)
+_fingerprinting_cache: LoadedConfigCache[FingerprintingRules] = LoadedConfigCache("fingerprinting")
+
+
+def clear_loaded_config_caches() -> None:
+    for loaded_config_cache in (_enhancements_cache, _strategy_config_cache, _fingerprinting_cache):
+        loaded_config_cache.clear()
+
+
 class GroupingConfig(TypedDict):
     id: str
     enhancements: str
@@ -109,16 +162,22 @@ class GroupingConfigLoader:
         cache_prefix = self.cache_prefix
         cache_prefix += f"{LATEST_VERSION}:"
         cache_key = cache_prefix + md5_text(f"{enhancements_base}|{enhancements}").hexdigest()
-        rv = cache.get(cache_key)
-        if rv is not None:
+
+        def load() -> str:
+            rv = cache.get(cache_key)
+            if rv is not None:
+                return rv
+
+            try:
+                rv = Enhancements.from_config_string(
+                    enhancements, bases=[enhancements_base]
+                ).dumps()
+            except InvalidEnhancerConfig:
+                rv = get_default_enhancements()
+            cache.set(cache_key, rv)
             return rv
 
-        try:
-            rv = Enhancements.from_config_string(enhancements, bases=[enhancements_base]).dumps()
-        except InvalidEnhancerConfig:
-            rv = get_default_enhancements()
-        cache.set(cache_key, rv)
-        return rv
+        return _enhancements_cache.get_or_load(cache_key, load)
 
     def _get_config_id(self, project):
         raise NotImplementedError
@@ -218,7 +277,12 @@ def load_grouping_config(config_dict=None) -> StrategyConfiguration:
     config_id = config_dict.pop("id")
     if config_id not in CONFIGURATIONS:
         raise GroupingConfigNotFound(config_id)
-    return CONFIGURATIONS[config_id](**config_dict)
+    if set(config_dict) - {"enhancements"}:
+        return CONFIGURATIONS[config_id](**config_dict)
+    return _strategy_config_cache.get_or_load(
+        (config_id, config_dict.get("enhancements")),
+        lambda: CONFIGURATIONS[config_id](**config_dict),
+    )
 
 
 def load_default_grouping_config() -> StrategyConfiguration:
@@ -244,16 +308,20 @@ def get_fingerprinting_config_for_project(
     from sentry.utils.hashlib import md5_text
 
     cache_key = "fingerprinting-rules:" + md5_text(rules).hexdigest()
-    rv = cache.get(cache_key)
-    if rv is not None:
-        return FingerprintingRules.from_json(rv, bases=bases)
 
-    try:
-        rv = FingerprintingRules.from_config_string(rules, bases=bases)
-    except InvalidFingerprintingConfig:
-        rv = FingerprintingRules([], bases=bases)
-    cache.set(cache_key, rv.to_json())
-    return rv
+    def load() -> FingerprintingRules:
+        rv = cache.get(cache_key)
+        if rv is not None:
+            return FingerprintingRules.from_json(rv, bases=bases)
+
+        try:
+            rv = FingerprintingRules.from_config_string(rules, bases=bases)
+        except InvalidFingerprintingConfig:
+            rv = FingerprintingRules([], bases=bases)
+        cache.set(cache_key, rv.to_json())
+        return rv
+
+    return _fingerprinting_cache.get_or_load((cache_key, tuple(bases or ())), load)
 
 
 def apply_server_fingerprinting(event, config, allow_custom_title=True):
@@ -1,7 +1,14 @@
+import sys
+
 from sentry.grouping.utils import hash_from_values
 
 DEFAULT_HINTS = {"salt": "a static salt"}
 
+# Bumped on every change to any component. A cached hash is only valid as long
+# as this hasn't changed since it was computed, because changes to
+# subcomponents don't propagate to their parents.
+_generation = 0
+
 # When a component ID appears here it has a human readable name which also
 # makes it a major component.  A major component is described as such for
 # the UI.
@@ -33,8 +40,24 @@ def calculate_tree_label(values):
 class GroupingComponent:
     """A grouping component is a recursive structure that is flattened
     into components to make a hash for grouping purposes.
+
+    Components are built for every frame of every variant of an event, so
+    they use slots and intern their ids and hints, which mostly repeat.
     """
 
+    __slots__ = (
+        "id",
+        "hint",
+        "contributes",
+        "variant_provider",
+        "values",
+        "tree_label",
+        "is_prefix_frame",
+        "is_sentinel_frame",
+        "_hash",
+        "_hash_generation",
+    )
+
     def __init__(
         self,
         id,
@@ -46,7 +69,7 @@ class GroupingComponent:
         is_prefix_frame=None,
         is_sentinel_frame=None,
     ):
-        self.id = id
+        self.id = sys.intern(id)
 
         # Default values
         self.hint = DEFAULT_HINTS.get(id)
@@ -56,6 +79,8 @@ class GroupingComponent:
         self.tree_label = None
         self.is_prefix_frame = False
         self.is_sentinel_frame = False
+        self._hash = None
+        self._hash_generation = -1
 
         self.update(
             hint=hint,
@@ -117,8 +142,11 @@ class GroupingComponent:
         is_sentinel_frame=None,
     ):
         """Updates an already existing component with new values."""
+        global _generation
+        _generation += 1
+
         if hint is not None:
-            self.hint = hint
+            self.hint = sys.intern(hint) if type(hint) is str else hint
         if values is not None:
             if contributes is None:
                 contributes = _calculate_contributes(values)
@@ -137,25 +165,35 @@ class GroupingComponent:
     def shallow_copy(self):
         """Creates a shallow copy."""
         rv = object.__new__(self.__class__)
-        rv.__dict__.update(self.__dict__)
+        for slot in self.__slots__:
+            setattr(rv, slot, getattr(self, slot))
         rv.values = list(self.values)
         return rv
 
+    def _collect_values(self, rv):
+        for value in self.values:
+            if isinstance(value, GroupingComponent):
+                if value.contributes:
+                    value._collect_values(rv)
+            else:
+                rv.append(value)
+
     def iter_values(self):
         """Recursively walks the component and flattens it into a list of
         values.
         """
+        rv = []
         if self.contributes:
-            for value in self.values:
-                if isinstance(value, GroupingComponent):
-                    yield from value.iter_values()
-                else:
-                    yield value
+            self._collect_values(rv)
+        return iter(rv)
 
     def get_hash(self):
         """Returns the hash of the values if it contributes."""
         if self.contributes:
-            return hash_from_values(self.iter_values())
+            if self._hash_generation != _generation:
+                self._hash = hash_from_values(self.iter_values())
+                self._hash_generation = _generation
+            return self._hash
 
     def as_dict(self):
         """Converts the component tree into a dictionary."""
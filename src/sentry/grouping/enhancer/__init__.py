@@ -88,6 +88,24 @@ def make_rust_exception_data(
     return e
 
 
+def _get_match_frame_key(frame: dict[str, Any]) -> tuple[Any, ...]:
+    """
+    Returns everything `create_match_frame` reads from a frame.
+    """
+    return (
+        frame.get("function"),
+        bool(frame.get("raw_function")),
+        frame.get("platform"),
+        frame.get("in_app"),
+        get_path(frame, "data", "category"),
+        get_path(frame, "data", "orig_in_app"),
+        frame.get("module"),
+        frame.get("package"),
+        frame.get("abs_path"),
+        frame.get("filename"),
+    )
+
+
 class Enhancements:
     # NOTE: You must add a version to ``VERSIONS`` any time attributes are added
     # to this class, s.t. no enhancements lacking these attributes are loaded
@@ -117,17 +135,48 @@ class Enhancements:
         """
         This applies the frame modifications to the frames itself. This does not affect grouping.
         """
-        match_frames = [create_match_frame(frame, platform) for frame in frames]
-
-        rust_enhanced_frames = self.rust_enhancements.apply_modifications_to_frames(
-            match_frames, make_rust_exception_data(exception_data)
-        )
+        self.apply_modifications_to_frames([(frames, exception_data)], platform)
 
-        for frame, (category, in_app) in zip(frames, rust_enhanced_frames):
-            if in_app is not None:
-                set_in_app(frame, in_app)
-            if category is not None:
-                set_path(frame, "data", "category", value=category)
+    def apply_modifications_to_frames(
+        self,
+        stacktraces: Sequence[tuple[Sequence[dict[str, Any]], dict[str, Any]]],
+        platform: str,
+    ) -> None:
+        """
+        Applies the frame modifications to all given ``(frames, exception_data)``
+        pairs at once, typically all stacktraces of an event.
+
+        Frames and stacktraces repeat a lot within an event (threads sharing
+        most of their frames, exception and thread stacktraces being the
+        same), so match frames are only created once per distinct frame, and
+        the enhancements only run once per distinct stacktrace. Only fields
+        which actually change are written back into the frames.
+        """
+        match_frames: dict[tuple[Any, ...], dict[str, Any]] = {}
+        results: dict[tuple[Any, ...], list[tuple[str | None, bool | None]]] = {}
+
+        for frames, exception_data in stacktraces:
+            frame_keys = []
+            for frame in frames:
+                frame_key = _get_match_frame_key(frame)
+                if frame_key not in match_frames:
+                    match_frames[frame_key] = create_match_frame(frame, platform)
+                frame_keys.append(frame_key)
+
+            rust_exception_data = make_rust_exception_data(exception_data)
+            stacktrace_key = (tuple(frame_keys), tuple(rust_exception_data.values()))
+            rust_enhanced_frames = results.get(stacktrace_key)
+            if rust_enhanced_frames is None:
+                rust_enhanced_frames = self.rust_enhancements.apply_modifications_to_frames(
+                    [match_frames[frame_key] for frame_key in frame_keys], rust_exception_data
+                )
+                results[stacktrace_key] = rust_enhanced_frames
+
+            for frame, (category, in_app) in zip(frames, rust_enhanced_frames):
+                if in_app is not None:
+                    set_in_app(frame, in_app)
+                if category is not None and get_path(frame, "data", "category") != category:
+                    set_path(frame, "data", "category", value=category)
 
     def assemble_stacktrace_component(self, components, frames, platform, exception_data=None):
         """
@@ -0,0 +1,233 @@
+"""
+Read-through cache of `GroupHash` rows for event ingestion.
+
+Almost every event maps to a grouphash which has been assigned to a group (or
+a tombstone) long ago and doesn't change anymore, so looking it up in Postgres
+for every event is wasted work. With ``grouping.grouphash-cache.enabled`` set,
+those rows are cached by ``(project_id, hash)`` in the default cache, and
+optionally in a small in-process LRU with a short TTL on top of it.
+
+Only grouphashes with a group or tombstone are cached. Grouphashes without
+either are about to be assigned by the event that looks them up and are
+always read from the database.
+
+Anything that changes ``group_id``, ``group_tombstone_id`` or ``state`` of an
+existing grouphash, or deletes it, has to call `invalidate_grouphashes`.
+
+A lookup may read a row just before it is changed and cache it only after the
+invalidation ran. To keep such stale rows from being used, the shared cache
+keys include a per-project generation, which is read before the rows are
+loaded from the database and replaced by every invalidation. Rows cached under
+an old generation are never read again.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from cachetools import TTLCache
+from django.core.cache import cache
+from django.db import router, transaction
+
+from sentry import options
+from sentry.models.grouphash import GroupHash
+from sentry.models.project import Project
+from sentry.utils import metrics
+
+CACHE_TTL = 60 * 60
+GENERATION_TTL = 24 * 60 * 60
+LOCAL_CACHE_TTL = 10
+LOCAL_CACHE_SIZE = 10000
+
+# Invalidations only reach the local cache of the process running them, so
+# other processes may use a stale entry for up to `LOCAL_CACHE_TTL`.
+_local_cache: TTLCache[tuple[int, str], CachedGroupHash] = TTLCache(
+    maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL
+)
+_local_cache_lock = threading.Lock()
+
+
+class CachedGroupHash(NamedTuple):
+    id: int
+    group_id: int | None
+    group_tombstone_id: int | None
+    state: int | None
+
+    @classmethod
+    def from_grouphash(cls, grouphash: GroupHash) -> CachedGroupHash:
+        return cls(grouphash.id, grouphash.group_id, grouphash.group_tombstone_id, grouphash.state)
+
+    def to_grouphash(self, project: Project, hash: str) -> GroupHash:
+        grouphash = GroupHash(
+            id=self.id,
+            project=project,
+            hash=hash,
+            group_id=self.group_id,
+            group_tombstone_id=self.group_tombstone_id,
+            state=self.state,
+        )
+        grouphash._state.adding = False
+        grouphash._state.db = router.db_for_read(GroupHash)
+        return grouphash
+
+
+def _make_key(project_id: int, generation: str, hash: str) -> str:
+    return f"grouphash:v2:{project_id}:{generation}:{hash}"
+
+
+def _make_generation_key(project_id: int) -> str:
+    return f"grouphash:v2:{project_id}:generation"
+
+
+def get_generation(project_id: int) -> str:
+    """
+    Returns the current cache generation of the project's grouphashes. Read it
+    before loading the rows to cache from the database.
+    """
+    key = _make_generation_key(project_id)
+    generation = cache.get(key)
+    if generation is None:
+        # A missing generation (expired or evicted) must not bring back the
+        # rows of an earlier one, so start a new one.
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, timeout=GENERATION_TTL):
+            generation = cache.get(key) or generation
+    return generation
+
+
+def _is_cacheable(grouphash: GroupHash) -> bool:
+    return (
+        grouphash.group_id is not None or grouphash.group_tombstone_id is not None
+    ) and grouphash.state != GroupHash.State.LOCKED_IN_MIGRATION
+
+
+def _use_local_cache() -> bool:
+    return options.get("grouping.grouphash-cache.local-enabled")
+
+
+def get_cached_grouphashes(
+    project: Project, hashes: Sequence[str], generation: str | None = None
+) -> dict[str, GroupHash]:
+    """
+    Returns the cached grouphashes among ``hashes``, by hash. Hashes which
+    aren't cached are left out.
+    """
+    cached: dict[str, CachedGroupHash] = {}
+    use_local_cache = _use_local_cache()
+
+    if use_local_cache:
+        with _local_cache_lock:
+            for hash in hashes:
+                value = _local_cache.get((project.id, hash))
+                if value is not None:
+                    cached[hash] = value
+
+    missing = [hash for hash in hashes if hash not in cached]
+    if missing:
+        if generation is None:
+            generation = get_generation(project.id)
+        keys = {_make_key(project.id, generation, hash): hash for hash in missing}
+        shared = {keys[key]: CachedGroupHash(*value) for key, value in cache.get_many(keys).items()}
+        if use_local_cache and shared:
+            with _local_cache_lock:
+                for hash, value in shared.items():
+                    _local_cache[(project.id, hash)] = value
+        cached.update(shared)
+
+    metrics.incr("grouping.grouphash_cache.hit", amount=len(cached))
+    metrics.incr("grouping.grouphash_cache.miss", amount=len(hashes) - len(cached))
+    return {hash: value.to_grouphash(project, hash) for hash, value in cached.items()}
+
+
+def cache_grouphashes(project_id: int, grouphashes: Iterable[GroupHash], generation: str) -> None:
+    """
+    Caches the given grouphashes of a project, as far as they are assigned to
+    a group or a tombstone. ``generation`` is the one returned by
+    `get_generation` before the grouphashes were loaded.
+    """
+    values = {
+        (project_id, grouphash.hash): CachedGroupHash.from_grouphash(grouphash)
+        for grouphash in grouphashes
+        if _is_cacheable(grouphash)
+    }
+    if not values:
+        return
+
+    cache.set_many(
+        {
+            _make_key(project_id, generation, hash): tuple(value)
+            for (_, hash), value in values.items()
+        },
+        timeout=CACHE_TTL,
+    )
+    if _use_local_cache():
+        with _local_cache_lock:
+            _local_cache.update(values)
+
+
+def get_or_create_grouphashes(project: Project, hashes: Sequence[str]) -> list[GroupHash]:
+    """
+    Returns a grouphash for every hash, in order, creating missing ones.
+    """
+    if not options.get("grouping.grouphash-cache.enabled"):
+        return [GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes]
+
+    generation = get_generation(project.id)
+    cached = get_cached_grouphashes(project, hashes, generation)
+    grouphashes = []
+    fetched = []
+    for hash in hashes:
+        grouphash = cached.get(hash)
+        if grouphash is None:
+            grouphash = GroupHash.objects.get_or_create(project=project, hash=hash)[0]
+            fetched.append(grouphash)
+        grouphashes.append(grouphash)
+
+    cache_grouphashes(project.id, fetched, generation)
+    return grouphashes
+
+
+def get_grouphashes(project: Project, hashes: Sequence[str]) -> dict[str, GroupHash]:
+    """
+    Returns the existing grouphashes among ``hashes``, by hash.
+    """
+    if not options.get("grouping.grouphash-cache.enabled"):
+        return {h.hash: h for h in GroupHash.objects.filter(project=project, hash__in=hashes)}
+
+    generation = get_generation(project.id)
+    grouphashes = get_cached_grouphashes(project, hashes, generation)
+    missing = [hash for hash in hashes if hash not in grouphashes]
+    if missing:
+        fetched = list(GroupHash.objects.filter(project=project, hash__in=missing))
+        cache_grouphashes(project.id, fetched, generation)
+        grouphashes.update((grouphash.hash, grouphash) for grouphash in fetched)
+
+    return grouphashes
+
+
+def invalidate_grouphashes(project_id: int, hashes: Iterable[str]) -> None:
+    """
+    Removes grouphashes from the cache. Call this *after* changing them, the
+    removal itself is deferred until the current transaction commits. It
+    starts a new generation for the project, so that rows cached by lookups
+    that read them before the change are not used.
+    """
+    hashes = list(hashes)
+    if not hashes:
+        return
+
+    def invalidate() -> None:
+        cache.set(_make_generation_key(project_id), uuid.uuid4().hex, timeout=GENERATION_TTL)
+        with _local_cache_lock:
+            for hash in hashes:
+                _local_cache.pop((project_id, hash), None)
+
+    transaction.on_commit(invalidate, router.db_for_write(GroupHash))
+
+
+def clear_local_grouphash_cache() -> None:
+    with _local_cache_lock:
+        _local_cache.clear()
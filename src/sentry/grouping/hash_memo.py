@@ -0,0 +1,194 @@
+"""
+Memoization of grouping hashes for identical events.
+
+Events in a burst very often share the same exception, stacktrace and message,
+in which case computing grouping variants for every one of them is wasted
+work. With ``grouping.hash-memo.enabled`` set, the `CalculatedHashes` of an
+event are memoized by a pre-hash over everything grouping can look at (after
+stacktrace normalization and server-side fingerprinting), together with the
+project, the grouping config id and its enhancements.
+
+The memo is kept in a small in-process LRU and, with
+``grouping.hash-memo.shared-enabled``, additionally in the default cache.
+Entries never need to be invalidated, as anything affecting the result is
+part of the key.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from hashlib import md5
+from typing import TYPE_CHECKING, Any
+
+from cachetools import LRUCache
+from django.core.cache import cache
+
+from sentry import options
+from sentry.grouping.result import CalculatedHashes, TreeLabel
+from sentry.grouping.utils import is_default_fingerprint_var, parse_fingerprint_var
+from sentry.utils import json, metrics
+
+if TYPE_CHECKING:
+    from sentry.eventstore.models import Event
+    from sentry.grouping.api import GroupingConfig
+    from sentry.grouping.strategies.base import StrategyConfiguration
+
+CACHE_TTL = 60 * 60
+LOCAL_CACHE_SIZE = 5000
+
+# Top-level event attributes read by the grouping strategies or by the
+# variants themselves.
+GROUPING_INPUTS = (
+    "platform",
+    "checksum",
+    "fingerprint",
+    "_fingerprint_info",
+    "exception",
+    "threads",
+    "stacktrace",
+    "logentry",
+    "template",
+    "csp",
+    "hpkp",
+    "expectct",
+    "expectstaple",
+)
+
+# Additional attributes which custom fingerprints can reference through
+# variables, see `sentry.grouping.utils.get_fingerprint_value`.
+FINGERPRINT_VARIABLE_INPUTS = ("transaction", "level", "logger", "tags")
+
+# Event attributes written as a side effect of computing the hashes, which
+# have to be restored on a memo hit.
+GROUPING_OUTPUTS = ("main_exception_id",)
+
+_MemoValue = tuple[Sequence[str], Sequence[str], Sequence[TreeLabel | None], dict[str, Any]]
+
+_local_cache: LRUCache[str, _MemoValue] = LRUCache(maxsize=LOCAL_CACHE_SIZE)
+_local_cache_lock = threading.Lock()
+
+
+def _strip_frames(stacktrace: Any) -> Any:
+    # Frame variables don't contribute to grouping but differ between
+    # otherwise identical events, so leave them out of the pre-hash.
+    if not isinstance(stacktrace, dict) or not isinstance(stacktrace.get("frames"), list):
+        return stacktrace
+    frames = [
+        {k: v for k, v in frame.items() if k != "vars"} if isinstance(frame, dict) else frame
+        for frame in stacktrace["frames"]
+    ]
+    return {**stacktrace, "frames": frames}
+
+
+def _strip_values(container: Any) -> Any:
+    if not isinstance(container, dict) or not isinstance(container.get("values"), list):
+        return container
+    values = [
+        (
+            {
+                **{k: v for k, v in value.items() if k != "raw_stacktrace"},
+                "stacktrace": _strip_frames(value.get("stacktrace")),
+            }
+            if isinstance(value, dict)
+            else value
+        )
+        for value in container["values"]
+    ]
+    return {**container, "values": values}
+
+
+def get_grouping_inputs(event_data: Any) -> dict[str, Any]:
+    """
+    Returns the parts of the event data which can influence its grouping
+    hashes. Has to be called after normalization and fingerprinting.
+    """
+    inputs = {key: event_data.get(key) for key in GROUPING_INPUTS}
+    inputs["exception"] = _strip_values(inputs["exception"])
+    inputs["threads"] = _strip_values(inputs["threads"])
+    inputs["stacktrace"] = _strip_frames(inputs["stacktrace"])
+
+    fingerprint = inputs["fingerprint"] or ()
+    if any(
+        parse_fingerprint_var(value) is not None and not is_default_fingerprint_var(value)
+        for value in fingerprint
+        if isinstance(value, str)
+    ):
+        inputs.update((key, event_data.get(key)) for key in FINGERPRINT_VARIABLE_INPUTS)
+
+    return inputs
+
+
+def get_memo_key(project_id: int, event: Event, grouping_config: GroupingConfig) -> str:
+    result = md5()
+    result.update(f"{project_id}:{grouping_config['id']}:".encode())
+    result.update(grouping_config["enhancements"].encode())
+    result.update(json.dumps(get_grouping_inputs(event.data)).encode())
+    return f"grouping:hash-memo:v1:{result.hexdigest()}"
+
+
+def _get_memo(key: str) -> _MemoValue | None:
+    with _local_cache_lock:
+        value = _local_cache.get(key)
+    if value is not None or not options.get("grouping.hash-memo.shared-enabled"):
+        return value
+
+    value = cache.get(key)
+    if value is not None:
+        with _local_cache_lock:
+            _local_cache[key] = value
+    return value
+
+
+def _set_memo(key: str, value: _MemoValue) -> None:
+    with _local_cache_lock:
+        _local_cache[key] = value
+    if options.get("grouping.hash-memo.shared-enabled"):
+        cache.set(key, value, CACHE_TTL)
+
+
+def get_hashes_memoized(
+    project_id: int,
+    event: Event,
+    grouping_config: GroupingConfig,
+    loaded_grouping_config: StrategyConfiguration,
+) -> CalculatedHashes:
+    """
+    Equivalent of ``event.get_hashes(loaded_grouping_config)`` which reuses
+    the result for events with the same grouping inputs.
+    """
+    if not options.get("grouping.hash-memo.enabled"):
+        return event.get_hashes(loaded_grouping_config)
+
+    metric_tags = {"platform": event.platform or "unknown"}
+    key = get_memo_key(project_id, event, grouping_config)
+    value = _get_memo(key)
+
+    if value is not None:
+        metrics.incr("grouping.hash_memo.hit", tags=metric_tags)
+        hashes, hierarchical_hashes, tree_labels, outputs = value
+        event.data.update(outputs)
+        return CalculatedHashes(
+            hashes=list(hashes),
+            hierarchical_hashes=list(hierarchical_hashes),
+            tree_labels=list(tree_labels),
+        )
+
+    metrics.incr("grouping.hash_memo.miss", tags=metric_tags)
+    calculated = event.get_hashes(loaded_grouping_config)
+    outputs = {name: event.data[name] for name in GROUPING_OUTPUTS if name in event.data}
+    _set_memo(
+        key,
+        (
+            list(calculated.hashes),
+            list(calculated.hierarchical_hashes),
+            list(calculated.tree_labels),
+            outputs,
+        ),
+    )
+    return calculated
+
+
+def clear_local_hash_memo() -> None:
+    with _local_cache_lock:
+        _local_cache.clear()
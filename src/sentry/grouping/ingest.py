@@ -27,6 +27,8 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.grouphash_cache import get_grouphashes
+from sentry.grouping.hash_memo import get_hashes_memoized
 from sentry.grouping.result import CalculatedHashes
 from sentry.issues.grouptype import GroupCategory
 from sentry.killswitches import killswitch_matches_context
@@ -163,7 +165,9 @@ def _calculate_event_grouping(
             # default long before we get here. Should we consolidate bogus config handling into the
             # code actually getting the config?
             try:
-                hashes = event.get_hashes(loaded_grouping_config)
+                hashes = get_hashes_memoized(
+                    project.id, event, grouping_config, loaded_grouping_config
+                )
             except GroupingConfigNotFound:
                 event.data["grouping_config"] = get_grouping_config_dict_for_project(project)
                 hashes = event.get_hashes()
@@ -332,10 +336,7 @@ def find_existing_grouphash(
     found_split = False
 
     if hierarchical_hashes:
-        hierarchical_grouphashes = {
-            h.hash: h
-            for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
-        }
+        hierarchical_grouphashes = get_grouphashes(project, hierarchical_hashes)
 
         # Look for splits:
         # 1. If we find a hash with SPLIT state at `n`, we want to use
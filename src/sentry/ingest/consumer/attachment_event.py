@@ -18,6 +18,7 @@ from .processors import (
     process_individual_attachment,
     process_userreport,
 )
+from .projects import get_project
 
 logger = logging.getLogger(__name__)
 
@@ -79,8 +80,7 @@ def process_attachments_and_events(
     project_id = message["project_id"]
 
     try:
-        with metrics.timer("ingest_consumer.fetch_project"):
-            project = Project.objects.get_from_cache(id=project_id)
+        project = get_project(project_id)
     except Project.DoesNotExist:
         logger.exception("Project for ingested event does not exist: %s", project_id)
         return None
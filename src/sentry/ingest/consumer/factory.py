@@ -12,6 +12,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTask,
 )
+from arroyo.processing.strategies.batching import BatchStep
 from arroyo.types import Commit, FilteredPayload, Message, Partition
 
 from sentry.ingest.types import ConsumerType
@@ -19,7 +20,11 @@ from sentry.processing.backpressure.arroyo import HealthChecker, create_backpres
 from sentry.utils.arroyo import MultiprocessingPool, RunTaskWithMultiprocessing
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
-from .simple_event import process_simple_event_message
+from .simple_event import (
+    collect_simple_event_saves,
+    process_simple_event_message,
+    save_simple_event_batch,
+)
 
 
 class MultiProcessConfig(NamedTuple):
@@ -68,6 +73,8 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         max_batch_time: int,
         input_block_size: int | None,
         output_block_size: int | None,
+        save_batch_size: int | None = None,
+        save_batch_time: float = 1.0,
     ):
         self.consumer_type = consumer_type
         self.is_attachment_topic = consumer_type == ConsumerType.Attachments
@@ -87,6 +94,11 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
                 num_processes, max_batch_size, max_batch_time, input_block_size, output_block_size
             )
 
+        # Transaction events are saved in batches of up to `save_batch_size`
+        # events per project, collected for up to `save_batch_time` seconds.
+        self.save_batch_size = save_batch_size
+        self.save_batch_time = save_batch_time
+
         self.health_checker = HealthChecker("ingest")
 
     def create_with_partitions(
@@ -98,6 +110,26 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         final_step = CommitOffsets(commit)
 
+        if not self.is_attachment_topic and self.save_batch_size:
+            # Messages are processed one by one, so that invalid ones still go
+            # to the DLQ, and only the transaction events to save are batched.
+            save_step = RunTask(
+                function=partial(save_simple_event_batch, save_batch_size=self.save_batch_size),
+                next_step=final_step,
+            )
+            batch_step = BatchStep(
+                max_batch_size=self.save_batch_size,
+                max_batch_time=self.save_batch_time,
+                next_step=save_step,
+            )
+            event_function = partial(
+                collect_simple_event_saves,
+                consumer_type=self.consumer_type,
+                reprocess_only_stuck_events=self.reprocess_only_stuck_events,
+            )
+            next_step = maybe_multiprocess_step(mp, event_function, batch_step, self._pool)
+            return create_backpressure_step(health_checker=self.health_checker, next_step=next_step)
+
         if not self.is_attachment_topic:
             event_function = partial(
                 process_simple_event_message,
@@ -1,6 +1,7 @@
 import functools
 import logging
 import random
+from collections import defaultdict
 from collections.abc import Mapping
 from typing import Any
 
@@ -18,7 +19,12 @@ from sentry.ingest.userreport import Conflict, save_userreport
 from sentry.killswitches import killswitch_matches_context
 from sentry.models.project import Project
 from sentry.signals import event_accepted
-from sentry.tasks.store import preprocess_event, save_event_feedback, save_event_transaction
+from sentry.tasks.store import (
+    preprocess_event,
+    save_event_feedback,
+    save_event_transaction,
+    save_event_transaction_batch,
+)
 from sentry.usage_accountant import record
 from sentry.utils import json, metrics
 from sentry.utils.cache import cache_key_for_event
@@ -36,6 +42,90 @@ class Retriable(Exception):
     pass
 
 
+class SaveEventBatch:
+    """
+    Collects the transaction events of a consumer batch by project, and
+    dispatches one `save_event_transaction_batch` task per project and up to
+    ``max_size`` events instead of one task per event.
+
+    The deduplication keys of the events are only set once their task has
+    been dispatched, so that a failing dispatch leads to the events being
+    consumed again. Until then, an event that occurs twice in a batch is
+    deduplicated by the keys still pending in the batch.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.events: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        self.deduplication_keys: dict[int, list[str]] = defaultdict(list)
+        self.pending_deduplication_keys: set[str] = set()
+
+    def add(
+        self,
+        project_id: int,
+        cache_key: str,
+        start_time: float,
+        event_id: str,
+        deduplication_key: str,
+    ) -> None:
+        if deduplication_key in self.pending_deduplication_keys:
+            logger.warning(
+                "pre-process-forwarder detected a duplicated event with id:%s for project:%s.",
+                event_id,
+                project_id,
+            )
+            return
+
+        self.pending_deduplication_keys.add(deduplication_key)
+        self.events[project_id].append(
+            {"cache_key": cache_key, "start_time": start_time, "event_id": event_id}
+        )
+        self.deduplication_keys[project_id].append(deduplication_key)
+        if len(self.events[project_id]) >= self.max_size:
+            self._submit(project_id)
+
+    def flush(self) -> None:
+        for project_id in list(self.events):
+            self._submit(project_id)
+
+    def _submit(self, project_id: int) -> None:
+        events = self.events.pop(project_id)
+        deduplication_keys = self.deduplication_keys.pop(project_id)
+        metrics.distribution("ingest_consumer.save_event_batch.size", len(events))
+        save_event_transaction_batch.delay(project_id=project_id, events=events)
+        cache.set_many({key: "" for key in deduplication_keys}, CACHE_TIMEOUT)
+        self.pending_deduplication_keys.difference_update(deduplication_keys)
+
+
+class PendingEventSaves:
+    """
+    Collects the transaction events that `process_event` would add to a
+    `SaveEventBatch`, so that they can be added to one in a later step of the
+    consumer.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+
+    def add(
+        self,
+        project_id: int,
+        cache_key: str,
+        start_time: float,
+        event_id: str,
+        deduplication_key: str,
+    ) -> None:
+        self.events.append(
+            {
+                "project_id": project_id,
+                "cache_key": cache_key,
+                "start_time": start_time,
+                "event_id": event_id,
+                "deduplication_key": deduplication_key,
+            }
+        )
+
+
 def trace_func(**span_kwargs):
     def wrapper(f):
         @functools.wraps(f)
@@ -54,10 +144,16 @@ def trace_func(**span_kwargs):
 @trace_func(name="ingest_consumer.process_event")
 @metrics.wraps("ingest_consumer.process_event")
 def process_event(
-    message: IngestMessage, project: Project, reprocess_only_stuck_events: bool = False
+    message: IngestMessage,
+    project: Project,
+    reprocess_only_stuck_events: bool = False,
+    save_batch: SaveEventBatch | PendingEventSaves | None = None,
 ) -> None:
     """
     Perform some initial filtering and deserialize the message payload.
+
+    If ``save_batch`` is given, transaction events are added to it instead of
+    being saved by a task of their own.
     """
     payload = message["payload"]
     start_time = float(message["start_time"])
@@ -147,7 +243,9 @@ def process_event(
             return
 
         with metrics.timer("ingest_consumer._store_event"):
-            cache_key = event_processing_store.store(data)
+            # `data` is still unmodified at this point, so the original payload
+            # can be stored as is instead of encoding `data` again.
+            cache_key = event_processing_store.store_encoded(data, payload)
 
         try:
             # Records rc-processing usage broken down by
@@ -176,7 +274,9 @@ def process_event(
                     cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT
                 )
 
-        if data.get("type") == "transaction":
+        if data.get("type") == "transaction" and save_batch is not None:
+            save_batch.add(project_id, cache_key, start_time, event_id, deduplication_key)
+        elif data.get("type") == "transaction":
             # No need for preprocess/process for transactions thus submit
             # directly transaction specific save_event task.
             save_event_transaction.delay(
@@ -210,7 +310,8 @@ def process_event(
                 )
 
         # remember for an 1 hour that we saved this event (deduplication protection)
-        cache.set(deduplication_key, "", CACHE_TIMEOUT)
+        if save_batch is None or data.get("type") != "transaction":
+            cache.set(deduplication_key, "", CACHE_TIMEOUT)
 
         # emit event_accepted once everything is done
         event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
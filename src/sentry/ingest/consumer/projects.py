@@ -0,0 +1,75 @@
+"""
+Process-local snapshot of the projects the ingest consumer receives events for.
+
+Every ingested message needs its `Project`, and often its `Organization` (for
+feature checks), which otherwise means one or two cache roundtrips per
+message. With ``store.ingest-project-snapshot-ttl`` set, each consumer process
+keeps the projects it has seen, with their organization attached, and only
+refreshes a project once its entry has expired. Entries expire individually,
+so a busy consumer refreshes its projects one by one rather than all at once.
+
+Changes to a project or organization reach the consumer with a delay of up to
+the TTL.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from cachetools import LRUCache
+
+from sentry import options
+from sentry.models.organization import Organization
+from sentry.models.project import Project
+from sentry.utils import metrics
+
+SNAPSHOT_SIZE = 10000
+
+_snapshot: LRUCache[int, tuple[float, Project]] = LRUCache(maxsize=SNAPSHOT_SIZE)
+_snapshot_lock = threading.Lock()
+
+
+def _fetch_project(project_id: int) -> Project:
+    with metrics.timer("ingest_consumer.fetch_project"):
+        project = Project.objects.get_from_cache(id=project_id)
+        try:
+            project.organization = Organization.objects.get_from_cache(id=project.organization_id)
+        except Organization.DoesNotExist:
+            # Leave it to the lazy lookup on access, which fails the same way
+            pass
+    return project
+
+
+def get_project(project_id: int) -> Project:
+    """
+    Returns the project from the snapshot, fetching it from the cache if it is
+    missing or expired. Raises `Project.DoesNotExist` like
+    ``Project.objects.get_from_cache``.
+
+    The returned instance is shared between messages and must not be
+    modified.
+    """
+    ttl = options.get("store.ingest-project-snapshot-ttl")
+    if not ttl:
+        with metrics.timer("ingest_consumer.fetch_project"):
+            return Project.objects.get_from_cache(id=project_id)
+
+    now = time.monotonic()
+    with _snapshot_lock:
+        entry = _snapshot.get(project_id)
+
+    if entry is not None and entry[0] > now:
+        metrics.incr("ingest_consumer.project_snapshot.hit")
+        return entry[1]
+
+    metrics.incr("ingest_consumer.project_snapshot.miss")
+    project = _fetch_project(project_id)
+    with _snapshot_lock:
+        _snapshot[project_id] = (now + ttl, project)
+    return project
+
+
+def clear_project_snapshot() -> None:
+    with _snapshot_lock:
+        _snapshot.clear()
@@ -1,20 +1,28 @@
+from __future__ import annotations
+
 import logging
+from typing import Any
 
 import msgpack
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.dlq import InvalidMessage
+from arroyo.processing.strategies.batching import ValuesBatch
 from arroyo.types import BrokerValue, Message
 
 from sentry.models.project import Project
 from sentry.utils import metrics
 
-from .processors import IngestMessage, Retriable, process_event
+from .processors import IngestMessage, PendingEventSaves, Retriable, SaveEventBatch, process_event
+from .projects import get_project
 
 logger = logging.getLogger(__name__)
 
 
 def process_simple_event_message(
-    raw_message: Message[KafkaPayload], consumer_type: str, reprocess_only_stuck_events: bool
+    raw_message: Message[KafkaPayload],
+    consumer_type: str,
+    reprocess_only_stuck_events: bool,
+    save_batch: SaveEventBatch | PendingEventSaves | None = None,
 ) -> None:
     """
     Processes a single Kafka Message containing a "simple" Event payload.
@@ -48,13 +56,12 @@ def process_simple_event_message(
             raise ValueError(f"Unsupported message type: {message_type}")
 
         try:
-            with metrics.timer("ingest_consumer.fetch_project"):
-                project = Project.objects.get_from_cache(id=project_id)
+            project = get_project(project_id)
         except Project.DoesNotExist:
             logger.exception("Project for ingested event does not exist: %s", project_id)
             return
 
-        return process_event(message, project, reprocess_only_stuck_events)
+        return process_event(message, project, reprocess_only_stuck_events, save_batch)
 
     except Exception as exc:
         # If the retriable exception was raised, we should not DLQ
@@ -64,3 +71,41 @@ def process_simple_event_message(
         raw_value = raw_message.value
         assert isinstance(raw_value, BrokerValue)
         raise InvalidMessage(raw_value.partition, raw_value.offset) from exc
+
+
+def collect_simple_event_saves(
+    raw_message: Message[KafkaPayload],
+    consumer_type: str,
+    reprocess_only_stuck_events: bool,
+) -> list[dict[str, Any]]:
+    """
+    Processes a single Kafka Message like `process_simple_event_message`, but
+    returns a transaction event instead of dispatching a task to save it, so
+    that it can be saved in a batch by `save_simple_event_batch`.
+
+    Invalid messages raise `InvalidMessage` before any batching takes place,
+    so that they can still be sent to the DLQ.
+    """
+    pending_saves = PendingEventSaves()
+    process_simple_event_message(
+        raw_message, consumer_type, reprocess_only_stuck_events, pending_saves
+    )
+    return pending_saves.events
+
+
+def save_simple_event_batch(
+    raw_batch: Message[ValuesBatch[list[dict[str, Any]]]],
+    save_batch_size: int,
+) -> None:
+    """
+    Saves the transaction events returned by `collect_simple_event_saves` for
+    a batch of Kafka Messages with one task per project (see
+    `SaveEventBatch`).
+    """
+    save_batch = SaveEventBatch(save_batch_size)
+
+    for value in raw_batch.payload:
+        for event in value.payload:
+            save_batch.add(**event)
+
+    save_batch.flush()
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Trains a zstd dictionary for nodestore values from a sample of existing events"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            dest="projects",
+            action="append",
+            type=int,
+            required=True,
+            help="ID of a project to sample events from, may be passed multiple times",
+        )
+        parser.add_argument(
+            "--platform",
+            dest="platform",
+            help="Only sample events of this platform and train the dictionary for it. "
+            "Without it, the dictionary is used for all platforms without one of their own.",
+        )
+        parser.add_argument("--days", dest="days", type=int, default=7)
+        parser.add_argument("--samples", dest="samples", type=int, default=2000)
+        parser.add_argument(
+            "--size", dest="size", type=int, default=110 * 1024, help="Dictionary size in bytes"
+        )
+        parser.add_argument(
+            "--output-dir",
+            dest="output_dir",
+            help="Directory to write the dictionary to, defaults to "
+            "SENTRY_NODESTORE_DICTIONARY_DIR",
+        )
+
+    def handle(self, **options):
+        from datetime import timedelta
+
+        from django.conf import settings
+        from django.utils import timezone
+
+        from sentry import eventstore, nodestore
+        from sentry.eventstore.models import Event
+        from sentry.nodestore import dictionaries
+
+        output_dir = options["output_dir"] or settings.SENTRY_NODESTORE_DICTIONARY_DIR
+        if not output_dir:
+            raise CommandError("--output-dir or SENTRY_NODESTORE_DICTIONARY_DIR must be set")
+
+        platform = options["platform"]
+        conditions = [["platform", "=", platform]] if platform else None
+        end = timezone.now()
+        events = eventstore.backend.get_unfetched_events(
+            filter=eventstore.Filter(
+                project_ids=options["projects"],
+                conditions=conditions,
+                start=end - timedelta(days=options["days"]),
+                end=end,
+            ),
+            limit=options["samples"],
+        )
+        node_ids = [Event.generate_node_id(e.project_id, e.event_id) for e in events]
+
+        samples = []
+        for node_id in node_ids:
+            value = nodestore.backend.get_bytes(node_id)
+            if value:
+                samples.append(dictionaries.decompress(value))
+
+        if len(samples) < 10:
+            raise CommandError(f"Not enough sample nodes to train on, found {len(samples)}")
+
+        dictionary = dictionaries.train_dictionary(samples, options["size"])
+        dict_id = dictionaries.save_dictionary(
+            output_dir, platform or dictionaries.DEFAULT_PLATFORM, dictionary
+        )
+
+        self.stdout.write(
+            f"Trained dictionary {dict_id} for {platform or 'all platforms'} "
+            f"from {len(samples)} nodes, written to {output_dir}"
+        )
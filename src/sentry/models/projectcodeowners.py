@@ -13,6 +13,7 @@ from sentry.backup.scopes import RelocationScope
 from sentry.db.models import FlexibleForeignKey, JSONField, Model, region_silo_only_model, sane_repr
 from sentry.models.organization import Organization
 from sentry.ownership.grammar import convert_codeowners_syntax, create_schema_from_issue_owners
+from sentry.utils.batch_cache import batch_cached
 from sentry.utils.cache import cache
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,7 @@ class ProjectCodeOwners(Model):
         return f"projectcodeowners_project_id:1:{project_id}"
 
     @classmethod
+    @batch_cached
     def get_codeowners_cached(self, project_id: int) -> ProjectCodeOwners | None:
         """
         Cached read access to sentry_projectcodeowners.
@@ -17,9 +17,10 @@ from sentry.models.activity import Activity
 from sentry.models.actor import ActorTuple
 from sentry.models.group import Group
 from sentry.models.groupowner import OwnerRuleType
-from sentry.ownership.grammar import Rule, load_schema, resolve_actors
+from sentry.ownership.grammar import Rule, compile_schema, resolve_actors
 from sentry.types.activity import ActivityType
 from sentry.utils import metrics
+from sentry.utils.batch_cache import batch_cached
 from sentry.utils.cache import cache
 
 if TYPE_CHECKING:
@@ -66,7 +67,7 @@ class ProjectOwnership(Model):
     @classmethod
     def get_combined_schema(self, ownership, codeowners):
         if codeowners and codeowners.schema:
-            ownership.schema = (
+            return (
                 codeowners.schema
                 if not ownership.schema
                 else {
@@ -82,6 +83,7 @@ class ProjectOwnership(Model):
         return ownership.schema
 
     @classmethod
+    @batch_cached
     def get_ownership_cached(cls, project_id):
         """
         Cached read access to projectownership.
@@ -124,9 +126,14 @@ class ProjectOwnership(Model):
             ownership = cls(project_id=project_id)
 
         codeowners = ProjectCodeOwners.get_codeowners_cached(project_id)
-        ownership.schema = cls.get_combined_schema(ownership, codeowners)
 
-        rules = cls._matching_ownership_rules(ownership, data)
+        # Matches the rules of the combined schema (see `get_combined_schema`), but compiles the
+        # schemas of `ownership` and `codeowners` separately, as these are the objects that are
+        # reused between events.
+        rules = [
+            *(cls._matching_ownership_rules(codeowners, data) if codeowners else ()),
+            *cls._matching_ownership_rules(ownership, data),
+        ]
 
         if not rules:
             return [], None
@@ -373,14 +380,10 @@ class ProjectOwnership(Model):
         ownership: ProjectOwnership | ProjectCodeOwners,
         data: Mapping[str, Any],
     ) -> Sequence[Rule]:
-        rules = []
-
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
+        if ownership.schema is None:
+            return []
 
-        return rules
+        return compile_schema(ownership.schema).matching_rules(data)
 
 
 def process_resource_change(instance, change, **kwargs):
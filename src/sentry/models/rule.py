@@ -17,6 +17,7 @@ from sentry.db.models import (
 )
 from sentry.db.models.fields.hybrid_cloud_foreign_key import HybridCloudForeignKey
 from sentry.db.models.manager import BaseManager
+from sentry.utils.batch_cache import batch_cached
 from sentry.utils.cache import cache
 
 
@@ -70,6 +71,7 @@ class Rule(Model):
     __repr__ = sane_repr("project_id", "label")
 
     @classmethod
+    @batch_cached
     def get_for_project(cls, project_id):
         cache_key = f"project:{project_id}:rules"
         rules_list = cache.get(cache_key)
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import itertools
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from threading import local
+from threading import Lock, local
 from typing import Any
 
 import sentry_sdk
+from cachetools import TTLCache
+from django.conf import settings
 from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
-from sentry.utils import json
+from sentry import options
+from sentry.nodestore import dictionaries
+from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
 # Cache an instance of the encoder we want to use
@@ -26,6 +33,86 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Shared by all backends with `multi_get_concurrency` > 1
+_multi_get_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="nodestore-get-multi")
+
+
+class LocalNodeCache:
+    """
+    Bounded, process-local cache of encoded node payloads in front of the
+    shared nodestore cache. Entries are weighed by their size and expire after
+    ``ttl`` seconds.
+
+    Payloads are kept encoded and decoded on every hit, as callers modify the
+    payloads they get (`NodeData.bind_data` for example pops the node reference
+    from it). Writes and deletes only update the cache of the current process,
+    other processes can serve a stale value for up to ``ttl`` seconds.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self._cache = _EvictionCountingTTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=len)
+        self._lock = Lock()
+
+    def get_many(self, id_list: list[str]) -> dict[str, bytes]:
+        rv = {}
+        with self._lock:
+            for id in id_list:
+                value = self._cache.get(id)
+                if value is not None:
+                    rv[id] = value
+
+        if rv:
+            metrics.incr("nodestore.local_cache.hit", amount=len(rv))
+        if len(rv) < len(id_list):
+            metrics.incr("nodestore.local_cache.miss", amount=len(id_list) - len(rv))
+        return rv
+
+    def set(self, id: str, value: bytes) -> None:
+        if not value or len(value) > self._cache.maxsize:
+            return
+        with self._lock:
+            self._cache[id] = value
+
+    def delete_many(self, id_list: list[str]) -> None:
+        with self._lock:
+            for id in id_list:
+                self._cache.pop(id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class _EvictionCountingTTLCache(TTLCache):
+    def popitem(self) -> tuple[Any, Any]:
+        # only called when an entry has to make room for a new one
+        rv = super().popitem()
+        metrics.incr("nodestore.local_cache.evict")
+        return rv
+
+
+_local_node_cache: LocalNodeCache | None = None
+_local_node_cache_lock = Lock()
+
+
+def get_local_node_cache() -> LocalNodeCache | None:
+    """
+    Returns the process-wide node cache, or `None` if it is disabled via
+    `SENTRY_NODESTORE_LOCAL_CACHE_SIZE`.
+    """
+    global _local_node_cache
+    max_bytes = settings.SENTRY_NODESTORE_LOCAL_CACHE_SIZE
+    if not max_bytes:
+        return None
+
+    if _local_node_cache is None:
+        with _local_node_cache_lock:
+            if _local_node_cache is None:
+                _local_node_cache = LocalNodeCache(
+                    max_bytes=max_bytes, ttl=settings.SENTRY_NODESTORE_LOCAL_CACHE_TTL
+                )
+    return _local_node_cache
+
 
 class NodeStorage(local, Service):
     """
@@ -62,12 +149,18 @@ class NodeStorage(local, Service):
     stages of the pipeline.
     """
 
+    #: Number of ids fetched from the backend per call in `get_multi` and `get_multi_iter`.
+    multi_get_shard_size = 100
+    #: Number of shards fetched concurrently, `1` fetches them one after the other.
+    multi_get_concurrency = 1
+
     __all__ = (
         "delete",
         "delete_multi",
         "get",
         "get_bytes",
         "get_multi",
+        "get_multi_iter",
         "set",
         "set_bytes",
         "set_subkeys",
@@ -98,6 +191,7 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        value = dictionaries.decompress(value)
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -136,10 +230,17 @@ class NodeStorage(local, Service):
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
             if subkey is None:
+                item_from_local_cache = self._get_local_cache_items([id]).get(id)
+                if item_from_local_cache:
+                    span.set_tag("origin", "from_local_cache")
+                    span.set_tag("found", True)
+                    return item_from_local_cache
+
                 item_from_cache = self._get_cache_item(id)
                 if item_from_cache:
                     span.set_tag("origin", "from_cache")
                     span.set_tag("found", bool(item_from_cache))
+                    self._promote_local_cache_items({id: item_from_cache})
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
@@ -148,6 +249,8 @@ class NodeStorage(local, Service):
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
+                if rv:
+                    self._set_local_cache_item(id, bytes_data)
 
             span.set_tag("result", "from_service")
             if bytes_data:
@@ -166,6 +269,64 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
+    def _get_cached_multi(self, id_list: list[str]) -> dict[str, Any]:
+        """
+        Returns the nodes in `id_list` that are present in the local or shared
+        cache.
+        """
+        cache_items = self._get_local_cache_items(id_list)
+        if len(cache_items) < len(id_list):
+            shared_items = self._get_cache_items([id for id in id_list if id not in cache_items])
+            self._promote_local_cache_items(shared_items)
+            cache_items.update(shared_items)
+        return cache_items
+
+    def _get_multi_shard(self, id_list: list[str], subkey: str | None) -> dict[str, Any | None]:
+        """
+        Fetches and decodes one shard of a multi-get from the backend.
+        """
+        bytes_items = self._get_bytes_multi(id_list)
+        items = {id: self._decode(value, subkey=subkey) for id, value in bytes_items.items()}
+        if subkey is None:
+            self._set_cache_items(items)
+            for id, value in bytes_items.items():
+                if items[id]:
+                    self._set_local_cache_item(id, value)
+        return items
+
+    def _iter_multi_shards(
+        self, id_list: list[str], subkey: str | None
+    ) -> Iterator[dict[str, Any | None]]:
+        """
+        Splits `id_list` into shards of `multi_get_shard_size` ids and yields
+        the fetched shards as they complete, fetching up to
+        `multi_get_concurrency` shards at once on the shared thread pool.
+        """
+        shards = [
+            id_list[i : i + self.multi_get_shard_size]
+            for i in range(0, len(id_list), self.multi_get_shard_size)
+        ]
+        if self.multi_get_concurrency <= 1 or len(shards) <= 1:
+            for shard in shards:
+                yield self._get_multi_shard(shard, subkey)
+            return
+
+        shards_iter = iter(shards)
+        pending: set[Future[dict[str, Any | None]]] = set()
+        try:
+            for shard in itertools.islice(shards_iter, self.multi_get_concurrency):
+                pending.add(_multi_get_pool.submit(self._get_multi_shard, shard, subkey))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for shard in itertools.islice(shards_iter, len(done)):
+                    pending.add(_multi_get_pool.submit(self._get_multi_shard, shard, subkey))
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
     def get_multi(self, id_list: list[str], subkey: str | None = None) -> dict[str, Any | None]:
         """
         >>> nodestore.get_multi(['key1', 'key2')
@@ -179,7 +340,7 @@ class NodeStorage(local, Service):
             span.set_tag("num_ids", len(id_list))
 
             if subkey is None:
-                cache_items = self._get_cache_items(id_list)
+                cache_items = self._get_cached_multi(id_list)
                 if len(cache_items) == len(id_list):
                     span.set_tag("result", "from_cache")
                     return cache_items
@@ -188,12 +349,10 @@ class NodeStorage(local, Service):
             else:
                 uncached_ids = id_list
 
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
+            items = {}
+            for shard_items in self._iter_multi_shards(uncached_ids, subkey):
+                items.update(shard_items)
             if subkey is None:
-                self._set_cache_items(items)
                 items.update(cache_items)
 
             span.set_tag("result", "from_service")
@@ -201,6 +360,35 @@ class NodeStorage(local, Service):
 
             return items
 
+    def get_multi_iter(
+        self, id_list: list[str], subkey: str | None = None
+    ) -> Iterator[tuple[str, Any | None]]:
+        """
+        Streaming version of `get_multi`, which yields `(id, data)` pairs as
+        soon as the shard they are in has been fetched and decoded, so that
+        callers can start working before the last node arrives. Cached nodes
+        are yielded first. Results are not in the order of `id_list`, and ids
+        missing from the backend may not be yielded at all.
+
+        >>> for id, data in nodestore.get_multi_iter(['key1', 'key2']):
+        ...     print(id, data)
+        key2 {"message": "hello world"}
+        key1 {"message": "hello world"}
+        """
+        with sentry_sdk.start_span(op="nodestore.get_multi_iter") as span:
+            span.set_tag("subkey", str(subkey))
+            span.set_tag("num_ids", len(id_list))
+
+            if subkey is None:
+                cache_items = self._get_cached_multi(id_list)
+                yield from cache_items.items()
+                uncached_ids = [id for id in id_list if id not in cache_items]
+            else:
+                uncached_ids = id_list
+
+            for shard_items in self._iter_multi_shards(uncached_ids, subkey):
+                yield from shard_items.items()
+
     def _encode(self, data: dict[str | None, dict[str, str]]) -> bytes:
         """
         Encode data dict in a way where its keys can be deserialized
@@ -209,14 +397,27 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        If `nodestore.use-zstd-dictionaries` is enabled and a dictionary is
+        available for the platform of the payload, the result is compressed
+        with it (see `sentry.nodestore.dictionaries`).
         """
-        lines = [json_dumps(data.pop(None)).encode("utf8")]
+        default = data.pop(None)
+        lines = [json_dumps(default).encode("utf8")]
         for key, value in data.items():
             if key is not None:
                 lines.append(key.encode("ascii"))
                 lines.append(json_dumps(value).encode("utf8"))
 
-        return b"\n".join(lines)
+        rv = b"\n".join(lines)
+
+        if options.get("nodestore.use-zstd-dictionaries"):
+            platform = default.get("platform") if isinstance(default, dict) else None
+            compressed = dictionaries.compress(rv, platform)
+            if compressed is not None:
+                return compressed
+
+        return rv
 
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
@@ -261,6 +462,10 @@ class NodeStorage(local, Service):
             self._set_bytes(item_id, bytes_data, ttl=ttl)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(item_id, cache_item)
+            if cache_item:
+                self._set_local_cache_item(item_id, bytes_data)
+            else:
+                self._delete_local_cache_items([item_id])
 
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         raise NotImplementedError
@@ -287,13 +492,45 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        self._delete_local_cache_items([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        self._delete_local_cache_items(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
+    def _get_local_cache_items(self, id_list: list[str]) -> dict[str, Any]:
+        local_cache = get_local_node_cache()
+        if local_cache:
+            return {
+                id: self._decode(value, subkey=None)
+                for id, value in local_cache.get_many(id_list).items()
+            }
+        return {}
+
+    def _set_local_cache_item(self, item_id: str, bytes_data: bytes | None) -> None:
+        local_cache = get_local_node_cache()
+        if local_cache and bytes_data:
+            local_cache.set(item_id, bytes_data)
+
+    def _promote_local_cache_items(self, items: dict[str, Any]) -> None:
+        """
+        Copies nodes served by the shared cache into the local cache, so that
+        they don't have to be fetched from it again.
+        """
+        local_cache = get_local_node_cache()
+        if local_cache:
+            for item_id, data in items.items():
+                if data:
+                    local_cache.set(item_id, json_dumps(data).encode("utf8"))
+
+    def _delete_local_cache_items(self, id_list: list[str]) -> None:
+        local_cache = get_local_node_cache()
+        if local_cache:
+            local_cache.delete_many(id_list)
+
     @cached_property
     def cache(self) -> BaseCache | None:
         try:
@@ -22,6 +22,9 @@ class BigtableNodeStorage(NodeStorage):
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
         string "zstd" to use zstd.
+    :param multi_get_shard_size: How many rows to read per request in
+        ``get_multi``/``get_multi_iter``.
+    :param multi_get_concurrency: How many of those requests to run at once.
 
     >>> from datetime import timedelta
     >>> BigtableNodeStorage(
@@ -43,6 +46,8 @@ class BigtableNodeStorage(NodeStorage):
         automatic_expiry: bool = False,
         default_ttl: timedelta | None = None,
         compression: bool = False,
+        multi_get_shard_size: int = 100,
+        multi_get_concurrency: int = 4,
         **client_options: object,
     ):
         if compression is True:
@@ -59,6 +64,8 @@ class BigtableNodeStorage(NodeStorage):
             client_options=client_options,
         )
         self.automatic_expiry = automatic_expiry
+        self.multi_get_shard_size = multi_get_shard_size
+        self.multi_get_concurrency = multi_get_concurrency
         self.skip_deletes = automatic_expiry and "_SENTRY_CLEANUP" in os.environ
 
     def _get_bytes(self, id: str) -> bytes | None:
@@ -0,0 +1,208 @@
+"""
+Versioned, dictionary compressed encoding for nodestore values.
+
+Event payloads of the same platform are extremely repetitive (same SDK, same
+contexts, same module paths), which generic compression in the backends can
+only exploit within a single payload. Values in this format are compressed
+with a zstd dictionary trained on a sample of existing nodes instead.
+
+An encoded value looks like this::
+
+    MAGIC (3 bytes) | VERSION (1 byte) | DICT_ID (4 bytes, big endian) | zstd frame
+
+A dictionary id of ``0`` means the frame was compressed without a dictionary.
+Legacy values start with ``{`` (JSON) or a pickle opcode and never with the
+magic, so both formats can be told apart by their first bytes.
+
+Dictionaries live as ``<dict_id>.zdict`` files in
+``settings.SENTRY_NODESTORE_DICTIONARY_DIR``, next to a ``manifest.json`` that
+maps a platform (or ``"default"``) to the dictionary id new values for that
+platform are written with. Old dictionaries must be kept around for as long as
+values written with them may still be read.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+import zstandard
+from django.conf import settings
+
+from sentry.utils import json, metrics
+
+MAGIC = b"\xffZD"
+VERSION = 1
+HEADER = struct.Struct(">3sBI")
+
+DEFAULT_PLATFORM = "default"
+MANIFEST_NAME = "manifest.json"
+COMPRESSION_LEVEL = 3
+
+
+class DictionaryNotFound(Exception):
+    pass
+
+
+class DictionaryRegistry:
+    """
+    Loads trained dictionaries from a directory and hands out (thread-local)
+    compressors and decompressors for them.
+    """
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self._dictionaries: dict[int, zstandard.ZstdCompressionDict] = {}
+        self._manifest: dict[str, int] = {}
+        self._local = threading.local()
+        if path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        assert self.path is not None
+        if not os.path.isdir(self.path):
+            return
+
+        for filename in os.listdir(self.path):
+            if not filename.endswith(".zdict"):
+                continue
+            with open(os.path.join(self.path, filename), "rb") as f:
+                dictionary = zstandard.ZstdCompressionDict(f.read())
+            self._dictionaries[dictionary.dict_id()] = dictionary
+
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "rb") as f:
+                manifest = json.loads(f.read())
+            self._manifest = {
+                platform: int(dict_id)
+                for platform, dict_id in manifest.items()
+                if int(dict_id) in self._dictionaries
+            }
+
+    def get_dict_id(self, platform: str | None) -> int | None:
+        """
+        Returns the id of the dictionary new values for ``platform`` should be
+        compressed with, if any.
+        """
+        if platform is not None and platform in self._manifest:
+            return self._manifest[platform]
+        return self._manifest.get(DEFAULT_PLATFORM)
+
+    def _cached(self, kind: str, dict_id: int) -> Any:
+        # zstd (de)compressor objects must not be shared between threads
+        cache = getattr(self._local, kind, None)
+        if cache is None:
+            cache = {}
+            setattr(self._local, kind, cache)
+
+        rv = cache.get(dict_id)
+        if rv is None:
+            kwargs: dict[str, Any] = {}
+            if dict_id:
+                try:
+                    kwargs["dict_data"] = self._dictionaries[dict_id]
+                except KeyError:
+                    raise DictionaryNotFound(dict_id)
+            if kind == "compressors":
+                rv = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, **kwargs)
+            else:
+                rv = zstandard.ZstdDecompressor(**kwargs)
+            cache[dict_id] = rv
+        return rv
+
+    def compress(self, data: bytes, dict_id: int) -> bytes:
+        frame = self._cached("compressors", dict_id).compress(data)
+        return HEADER.pack(MAGIC, VERSION, dict_id) + frame
+
+    def decompress(self, value: bytes) -> bytes:
+        _, version, dict_id = HEADER.unpack_from(value)
+        if version != VERSION:
+            raise ValueError(f"unsupported nodestore encoding version: {version}")
+        return self._cached("decompressors", dict_id).decompress(value[HEADER.size :])
+
+
+_registry: DictionaryRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> DictionaryRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = DictionaryRegistry(
+                    getattr(settings, "SENTRY_NODESTORE_DICTIONARY_DIR", None)
+                )
+    return _registry
+
+
+def reset_registry() -> None:
+    """
+    Drops the loaded dictionaries, so that they are read again from disk on
+    next use.
+    """
+    global _registry
+    with _registry_lock:
+        _registry = None
+
+
+def is_compressed(value: bytes) -> bool:
+    return value[: len(MAGIC)] == MAGIC
+
+
+def compress(data: bytes, platform: str | None) -> bytes | None:
+    """
+    Compresses an encoded node with the dictionary for ``platform``. Returns
+    ``None`` if no dictionary is configured for it, in which case the value
+    should be stored in the legacy format.
+    """
+    dict_id = get_registry().get_dict_id(platform)
+    if dict_id is None:
+        return None
+
+    rv = get_registry().compress(data, dict_id)
+    metrics.distribution(
+        "nodestore.dictionary.compression_ratio",
+        len(data) / max(len(rv), 1),
+        tags={"platform": platform or DEFAULT_PLATFORM},
+    )
+    return rv
+
+
+def decompress(value: bytes) -> bytes:
+    if not is_compressed(value):
+        return value
+    return get_registry().decompress(value)
+
+
+def train_dictionary(samples: Sequence[bytes], size: int) -> zstandard.ZstdCompressionDict:
+    return zstandard.train_dictionary(size, list(samples))
+
+
+def save_dictionary(path: str, platform: str, dictionary: zstandard.ZstdCompressionDict) -> int:
+    """
+    Writes ``dictionary`` into the directory at ``path`` and makes it the one
+    new values for ``platform`` are compressed with. Returns the dictionary id.
+    """
+    os.makedirs(path, exist_ok=True)
+    dict_id = dictionary.dict_id()
+    with open(os.path.join(path, f"{dict_id}.zdict"), "wb") as f:
+        f.write(dictionary.as_bytes())
+
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "rb") as f:
+            manifest = json.loads(f.read())
+    manifest[platform] = dict_id
+
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps(manifest))
+    os.replace(tmp_path, manifest_path)
+
+    return dict_id
@@ -10,7 +10,8 @@ import sentry_sdk
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
-from sentry.nodestore.base import NodeStorage
+from sentry.nodestore import dictionaries
+from sentry.nodestore.base import NodeStorage, get_local_node_cache
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -28,6 +29,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
+            value = dictionaries.decompress(value)
             if value.startswith(b"{"):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
@@ -66,6 +68,9 @@ class DjangoNodeStorage(NodeStorage):
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
         if self.cache:
             self.cache.clear()
+        local_cache = get_local_node_cache()
+        if local_cache:
+            local_cache.clear()
 
     def bootstrap(self) -> None:
         # Nothing for Django backend to do during bootstrap
@@ -190,6 +190,12 @@ register(
     type=Int,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Deliver the scheduled digests in tasks of this many timelines each, instead of one task per
+# timeline. 0 disables batching.
+register("digests.delivery-batch-size", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Write digest records with `NotificationCodec` instead of pickling them. Records of both formats
+# are always read, only enable this once all workers can decode the new format.
+register("digests.notification-codec.write", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # TOTP (Auth app)
 register(
@@ -624,6 +630,12 @@ register(
     "post-process.error-hook-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )  # unused
 
+# From 0.0 to 1.0: Randomly record the wall time, database queries, Redis commands and Snuba
+# queries of every post process pipeline step of a job, as metrics
+register("post-process.step-profiling.sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Log a summary of the recorded pipeline steps for every sampled post process job
+register("post-process.step-profiling.log-summary", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Transaction events
 # True => kill switch to disable ingestion of transaction events for internal project.
 register(
@@ -797,6 +809,15 @@ register(
     flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Projects whose slow alert rule conditions (event frequency and friends) are evaluated in bulk by
+# a periodic task instead of for every event. Requires the Redis buffer.
+register(
+    "rules.delayed-processing.projects-allowlist",
+    type=Sequence,
+    default=[],
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 
 # Killswitch for issue priority
 register(
@@ -916,6 +937,19 @@ register("store.background-grouping-config-id", default=None, flags=FLAG_AUTOMAT
 # Fraction of events that will pass through background grouping
 register("store.background-grouping-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Seconds for which ingest consumer processes reuse a project (and its organization) before
+# fetching it again. 0 fetches it for every message.
+register("store.ingest-project-snapshot-ttl", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Whether event ingestion looks up grouphashes in the cache before hitting the database.
+register("grouping.grouphash-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Whether the grouphash cache is backed by an additional short-lived in-process cache.
+register("grouping.grouphash-cache.local-enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Whether grouping hashes are memoized for events with identical grouping inputs.
+register("grouping.hash-memo.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Whether the grouping hash memo is shared between processes through the default cache.
+register("grouping.hash-memo.shared-enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Minimum number of files in an archive. Archives with fewer files are extracted and have their
 # contents stored as separate release files.
 register("processing.release-archive-min-files", default=10, flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -926,6 +960,10 @@ register("attachment-cache.use-zstd", default=False, flags=FLAG_AUTOMATOR_MODIFI
 # Whether to use `zstd` instead of `zlib` for encoded grouping enhancers.
 register("enhancers.use-zstd", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Whether to write nodestore values compressed with trained `zstd` dictionaries
+# (see `SENTRY_NODESTORE_DICTIONARY_DIR`). Reading them is always supported.
+register("nodestore.use-zstd-dictionaries", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Set of projects that will always store `EventAttachment` blobs directly.
 register("eventattachments.store-blobs.projects", default=[], flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Percentage sample rate for `EventAttachment`s that should use direct blob storage.
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import re
+import threading
 from collections import namedtuple
 from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import cached_property
+from hashlib import md5
 from typing import Any
 
+from cachetools import LRUCache
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar
 from parsimonious.nodes import Node, NodeVisitor
@@ -15,6 +19,7 @@ from sentry.models.actor import ActorTuple
 from sentry.models.integrations.repository_project_path_config import RepositoryProjectPathConfig
 from sentry.models.organizationmember import OrganizationMember
 from sentry.services.hybrid_cloud.user.service import user_service
+from sentry.utils import json
 from sentry.utils.codeowners import codeowners_match
 from sentry.utils.event_frames import find_stack_frames, get_sdk_name, munged_filename_and_frames
 from sentry.utils.glob import glob_match
@@ -24,6 +29,8 @@ __all__ = ("parse_rules", "dump_schema", "load_schema")
 
 VERSION = 1
 
+COMPILED_SCHEMA_CACHE_SIZE = 1000
+
 URL = "url"
 PATH = "path"
 MODULE = "module"
@@ -130,18 +137,25 @@ class Matcher(namedtuple("Matcher", "type pattern")):
 
         return frames, keys
 
-    def test(self, data: PathSearchable) -> bool:
+    def test(self, data: PathSearchable, values: EventMatchValues | None = None) -> bool:
+        """
+        Tests the matcher against the event ``data``. ``values`` can be given
+        to reuse the values extracted from ``data`` for other matchers.
+        """
+        if values is None:
+            values = EventMatchValues(data)
+
         if self.type == URL:
             return self.test_url(data)
         elif self.type == PATH:
-            return self.test_frames(*self.munge_if_needed(data))
+            return self.test_values(values.paths)
         elif self.type == MODULE:
-            return self.test_frames(find_stack_frames(data), ["module"])
+            return self.test_values(values.modules)
         elif self.type.startswith("tags."):
             return self.test_tag(data)
         elif self.type == CODEOWNERS:
-            return self.test_frames(
-                *self.munge_if_needed(data),
+            return self.test_values(
+                values.paths,
                 # Codeowners has a slightly different syntax compared to issue owners
                 # As such we need to match it using gitignore logic.
                 # See syntax documentation here:
@@ -165,16 +179,18 @@ class Matcher(namedtuple("Matcher", "type pattern")):
             glob_match(val, pattern, ignorecase=True, path_normalize=True)
         ),
     ) -> bool:
-        for frame in (f for f in frames if isinstance(f, Mapping)):
-            for key in keys:
-                value = frame.get(key)
-                if not value:
-                    continue
-
-                if match_frame_value_func(value, self.pattern):
-                    return True
+        return self.test_values(
+            EventMatchValues._distinct_values(frames, keys), match_frame_value_func
+        )
 
-        return False
+    def test_values(
+        self,
+        values: Iterable[str],
+        match_frame_value_func: Callable[[str | None, str], bool] = lambda val, pattern: bool(
+            glob_match(val, pattern, ignorecase=True, path_normalize=True)
+        ),
+    ) -> bool:
+        return any(match_frame_value_func(value, self.pattern) for value in values)
 
     def test_tag(self, data: PathSearchable) -> bool:
         tag = self.type[5:]
@@ -206,6 +222,97 @@ class Matcher(namedtuple("Matcher", "type pattern")):
         return False
 
 
+class EventMatchValues:
+    """
+    The frame values of an event which matchers test against, extracted once
+    per event instead of once per matcher. Every distinct value is only kept
+    once, in order of appearance.
+    """
+
+    def __init__(self, data: PathSearchable):
+        self.data = data
+
+    @staticmethod
+    def _distinct_values(frames: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> list[str]:
+        values: dict[str, None] = {}
+        for frame in (f for f in frames if isinstance(f, Mapping)):
+            for key in keys:
+                value = frame.get(key)
+                if value:
+                    values[value] = None
+        return list(values)
+
+    @cached_property
+    def paths(self) -> Sequence[str]:
+        return self._distinct_values(*Matcher.munge_if_needed(self.data))
+
+    @cached_property
+    def modules(self) -> Sequence[str]:
+        return self._distinct_values(find_stack_frames(self.data), ["module"])
+
+
+class CompiledSchema:
+    """
+    The rules of an ownership schema, prepared for testing many events.
+
+    Rules sharing a matcher are only tested once per event, and all rules
+    reuse the values extracted from the event.
+    """
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = rules
+        self.matchers = list(dict.fromkeys(rule.matcher for rule in rules))
+
+    def matching_rules(self, data: PathSearchable) -> list[Rule]:
+        """Returns the rules matching ``data``, in order."""
+        values = EventMatchValues(data)
+        results = {matcher: matcher.test(data, values) for matcher in self.matchers}
+        return [rule for rule in self.rules if results[rule.matcher]]
+
+
+_compiled_schemas: LRUCache[str, CompiledSchema] = LRUCache(maxsize=COMPILED_SCHEMA_CACHE_SIZE)
+# The digests of recently compiled schemas by object id. Each schema is kept
+# with its digest, so that its id can't be reused while the entry exists.
+_schema_digests: LRUCache[int, tuple[Mapping[str, Any], str]] = LRUCache(
+    maxsize=COMPILED_SCHEMA_CACHE_SIZE
+)
+_compiled_schemas_lock = threading.Lock()
+
+
+def clear_compiled_schemas() -> None:
+    with _compiled_schemas_lock:
+        _compiled_schemas.clear()
+        _schema_digests.clear()
+
+
+def _get_schema_digest(schema: Mapping[str, Any]) -> str:
+    with _compiled_schemas_lock:
+        entry = _schema_digests.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+
+    digest = md5(json.dumps(schema).encode()).hexdigest()
+    with _compiled_schemas_lock:
+        _schema_digests[id(schema)] = (schema, digest)
+    return digest
+
+
+def compile_schema(schema: Mapping[str, Any]) -> CompiledSchema:
+    """
+    Returns the `CompiledSchema` of an ownership schema, which is cached by
+    the schema's contents. The digest of the contents is only computed once
+    for the same schema object, which must not be modified afterwards.
+    """
+    key = _get_schema_digest(schema)
+    with _compiled_schemas_lock:
+        compiled = _compiled_schemas.get(key)
+    if compiled is None:
+        compiled = CompiledSchema(load_schema(schema))
+        with _compiled_schemas_lock:
+            _compiled_schemas[key] = compiled
+    return compiled
+
+
 class Owner(namedtuple("Owner", "type identifier")):
     """
     An Owner represents a User or Team who owns this Rule.
@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
+from functools import partial
 
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.processing.strategies import (
@@ -9,6 +12,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTaskInThreads,
 )
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.types import Commit, Message, Partition
 
 from sentry.utils.arroyo import MultiprocessingPool, RunTaskWithMultiprocessing
@@ -22,6 +26,12 @@ class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload
     def _dispatch_function(message: Message[KafkaPayload]) -> None:
         raise NotImplementedError()
 
+    @staticmethod
+    def _dispatch_batch_function(
+        message: Message[ValuesBatch[KafkaPayload]], max_batch_size: int
+    ) -> None:
+        raise NotImplementedError()
+
     def __init__(
         self,
         mode: str,
@@ -31,6 +41,8 @@ class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload
         max_batch_size: int,
         max_batch_time: int,
         concurrency: int,
+        post_process_batch_size: int | None = None,
+        post_process_batch_time: float = 1.0,
     ) -> None:
         self.mode = mode
         self.input_block_size = input_block_size
@@ -40,13 +52,32 @@ class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload
         self.concurrency = concurrency
         self.max_pending_futures = concurrency + 1000
         self.pool = MultiprocessingPool(num_processes)
+        # Events are dispatched in batches of up to `post_process_batch_size`
+        # events per queue, collected for up to `post_process_batch_time` seconds.
+        self.post_process_batch_size = post_process_batch_size
+        self.post_process_batch_time = post_process_batch_time
 
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
-        if self.mode == "multithreaded":
+        if self.post_process_batch_size:
+            logger.info("Starting batched post process forwarder")
+            return BatchStep(
+                max_batch_size=self.post_process_batch_size,
+                max_batch_time=self.post_process_batch_time,
+                next_step=RunTaskInThreads(
+                    processing_function=partial(
+                        self._dispatch_batch_function,
+                        max_batch_size=self.post_process_batch_size,
+                    ),
+                    concurrency=self.concurrency,
+                    max_pending_futures=self.max_pending_futures,
+                    next_step=CommitOffsets(commit),
+                ),
+            )
+        elif self.mode == "multithreaded":
             logger.info("Starting multithreaded post process forwarder")
             return RunTaskInThreads(
                 processing_function=self._dispatch_function,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Sequence
+from functools import cached_property, lru_cache
 from typing import Any
 
 from django import forms
@@ -9,6 +10,7 @@ from sentry.eventstore.models import GroupEvent
 from sentry.rules import MATCH_CHOICES, EventState, MatchType
 from sentry.rules.conditions.base import EventCondition
 from sentry.rules.history.preview_strategy import DATASET_TO_COLUMN_NAME, get_dataset_columns
+from sentry.rules.match import compile_match
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
 from sentry.types.condition_activity import ConditionActivity
@@ -42,6 +44,11 @@ ATTR_CHOICES = {
 }
 
 
+@lru_cache(maxsize=1024)
+def _parse_attribute(attr: str) -> tuple[str, ...]:
+    return tuple(attr.split("."))
+
+
 class EventAttributeForm(forms.Form):
     attribute = forms.ChoiceField(choices=[(a, a) for a in ATTR_CHOICES.keys()])
     match = forms.ChoiceField(choices=list(MATCH_CHOICES.items()))
@@ -79,7 +86,7 @@ class EventAttributeCondition(EventCondition):
 
     def _get_attribute_values(self, event: GroupEvent, attr: str) -> Sequence[object | None]:
         # TODO(dcramer): we should validate attributes (when we can) before
-        path = attr.split(".")
+        path = list(_parse_attribute(attr))
 
         if path[0] == "platform":
             if len(path) != 1:
@@ -221,6 +228,10 @@ class EventAttributeCondition(EventCondition):
         }
         return self.label.format(**data)
 
+    @cached_property
+    def _matcher(self) -> Callable[[Iterable[str]], bool] | None:
+        return compile_match(self.get_option("match"), self.get_option("value"))
+
     def _passes(self, attribute_values: Sequence[object | None]) -> bool:
         match = self.get_option("match")
         value = self.get_option("value")
@@ -228,70 +239,19 @@ class EventAttributeCondition(EventCondition):
         if not ((match and value) or (match in (MatchType.IS_SET, MatchType.NOT_SET))):
             return False
 
-        value = value.lower()
-
-        values = [str(v).lower() for v in attribute_values if v is not None]
-
-        if match == MatchType.EQUAL:
-            for a_value in values:
-                if a_value == value:
-                    return True
-            return False
-
-        elif match == MatchType.NOT_EQUAL:
-            for a_value in values:
-                if a_value == value:
-                    return False
-            return True
-
-        elif match == MatchType.STARTS_WITH:
-            for a_value in values:
-                if a_value.startswith(value):
-                    return True
-            return False
-
-        elif match == MatchType.NOT_STARTS_WITH:
-            for a_value in values:
-                if a_value.startswith(value):
-                    return False
-            return True
-
-        elif match == MatchType.ENDS_WITH:
-            for a_value in values:
-                if a_value.endswith(value):
-                    return True
-            return False
-
-        elif match == MatchType.NOT_ENDS_WITH:
-            for a_value in values:
-                if a_value.endswith(value):
-                    return False
-            return True
-
-        elif match == MatchType.CONTAINS:
-            for a_value in values:
-                if value in a_value:
-                    return True
-            return False
-
-        elif match == MatchType.NOT_CONTAINS:
-            for a_value in values:
-                if value in a_value:
-                    return False
-            return True
-
-        elif match == MatchType.IS_SET:
-            return bool(values)
+        matcher = self._matcher
+        if matcher is None:
+            raise RuntimeError("Invalid Match")
 
-        elif match == MatchType.NOT_SET:
-            return not values
+        return matcher([str(v).lower() for v in attribute_values if v is not None])
 
-        raise RuntimeError("Invalid Match")
+    @cached_property
+    def _attribute(self) -> str:
+        return self.get_option("attribute", "").lower()
 
     def passes(self, event: GroupEvent, state: EventState, **kwargs: Any) -> bool:
-        attr = self.get_option("attribute", "")
         try:
-            attribute_values = self._get_attribute_values(event, attr.lower())
+            attribute_values = self._get_attribute_values(event, self._attribute)
         except KeyError:
             attribute_values = []
 
@@ -4,7 +4,8 @@ import abc
 import contextlib
 import logging
 import re
-from collections.abc import Mapping
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Mapping, Sequence
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -15,6 +16,7 @@ from django.utils import timezone
 from sentry import release_health, tsdb
 from sentry.eventstore.models import GroupEvent
 from sentry.issues.constants import get_issue_tsdb_group_model, get_issue_tsdb_user_group_model
+from sentry.models.group import Group
 from sentry.receivers.rules import DEFAULT_RULE_LABEL, DEFAULT_RULE_LABEL_NEW
 from sentry.rules import EventState
 from sentry.rules.conditions.base import EventCondition
@@ -92,12 +94,39 @@ class EventFrequencyForm(forms.Form):
         return cleaned_data
 
 
+class EventFrequencyQueryPlan:
+    """
+    Shares frequency query results between all conditions evaluated for the
+    same event.
+
+    Projects commonly have many alert rules with the same frequency condition
+    (same interval, environment and comparison window). Every condition
+    evaluated with the same plan uses the same end timestamp, so identical
+    queries line up and are only executed once, the first time a rule
+    actually needs the result.
+    """
+
+    def __init__(self, now: datetime | None = None) -> None:
+        self.now = now or timezone.now()
+        self._results: dict[Hashable, int] = {}
+
+    def execute(self, key: Hashable, query: Callable[[], int]) -> int:
+        try:
+            result = self._results[key]
+        except KeyError:
+            result = self._results[key] = query()
+        else:
+            metrics.incr("rules.conditions.frequency_query_plan.shared")
+        return result
+
+
 class BaseEventFrequencyCondition(EventCondition, abc.ABC):
     intervals = standard_intervals
     form_cls = EventFrequencyForm
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        self.query_plan: EventFrequencyQueryPlan | None = kwargs.pop("query_plan", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -169,12 +198,24 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
     def get_preview_aggregate(self) -> tuple[str, str]:
         raise NotImplementedError
 
+    def get_condition_name(self) -> str:
+        return re.sub("(?!^)([A-Z]+)", r"_\1", self.__class__.__name__).lower()
+
     def query(self, event: GroupEvent, start: datetime, end: datetime, environment_id: str) -> int:
+        query_key = self.get_query_key(event)
+        if self.query_plan is not None and query_key is not None:
+            return self.query_plan.execute(
+                (query_key, event.group_id, start, end, environment_id),
+                lambda: self._query(event, start, end, environment_id),
+            )
+        return self._query(event, start, end, environment_id)
+
+    def _query(self, event: GroupEvent, start: datetime, end: datetime, environment_id: str) -> int:
         query_result = self.query_hook(event, start, end, environment_id)
         metrics.incr(
             "rules.conditions.queried_snuba",
             tags={
-                "condition": re.sub("(?!^)([A-Z]+)", r"_\1", self.__class__.__name__).lower(),
+                "condition": self.get_condition_name(),
                 "is_created_on_project_creation": self.is_guessed_to_be_created_on_project_creation,
             },
         )
@@ -186,15 +227,46 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         """ """
         raise NotImplementedError  # subclass must implement
 
-    def get_rate(self, event: GroupEvent, interval: str, environment_id: str) -> int:
-        _, duration = self.intervals[interval]
-        end = timezone.now()
+    def batch_query(
+        self, groups: Sequence[Group], start: datetime, end: datetime, environment_id: int | None
+    ) -> dict[int, int]:
+        result = self.batch_query_hook(groups, start, end, environment_id)
+        metrics.incr(
+            "rules.conditions.batch_queried_snuba",
+            tags={"condition": self.get_condition_name()},
+        )
+        return result
+
+    def batch_query_hook(
+        self, groups: Sequence[Group], start: datetime, end: datetime, environment_id: int | None
+    ) -> dict[int, int]:
+        """
+        Like `query_hook`, but for many groups of the condition's project at
+        once. Returns the value for each group id.
+        """
+        raise NotImplementedError  # subclass must implement
+
+    def get_query_key(self, event: GroupEvent) -> Hashable | None:
+        """
+        Identifies what `query_hook` computes apart from the time window and
+        environment, so that conditions running the same query can share its
+        result. Returns `None` if results must not be shared.
+        """
+        return None
+
+    def _consistency_override(
+        self, duration: timedelta
+    ) -> contextlib.AbstractContextManager[object]:
         # For conditions with interval >= 1 hour we don't need to worry about read your writes
         # consistency. Disable it so that we can scale to more nodes.
-        option_override_cm: contextlib.AbstractContextManager[object] = contextlib.nullcontext()
         if duration >= timedelta(hours=1):
-            option_override_cm = options_override({"consistent": False})
-        with option_override_cm:
+            return options_override({"consistent": False})
+        return contextlib.nullcontext()
+
+    def get_rate(self, event: GroupEvent, interval: str, environment_id: str) -> int:
+        _, duration = self.intervals[interval]
+        end = self.query_plan.now if self.query_plan is not None else timezone.now()
+        with self._consistency_override(duration):
             result: int = self.query(event, end - duration, end, environment_id=environment_id)
             comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
             if comparison_type == COMPARISON_TYPE_PERCENT:
@@ -210,6 +282,66 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
 
         return result
 
+    def get_rate_bulk(
+        self, groups: Sequence[Group], environment_id: int | None, now: datetime
+    ) -> dict[int, int]:
+        """
+        Computes `get_rate` for many groups at once, with one query per
+        window instead of one per group.
+        """
+        _, duration = self.intervals[self.get_option("interval")]
+        with self._consistency_override(duration):
+            result = self.batch_query(groups, now - duration, now, environment_id)
+            comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
+            if comparison_type == COMPARISON_TYPE_PERCENT:
+                comparison_interval = comparison_intervals[self.get_option("comparisonInterval")][1]
+                comparison_end = now - comparison_interval
+                comparison_result = self.batch_query(
+                    groups, comparison_end - duration, comparison_end, environment_id
+                )
+                result = {
+                    group_id: percent_increase(value, comparison_result.get(group_id, 0))
+                    for group_id, value in result.items()
+                }
+
+        return result
+
+    def passes_value(self, current_value: int) -> bool:
+        _, value = self._get_options()
+        return value is not None and current_value > value
+
+    def _batch_tsdb_query(
+        self,
+        query: Callable[..., Mapping[int, int]],
+        get_model: Callable[[Any], Any],
+        groups: Sequence[Group],
+        start: datetime,
+        end: datetime,
+        environment_id: int | None,
+        referrer_suffix: str,
+    ) -> dict[int, int]:
+        # Groups of different issue categories are counted in different TSDB models.
+        keys_by_model: dict[Any, list[int]] = defaultdict(list)
+        for group in groups:
+            keys_by_model[get_model(group.issue_category)].append(group.id)
+
+        result: dict[int, int] = {}
+        for model, keys in keys_by_model.items():
+            result.update(
+                query(
+                    model=model,
+                    keys=keys,
+                    start=start,
+                    end=end,
+                    environment_id=environment_id,
+                    use_cache=True,
+                    jitter_value=self.project.id,
+                    tenant_ids={"organization_id": self.project.organization_id},
+                    referrer_suffix=referrer_suffix,
+                )
+            )
+        return result
+
     @property
     def is_guessed_to_be_created_on_project_creation(self) -> bool:
         """
@@ -247,6 +379,22 @@ class EventFrequencyCondition(BaseEventFrequencyCondition):
         )
         return sums[event.group_id]
 
+    def batch_query_hook(
+        self, groups: Sequence[Group], start: datetime, end: datetime, environment_id: int | None
+    ) -> dict[int, int]:
+        return self._batch_tsdb_query(
+            self.tsdb.get_sums,
+            get_issue_tsdb_group_model,
+            groups,
+            start,
+            end,
+            environment_id,
+            referrer_suffix="batch_alert_event_frequency",
+        )
+
+    def get_query_key(self, event: GroupEvent) -> Hashable | None:
+        return ("sums", get_issue_tsdb_group_model(event.group.issue_category))
+
     def get_preview_aggregate(self) -> tuple[str, str]:
         return "count", "roundedTime"
 
@@ -271,6 +419,22 @@ class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
         )
         return totals[event.group_id]
 
+    def batch_query_hook(
+        self, groups: Sequence[Group], start: datetime, end: datetime, environment_id: int | None
+    ) -> dict[int, int]:
+        return self._batch_tsdb_query(
+            self.tsdb.get_distinct_counts_totals,
+            get_issue_tsdb_user_group_model,
+            groups,
+            start,
+            end,
+            environment_id,
+            referrer_suffix="batch_alert_event_uniq_user_frequency",
+        )
+
+    def get_query_key(self, event: GroupEvent) -> Hashable | None:
+        return ("distinct_counts", get_issue_tsdb_user_group_model(event.group.issue_category))
+
     def get_preview_aggregate(self) -> tuple[str, str]:
         return "uniq", "user"
 
@@ -347,26 +511,10 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
     ) -> int:
         project_id = event.project_id
-        cache_key = f"r.c.spc:{project_id}-{environment_id}"
-        session_count_last_hour = cache.get(cache_key)
-        if session_count_last_hour is None:
-            with options_override({"consistent": False}):
-                session_count_last_hour = release_health.backend.get_project_sessions_count(
-                    project_id=project_id,
-                    environment_id=environment_id,
-                    rollup=60,
-                    start=end - timedelta(minutes=60),
-                    end=end,
-                )
-
-            cache.set(cache_key, session_count_last_hour, 600)
-
-        if session_count_last_hour >= MIN_SESSIONS_TO_FIRE:
-            interval_in_minutes = (
-                percent_intervals[self.get_option("interval")][1].total_seconds() // 60
-            )
-            avg_sessions_in_interval = session_count_last_hour / (60 / interval_in_minutes)
-
+        avg_sessions_in_interval = self._get_avg_sessions_in_interval(
+            project_id, environment_id, end
+        )
+        if avg_sessions_in_interval is not None:
             issue_count = self.tsdb.get_sums(
                 model=get_issue_tsdb_group_model(event.group.issue_category),
                 keys=[event.group_id],
@@ -393,6 +541,64 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
 
         return 0
 
+    def _get_avg_sessions_in_interval(
+        self, project_id: int, environment_id: int | str | None, end: datetime
+    ) -> float | None:
+        """
+        Returns the average number of sessions of the project in an interval
+        of the configured length, or `None` if the project has too few
+        sessions for the condition to fire.
+        """
+        cache_key = f"r.c.spc:{project_id}-{environment_id}"
+        session_count_last_hour = cache.get(cache_key)
+        if session_count_last_hour is None:
+            with options_override({"consistent": False}):
+                session_count_last_hour = release_health.backend.get_project_sessions_count(
+                    project_id=project_id,
+                    environment_id=environment_id,
+                    rollup=60,
+                    start=end - timedelta(minutes=60),
+                    end=end,
+                )
+
+            cache.set(cache_key, session_count_last_hour, 600)
+
+        if session_count_last_hour < MIN_SESSIONS_TO_FIRE:
+            return None
+
+        interval_in_minutes = (
+            percent_intervals[self.get_option("interval")][1].total_seconds() // 60
+        )
+        avg_sessions_in_interval: float = session_count_last_hour / (60 / interval_in_minutes)
+        return avg_sessions_in_interval
+
+    def batch_query_hook(
+        self, groups: Sequence[Group], start: datetime, end: datetime, environment_id: int | None
+    ) -> dict[int, int]:
+        avg_sessions_in_interval = self._get_avg_sessions_in_interval(
+            self.project.id, environment_id, end
+        )
+        if avg_sessions_in_interval is None:
+            return {group.id: 0 for group in groups}
+
+        issue_counts = self._batch_tsdb_query(
+            self.tsdb.get_sums,
+            get_issue_tsdb_group_model,
+            groups,
+            start,
+            end,
+            environment_id,
+            referrer_suffix="batch_alert_event_frequency_percent",
+        )
+        return {
+            group_id: 100 * round(issue_count / avg_sessions_in_interval, 4)
+            for group_id, issue_count in issue_counts.items()
+        }
+
+    def get_query_key(self, event: GroupEvent) -> Hashable | None:
+        # The result is relative to the session count for the configured interval.
+        return ("percent", self.get_option("interval"))
+
     def passes_activity_frequency(
         self, activity: ConditionActivity, buckets: dict[datetime, int]
     ) -> bool:
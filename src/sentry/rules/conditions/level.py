@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Sequence
+from functools import cached_property
 from typing import Any
 
 from django import forms
@@ -33,14 +34,18 @@ class LevelCondition(EventCondition):
         "match": {"type": "choice", "choices": list(MATCH_CHOICES.items())},
     }
 
-    def _passes(self, level_name: str) -> bool:
+    @cached_property
+    def _desired_level(self) -> int | None:
         desired_level_raw = self.get_option("level")
+        return int(desired_level_raw) if desired_level_raw else None
+
+    def _passes(self, level_name: str) -> bool:
+        desired_level = self._desired_level
         desired_match = self.get_option("match")
 
-        if not (desired_level_raw and desired_match):
+        if not (desired_level is not None and desired_match):
             return False
 
-        desired_level = int(desired_level_raw)
         # Fetch the event level from the tags since event.level is
         # event.group.level which may have changed
         try:
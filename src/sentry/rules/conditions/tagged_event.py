@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Sequence
+from functools import cached_property
 from typing import Any
 
 from django import forms
@@ -10,6 +11,7 @@ from sentry.eventstore.models import GroupEvent
 from sentry.rules import MATCH_CHOICES, EventState, MatchType
 from sentry.rules.conditions.base import EventCondition
 from sentry.rules.history.preview_strategy import get_dataset_columns
+from sentry.rules.match import compile_match
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
 from sentry.types.condition_activity import ConditionActivity
@@ -45,6 +47,10 @@ class TaggedEventCondition(EventCondition):
         "value": {"type": "string", "placeholder": "value"},
     }
 
+    @cached_property
+    def _matcher(self) -> Callable[[Iterable[str]], bool] | None:
+        return compile_match(self.get_option("match"), self.get_option("value"))
+
     def _passes(self, raw_tags: Sequence[tuple[str, Any]]) -> bool:
         key = self.get_option("key")
         match = self.get_option("match")
@@ -73,64 +79,16 @@ class TaggedEventCondition(EventCondition):
         if not value:
             return False
 
-        value = value.lower()
+        matcher = self._matcher
+        if matcher is None:
+            raise RuntimeError("Invalid Match")
 
-        values = (
+        return matcher(
             v.lower()
             for k, v in raw_tags
             if k.lower() == key or tagstore.backend.get_standardized_key(k) == key
         )
 
-        if match == MatchType.EQUAL:
-            for t_value in values:
-                if t_value == value:
-                    return True
-            return False
-
-        elif match == MatchType.NOT_EQUAL:
-            for t_value in values:
-                if t_value == value:
-                    return False
-            return True
-
-        elif match == MatchType.STARTS_WITH:
-            for t_value in values:
-                if t_value.startswith(value):
-                    return True
-            return False
-
-        elif match == MatchType.NOT_STARTS_WITH:
-            for t_value in values:
-                if t_value.startswith(value):
-                    return False
-            return True
-
-        elif match == MatchType.ENDS_WITH:
-            for t_value in values:
-                if t_value.endswith(value):
-                    return True
-            return False
-
-        elif match == MatchType.NOT_ENDS_WITH:
-            for t_value in values:
-                if t_value.endswith(value):
-                    return False
-            return True
-
-        elif match == MatchType.CONTAINS:
-            for t_value in values:
-                if value in t_value:
-                    return True
-            return False
-
-        elif match == MatchType.NOT_CONTAINS:
-            for t_value in values:
-                if value in t_value:
-                    return False
-            return True
-
-        raise RuntimeError("Invalid Match")
-
     def passes(self, event: GroupEvent, state: EventState, **kwargs: Any) -> bool:
         return self._passes(event.tags)
 
@@ -0,0 +1,273 @@
+"""
+Delayed evaluation of slow rule conditions.
+
+For projects in the ``rules.delayed-processing.projects-allowlist`` option,
+`RuleProcessor` does not evaluate slow conditions (event frequency and
+friends) inline for every event. Instead it records the rule and group in the
+buffer and `apply_delayed` later evaluates all pending rule/group pairs of a
+project at once, with one TSDB query per distinct condition covering all of
+the project's groups. This trades some alert latency for a much lower cost of
+processing each event.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+from django.utils import timezone
+
+from sentry import buffer, eventstore, options
+from sentry.eventstore.models import GroupEvent
+from sentry.models.group import Group
+from sentry.models.project import Project
+from sentry.models.rule import Rule
+from sentry.models.rulesnooze import RuleSnooze
+from sentry.rules import rules
+from sentry.rules.conditions.event_frequency import BaseEventFrequencyCondition
+from sentry.rules.processor import RuleProcessor, get_match_function, is_condition_slow
+from sentry.silo.base import SiloMode
+from sentry.tasks.base import instrumented_task
+from sentry.utils import json, metrics
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.safe import safe_execute
+
+logger = logging.getLogger("sentry.rules.delayed_processing")
+
+PROJECT_ID_BUFFER_LIST_KEY = "project_id_buffer_list"
+
+
+class RuleGroup(NamedTuple):
+    rule_id: int
+    group_id: int
+
+
+class UniqueCondition(NamedTuple):
+    cls_id: str
+    interval: str
+    comparison_type: str | None
+    comparison_interval: str | None
+    environment_id: int | None
+
+
+def is_delayed_processing_enabled(project: Project) -> bool:
+    return project.id in options.get("rules.delayed-processing.projects-allowlist")
+
+
+def enqueue_rule_group(rule: Rule, group: Group, event: GroupEvent) -> None:
+    """
+    Records that the slow conditions of ``rule`` need to be evaluated for
+    ``group``. Later events of the same group overwrite the event to fire the
+    actions with.
+    """
+    buffer.backend.push_to_sorted_set(key=PROJECT_ID_BUFFER_LIST_KEY, value=rule.project_id)
+    buffer.backend.push_to_hash(
+        model=Project,
+        filters={"project_id": rule.project_id},
+        field=f"{rule.id}:{group.id}",
+        value=json.dumps({"event_id": event.event_id, "occurrence_id": event.occurrence_id}),
+    )
+    metrics.incr("delayed_processing.enqueued")
+
+
+def _get_unique_condition(condition: dict[str, Any], rule: Rule) -> UniqueCondition:
+    return UniqueCondition(
+        cls_id=condition["id"],
+        interval=condition.get("interval"),
+        comparison_type=condition.get("comparisonType"),
+        comparison_interval=condition.get("comparisonInterval"),
+        environment_id=rule.environment_id,
+    )
+
+
+def _get_slow_conditions(rule: Rule) -> list[dict[str, Any]]:
+    return [
+        condition
+        for condition in rule.data.get("conditions", ())
+        if is_condition_slow(condition) and rules.get(condition["id"]) is not None
+    ]
+
+
+def evaluate_rule_groups(
+    project: Project, rule_groups: Sequence[RuleGroup], rules_by_id: dict[int, Rule]
+) -> list[RuleGroup]:
+    """
+    Evaluates the slow conditions of all given rule/group pairs and returns
+    the pairs whose rule passes. Conditions which only differ in their
+    threshold share one query, covering all groups they apply to.
+    """
+    groups = Group.objects.in_bulk({rg.group_id for rg in rule_groups})
+
+    condition_groups: dict[UniqueCondition, set[int]] = defaultdict(set)
+    condition_instances: dict[UniqueCondition, BaseEventFrequencyCondition] = {}
+    for rule_group in rule_groups:
+        rule = rules_by_id[rule_group.rule_id]
+        for condition in _get_slow_conditions(rule):
+            unique_condition = _get_unique_condition(condition, rule)
+            condition_groups[unique_condition].add(rule_group.group_id)
+            if unique_condition not in condition_instances:
+                condition_cls = rules.get(condition["id"])
+                condition_instances[unique_condition] = condition_cls(
+                    project, data=condition, rule=rule
+                )
+
+    now = timezone.now()
+    condition_results: dict[UniqueCondition, dict[int, int]] = {}
+    for unique_condition, group_ids in condition_groups.items():
+        condition_inst = condition_instances[unique_condition]
+        condition_results[unique_condition] = (
+            safe_execute(
+                condition_inst.get_rate_bulk,
+                [groups[group_id] for group_id in group_ids if group_id in groups],
+                unique_condition.environment_id,
+                now,
+                _with_transaction=False,
+            )
+            or {}
+        )
+
+    passing = []
+    for rule_group in rule_groups:
+        rule = rules_by_id[rule_group.rule_id]
+        predicate_func = get_match_function(
+            rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH
+        )
+        if predicate_func is None:
+            continue
+
+        # `RuleProcessor` only enqueues the rule once its cheap conditions can't
+        # decide the outcome on their own, so only the slow ones are left.
+        results = []
+        for condition in _get_slow_conditions(rule):
+            unique_condition = _get_unique_condition(condition, rule)
+            rate = condition_results[unique_condition].get(rule_group.group_id)
+            condition_inst = rules.get(condition["id"])(project, data=condition, rule=rule)
+            results.append(rate is not None and condition_inst.passes_value(rate))
+        if predicate_func(results):
+            passing.append(rule_group)
+
+    return passing
+
+
+def fire_rules(
+    project: Project,
+    rule_groups: Sequence[RuleGroup],
+    rules_by_id: dict[int, Rule],
+    events: dict[int, dict[str, Any]],
+) -> None:
+    """
+    Fires the actions of the given rules, with the last enqueued event of
+    each group.
+    """
+    groups = Group.objects.in_bulk({rg.group_id for rg in rule_groups})
+    rules_by_group: dict[int, list[Rule]] = defaultdict(list)
+    for rule_group in rule_groups:
+        rules_by_group[rule_group.group_id].append(rules_by_id[rule_group.rule_id])
+
+    for group_id, group_rules in rules_by_group.items():
+        group = groups.get(group_id)
+        if group is None or not group.is_unresolved():
+            continue
+
+        event_data = events.get(group_id)
+        if event_data is None:
+            continue
+        event = eventstore.backend.get_event_by_id(
+            project.id,
+            event_data["event_id"],
+            group_id=group_id,
+            occurrence_id=event_data.get("occurrence_id"),
+        )
+        if event is None:
+            logger.info(
+                "delayed_processing.missing_event",
+                extra={"project_id": project.id, "group_id": group_id},
+            )
+            continue
+        group_event = event if isinstance(event, GroupEvent) else event.for_group(group)
+
+        rp = RuleProcessor(group_event, False, False, False, False)
+        rule_statuses = rp.bulk_get_rule_status(group_rules)
+        for rule in group_rules:
+            rp.fire_rule(rule, rule_statuses[rule.id])
+
+        for callback, futures in rp.grouped_futures.values():
+            safe_execute(callback, group_event, futures, _with_transaction=False)
+
+
+@instrumented_task(
+    name="sentry.rules.delayed_processing.process_delayed_alert_conditions",
+    queue="delayed_rules",
+    silo_mode=SiloMode.REGION,
+)
+def process_delayed_alert_conditions() -> None:
+    """
+    Schedules `apply_delayed` for every project with pending rule/group pairs.
+    """
+    from sentry.locks import locks
+
+    lock = locks.get(
+        "rules:process_delayed_alert_conditions",
+        duration=60,
+        name="process_delayed_alert_conditions",
+    )
+    try:
+        with lock.acquire():
+            fetch_time = timezone.now().timestamp()
+            project_ids = buffer.backend.get_sorted_set(
+                PROJECT_ID_BUFFER_LIST_KEY, min=0, max=fetch_time
+            )
+            metrics.distribution("delayed_processing.num_projects", len(project_ids))
+            for project_id, _ in project_ids:
+                apply_delayed.delay(project_id)
+
+            buffer.backend.delete_key(PROJECT_ID_BUFFER_LIST_KEY, min=0, max=fetch_time)
+    except UnableToAcquireLock as error:
+        logger.warning("process_delayed_alert_conditions.fail", extra={"error": error})
+
+
+@instrumented_task(
+    name="sentry.rules.delayed_processing.apply_delayed",
+    queue="delayed_rules",
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed(project_id: int) -> None:
+    """
+    Evaluates the slow conditions of all pending rule/group pairs of a
+    project and fires the actions of the rules that pass.
+    """
+    try:
+        project = Project.objects.get_from_cache(id=project_id)
+    except Project.DoesNotExist:
+        return
+
+    pending = buffer.backend.get_hash(model=Project, field={"project_id": project_id})
+    if not pending:
+        return
+    # Anything enqueued from here on is picked up by the next run.
+    buffer.backend.delete_hash(
+        model=Project, filters={"project_id": project_id}, fields=list(pending)
+    )
+
+    rules_by_id = {rule.id: rule for rule in Rule.get_for_project(project_id)}
+    snoozed_rule_ids = set(
+        RuleSnooze.objects.filter(rule__in=rules_by_id.values(), user_id=None).values_list(
+            "rule", flat=True
+        )
+    )
+
+    rule_groups = []
+    events: dict[int, dict[str, Any]] = {}
+    for field, value in pending.items():
+        rule_id, group_id = (int(part) for part in field.split(":"))
+        if rule_id not in rules_by_id or rule_id in snoozed_rule_ids:
+            continue
+        rule_groups.append(RuleGroup(rule_id, group_id))
+        events[group_id] = json.loads(value)
+
+    metrics.distribution("delayed_processing.num_rule_groups", len(rule_groups))
+    with metrics.timer("delayed_processing.evaluate_rule_groups"):
+        passing = evaluate_rule_groups(project, rule_groups, rules_by_id)
+    fire_rules(project, passing, rules_by_id, events)
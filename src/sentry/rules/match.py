@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+
 class MatchType:
     CONTAINS = "co"
     ENDS_WITH = "ew"
@@ -39,3 +44,34 @@ MATCH_CHOICES = {
     MatchType.NOT_STARTS_WITH: "does not start with",
     MatchType.STARTS_WITH: "starts with",
 }
+
+
+def compile_match(match: str | None, value: str | None) -> Callable[[Iterable[str]], bool] | None:
+    """
+    Returns a function which tells whether any of the given (lowercased)
+    values match ``value`` according to ``match``, or ``None`` if ``match``
+    is not a valid string match. ``value`` is lowercased once, here.
+    """
+    if match == MatchType.IS_SET:
+        return lambda values: any(True for _ in values)
+    elif match == MatchType.NOT_SET:
+        return lambda values: not any(True for _ in values)
+
+    value = (value or "").lower()
+    if match == MatchType.EQUAL:
+        return lambda values: any(v == value for v in values)
+    elif match == MatchType.NOT_EQUAL:
+        return lambda values: not any(v == value for v in values)
+    elif match == MatchType.STARTS_WITH:
+        return lambda values: any(v.startswith(value) for v in values)
+    elif match == MatchType.NOT_STARTS_WITH:
+        return lambda values: not any(v.startswith(value) for v in values)
+    elif match == MatchType.ENDS_WITH:
+        return lambda values: any(v.endswith(value) for v in values)
+    elif match == MatchType.NOT_ENDS_WITH:
+        return lambda values: not any(v.endswith(value) for v in values)
+    elif match == MatchType.CONTAINS:
+        return lambda values: any(value in v for v in values)
+    elif match == MatchType.NOT_CONTAINS:
+        return lambda values: not any(value in v for v in values)
+    return None
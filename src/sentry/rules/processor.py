@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import logging
+import threading
 import uuid
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
 from datetime import timedelta
 from random import randrange
-from typing import Any
+from typing import Any, NamedTuple
 
+from cachetools import LRUCache
 from django.core.cache import cache
 from django.utils import timezone
 
@@ -19,12 +21,19 @@ from sentry.models.rulesnooze import RuleSnooze
 from sentry.rules import EventState, history, rules
 from sentry.rules.actions.base import instantiate_action
 from sentry.rules.conditions.base import EventCondition
+from sentry.rules.conditions.event_frequency import (
+    BaseEventFrequencyCondition,
+    EventFrequencyQueryPlan,
+)
 from sentry.rules.filters.base import EventFilter
 from sentry.types.rules import RuleFuture
+from sentry.utils import metrics
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
 
 SLOW_CONDITION_MATCHES = ["event_frequency"]
+# Matches for which the cheap conditions of a rule can be evaluated separately from the slow ones.
+DELAYABLE_CONDITION_MATCHES = ("all", "any", "none")
 
 
 def get_match_function(match_name: str) -> Callable[..., bool] | None:
@@ -44,6 +53,34 @@ def is_condition_slow(condition: Mapping[str, str]) -> bool:
     return False
 
 
+class CompiledPredicate(NamedTuple):
+    data: dict[str, Any]
+    # `None` for slow conditions, which depend on per-event state, and unregistered ones: these go
+    # through `condition_matches`.
+    condition_cls: type[EventCondition | EventFilter] | None
+    is_slow: bool
+
+
+class CompiledRule(NamedTuple):
+    # The rule data this was compiled from. Rules have no version column, so changes to their data
+    # are detected by comparing it.
+    data: dict[str, Any]
+    # Sorted so that the most expensive conditions run last.
+    conditions: list[CompiledPredicate]
+    filters: list[CompiledPredicate]
+
+
+# Compiled rules by rule id, reused across events in the same process. They don't hold on to the
+# project or rule they were compiled for, the conditions are instantiated for each evaluation.
+_compiled_rules: LRUCache[int, CompiledRule] = LRUCache(maxsize=10000)
+_compiled_rules_lock = threading.Lock()
+
+
+def clear_compiled_rules() -> None:
+    with _compiled_rules_lock:
+        _compiled_rules.clear()
+
+
 class RuleProcessor:
     logger = logging.getLogger("sentry.rules")
 
@@ -69,6 +106,12 @@ class RuleProcessor:
         self.grouped_futures: MutableMapping[
             str, tuple[Callable[[GroupEvent, Sequence[RuleFuture]], None], list[RuleFuture]]
         ] = {}
+        # Shared by the frequency conditions of all rules, so that identical
+        # queries only run once per event.
+        self.frequency_query_plan = EventFrequencyQueryPlan()
+        # Whether slow conditions are left to `delayed_processing.apply_delayed`.
+        self.delay_slow_conditions = False
+        self.compiled_rule_misses = 0
 
     def get_rules(self) -> Sequence[Rule]:
         """Get all of the rules for this project from the DB (or cache)."""
@@ -144,7 +187,10 @@ class RuleProcessor:
             self.logger.warning("Unregistered condition %r", condition["id"])
             return None
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
+        kwargs: dict[str, Any] = {}
+        if issubclass(condition_cls, BaseEventFrequencyCondition):
+            kwargs["query_plan"] = self.frequency_query_plan
+        condition_inst = condition_cls(self.project, data=condition, rule=rule, **kwargs)
         if not isinstance(condition_inst, (EventCondition, EventFilter)):
             self.logger.warning("Unregistered condition %r", condition["id"])
             return None
@@ -156,6 +202,56 @@ class RuleProcessor:
         )
         return passes
 
+    def predicate_matches(
+        self, predicate: CompiledPredicate, state: EventState, rule: Rule
+    ) -> bool | None:
+        if predicate.condition_cls is None:
+            return self.condition_matches(predicate.data, state, rule)
+        condition_inst = predicate.condition_cls(self.project, data=predicate.data, rule=rule)
+        passes: bool = safe_execute(
+            condition_inst.passes,
+            self.event,
+            state,
+            _with_transaction=False,
+        )
+        return passes
+
+    def compile_rule(self, rule: Rule) -> CompiledRule:
+        """
+        Resolves, classifies and sorts the conditions and filters of `rule`
+        once, so that they can be evaluated for many events.
+        """
+        conditions = []
+        filters = []
+        for data in rule.data.get("conditions", ()):
+            is_slow = is_condition_slow(data)
+            condition_cls = rules.get(data["id"])
+            if (
+                condition_cls is None
+                or is_slow
+                or not issubclass(condition_cls, (EventCondition, EventFilter))
+            ):
+                condition_cls = None
+
+            predicate = CompiledPredicate(data, condition_cls, is_slow)
+            if self.get_rule_type(data) == "condition/event":
+                conditions.append(predicate)
+            else:
+                filters.append(predicate)
+
+        conditions.sort(key=lambda predicate: predicate.is_slow)
+        return CompiledRule(rule.data, conditions, filters)
+
+    def get_compiled_rule(self, rule: Rule) -> CompiledRule:
+        with _compiled_rules_lock:
+            compiled = _compiled_rules.get(rule.id)
+        if compiled is None or compiled.data != rule.data:
+            self.compiled_rule_misses += 1
+            compiled = self.compile_rule(rule)
+            with _compiled_rules_lock:
+                _compiled_rules[rule.id] = compiled
+        return compiled
+
     def get_rule_type(self, condition: Mapping[str, Any]) -> str | None:
         rule_cls = rules.get(condition["id"])
         if rule_cls is None:
@@ -195,7 +291,6 @@ class RuleProcessor:
 
         condition_match = rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH
         filter_match = rule.data.get("filter_match") or Rule.DEFAULT_FILTER_MATCH
-        rule_condition_list = rule.data.get("conditions", ())
         frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
         try:
             environment = self.event.get_environment()
@@ -212,16 +307,15 @@ class RuleProcessor:
 
         state = self.get_state()
 
-        condition_list = []
-        filter_list = []
-        for rule_cond in rule_condition_list:
-            if self.get_rule_type(rule_cond) == "condition/event":
-                condition_list.append(rule_cond)
-            else:
-                filter_list.append(rule_cond)
+        compiled_rule = self.get_compiled_rule(rule)
+        condition_list = compiled_rule.conditions
+        filter_list = compiled_rule.filters
 
-        # Sort `condition_list` so that most expensive conditions run last.
-        condition_list.sort(key=lambda condition: is_condition_slow(condition))
+        delay_slow_conditions = (
+            self.delay_slow_conditions
+            and condition_match in DELAYABLE_CONDITION_MATCHES
+            and any(predicate.is_slow for predicate in condition_list)
+        )
 
         for predicate_list, match, name in (
             (filter_list, filter_match, "filter"),
@@ -229,7 +323,11 @@ class RuleProcessor:
         ):
             if not predicate_list:
                 continue
-            predicate_iter = (self.condition_matches(f, state, rule) for f in predicate_list)
+            if name == "condition" and delay_slow_conditions:
+                if self.enqueue_slow_conditions(rule, predicate_list, match, state):
+                    return
+                continue
+            predicate_iter = (self.predicate_matches(p, state, rule) for p in predicate_list)
             predicate_func = get_match_function(match)
             if predicate_func:
                 if not predicate_func(predicate_iter):
@@ -243,6 +341,41 @@ class RuleProcessor:
                 )
                 return
 
+        self.fire_rule(rule, status)
+
+    def enqueue_slow_conditions(
+        self, rule: Rule, condition_list: Sequence[CompiledPredicate], match: str, state: EventState
+    ) -> bool:
+        """
+        Evaluates the cheap conditions of `rule` and, unless they already
+        decide its outcome, enqueues the rule for its slow conditions to be
+        evaluated later. Returns whether processing of the rule stops here.
+        """
+        from sentry.rules.delayed_processing import enqueue_rule_group
+
+        fast_conditions = [p for p in condition_list if not p.is_slow]
+        fast_results = (self.predicate_matches(p, state, rule) for p in fast_conditions)
+        if match == "any":
+            if any(fast_results):
+                return False
+        elif match == "all":
+            if not all(fast_results):
+                return True
+        elif match == "none":
+            if any(fast_results):
+                return True
+
+        enqueue_rule_group(rule, self.group, self.event)
+        return True
+
+    def fire_rule(self, rule: Rule, status: GroupRuleStatus) -> None:
+        """
+        Executes every action of `rule`, unless it already fired for the
+        group within its frequency.
+        """
+        frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
+        now = timezone.now()
+        freq_offset = now - timedelta(minutes=frequency)
         updated = (
             GroupRuleStatus.objects.filter(id=status.id)
             .exclude(last_active__gt=freq_offset)
@@ -299,14 +432,21 @@ class RuleProcessor:
         if not self.event.group.is_unresolved():
             return {}.values()
 
+        from sentry.rules.delayed_processing import is_delayed_processing_enabled
+
         self.grouped_futures.clear()
+        self.frequency_query_plan = EventFrequencyQueryPlan()
+        self.delay_slow_conditions = is_delayed_processing_enabled(self.project)
         rules = self.get_rules()
         snoozed_rules = RuleSnooze.objects.filter(rule__in=rules, user_id=None).values_list(
             "rule", flat=True
         )
         rule_statuses = self.bulk_get_rule_status(rules)
+        self.compiled_rule_misses = 0
         for rule in rules:
             if rule.id not in snoozed_rules:
                 self.apply_rule(rule, rule_statuses[rule.id])
+        if self.compiled_rule_misses:
+            metrics.incr("rules.processor.compiled_rule_miss", amount=self.compiled_rule_misses)
 
         return self.grouped_futures.values()
@@ -309,6 +309,22 @@ local function digest_timeline(configuration, timeline_id, timeline_capacity)
     return results
 end
 
+local function digest_timelines(configuration, timeline_capacity, timeline_ids)
+    -- Like `digest_timeline`, but for many timelines at once. Timelines that
+    -- are not in the ready state are reported as such instead of raising an
+    -- error, so that they don't prevent the others from being digested.
+    local results = {}
+    for i, timeline_id in ipairs(timeline_ids) do
+        if redis.call('ZSCORE', configuration:get_schedule_ready_key(), timeline_id) == false then
+            results[i] = {timeline_id, 0, {}}
+        else
+            results[i] = {timeline_id, 1, digest_timeline(configuration, timeline_id, timeline_capacity)}
+        end
+    end
+
+    return results
+end
+
 local function close_digest(configuration, timeline_id, delay_minimum, record_ids)
     local timeline_key = configuration:get_timeline_key(timeline_id)
     local digest_key = configuration:get_timeline_digest_key(timeline_id)
@@ -338,6 +354,12 @@ local function close_digest(configuration, timeline_id, delay_minimum, record_id
     end
 end
 
+local function close_digests(configuration, digests)
+    for _, digest in ipairs(digests) do
+        close_digest(configuration, digest.timeline_id, digest.delay_minimum, digest.record_ids)
+    end
+end
+
 local function delete_timeline(configuration, timeline_id)
     truncate_timeline(configuration, timeline_id, 0)
     truncate_digest(configuration, timeline_id, 0)
@@ -349,6 +371,27 @@ end
 
 -- Command Execution
 
+local function digest_close_argument_parser(cursor, arguments)
+    -- The timeline ID, minimum delay and number of records of a digest,
+    -- followed by that many record IDs.
+    local cursor, timeline_id, delay_minimum, record_count = multiple_argument_parser(
+        argument_parser(),
+        argument_parser(tonumber),
+        argument_parser(tonumber)
+    )(cursor, arguments)
+
+    local record_ids = {}
+    for i = 1, record_count do
+        record_ids[i] = arguments[cursor + i - 1]
+    end
+
+    return cursor + record_count, {
+        timeline_id = timeline_id,
+        delay_minimum = delay_minimum,
+        record_ids = record_ids,
+    }
+end
+
 local configuration_argument_parser = object_argument_parser({
     {"namespace", argument_parser()},
     {"ttl", argument_parser(tonumber)},
@@ -448,6 +491,21 @@ local commands = {
         )(cursor, arguments)
         return close_digest(configuration, timeline_id, delay_minimum, record_ids)
     end,
+    DIGEST_OPEN_MANY = function (cursor, arguments)
+        local cursor, configuration, timeline_capacity, timeline_ids = multiple_argument_parser(
+            configuration_argument_parser,
+            argument_parser(tonumber),
+            variadic_argument_parser(argument_parser())
+        )(cursor, arguments)
+        return digest_timelines(configuration, timeline_capacity, timeline_ids)
+    end,
+    DIGEST_CLOSE_MANY = function (cursor, arguments)
+        local cursor, configuration, digests = multiple_argument_parser(
+            configuration_argument_parser,
+            variadic_argument_parser(digest_close_argument_parser)
+        )(cursor, arguments)
+        return close_digests(configuration, digests)
+    end,
 }
 
 local cursor, command = argument_parser(
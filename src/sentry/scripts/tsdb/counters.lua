@@ -0,0 +1,37 @@
+--[[
+
+Batched counter updates
+=======================
+
+Applies all counter increments and expirations of a ``RedisTSDB.incr_multi``
+(or the expirations of a ``record_frequency_multi``) call that are routed to
+the same host in a single script invocation, instead of one ``HINCRBY`` per
+field and one ``EXPIREAT`` per hash.
+
+Every key in ``KEYS`` is a hash. ``ARGV`` contains, for every key in the same
+order, the timestamp the key should expire at (or ``0`` to leave its expiry
+untouched), the number of fields to increment, and that many pairs of field
+name and increment::
+
+    ARGV = [expiry_1, n_1, field_1_1, count_1_1, ..., expiry_2, n_2, ...]
+
+Keys that only need their expiry updated (such as frequency table keys) are
+passed with ``n = 0``.
+
+]]--
+
+local offset = 1
+for _, key in ipairs(KEYS) do
+    local expiry = tonumber(ARGV[offset])
+    local fields = tonumber(ARGV[offset + 1])
+    offset = offset + 2
+
+    for _ = 1, fields do
+        redis.call('HINCRBY', key, ARGV[offset], ARGV[offset + 1])
+        offset = offset + 2
+    end
+
+    if expiry > 0 then
+        redis.call('EXPIREAT', key, expiry)
+    end
+end
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 from typing import Any
 from urllib.parse import urlparse
@@ -43,21 +44,45 @@ _anon_namespace_re = re.compile(
 
 PAIRS = {"(": ")", "{": "}", "[": "]", "<": ">"}
 
+# Native stacktraces repeat the same symbols over and over, so trimmed names
+# are memoized. See `trim_native_function_name`.
+TRIM_NATIVE_FUNCTION_NAME_CACHE_SIZE = 10_000
+
+# Characters which `split_func_tokens` has to look at, everything else is
+# copied into the tokens as is.
+_func_token_special_re = re.compile(r"[(){}\[\]<>\s]")
+
+_enclosed_string_res: dict[tuple[str, str], re.Pattern[str]] = {}
+
 
 def replace_enclosed_string(s, start, end, replacement=None):
     if start not in s:
         return s
 
+    pattern = _enclosed_string_res.get((start, end))
+    if pattern is None:
+        pattern = _enclosed_string_res[(start, end)] = re.compile(
+            f"{re.escape(start)}|{re.escape(end)}"
+        )
+
     depth = 0
 
     rv = []
     pair_start = None
-    for idx, char in enumerate(s):
-        if char == start:
+    # Only the `start` and `end` characters are visited, the text between
+    # them is copied in one go if it is not enclosed.
+    last = 0
+    for match in pattern.finditer(s):
+        idx = match.start()
+        if depth == 0 and idx > last:
+            rv.append(s[last:idx])
+        last = idx + 1
+
+        if match.group() == start:
             if depth == 0:
                 pair_start = idx
             depth += 1
-        elif char == end:
+        else:
             depth -= 1
             if depth == 0:
                 if replacement is not None:
@@ -65,39 +90,46 @@ def replace_enclosed_string(s, start, end, replacement=None):
                         rv.append(replacement(s[pair_start + 1 : idx], pair_start))
                     else:
                         rv.append(replacement)
-        elif depth == 0:
-            rv.append(char)
+
+    if depth == 0 and last < len(s):
+        rv.append(s[last:])
 
     return "".join(rv)
 
 
 def split_func_tokens(s):
-    buf = []
     rv = []
     stack = []
-    end = 0
+    # The current token is `s[token_start:token_end]`. It is only extended
+    # past enclosed strings once they are closed.
+    token_start = token_end = 0
+
+    for match in _func_token_special_re.finditer(s):
+        idx = match.start()
+        char = match.group()
+        if not stack:
+            token_end = idx
 
-    for idx, char in enumerate(s):
         if char in PAIRS:
             stack.append(PAIRS[char])
-        elif stack and char == stack[-1]:
-            stack.pop()
-            if not stack:
-                buf.append(s[end : idx + 1])
-                end = idx + 1
-        elif not stack:
-            if char.isspace():
-                if buf:
-                    rv.append(buf)
-                buf = []
-            else:
-                buf.append(s[end : idx + 1])
-            end = idx + 1
-
-    if buf:
-        rv.append(buf)
-
-    return ["".join(x) for x in rv]
+        elif stack:
+            if char == stack[-1]:
+                stack.pop()
+                if not stack:
+                    token_end = idx + 1
+        elif char.isspace():
+            if token_end > token_start:
+                rv.append(s[token_start:token_end])
+            token_start = token_end = idx + 1
+        else:
+            token_end = idx + 1
+
+    if not stack:
+        token_end = len(s)
+    if token_end > token_start:
+        rv.append(s[token_start:token_end])
+
+    return rv
 
 
 def trim_function_name(function, platform, normalize_lambdas=True):
@@ -125,6 +157,7 @@ def trim_csharp_function_name(function):
     return function.split(" (", 1)[0]
 
 
+@functools.lru_cache(maxsize=TRIM_NATIVE_FUNCTION_NAME_CACHE_SIZE)
 def trim_native_function_name(function, platform, normalize_lambdas=True):
     if function in ("<redacted>", "<unknown>"):
         return function
@@ -1,14 +1,17 @@
 import logging
 import time
+from collections.abc import Sequence
 
+from sentry import options
 from sentry.digests import Record, get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import build_digest, fetch_states, split_key, split_keys
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
 from sentry.silo import SiloMode
 from sentry.tasks.base import instrumented_task
-from sentry.utils import snuba
+from sentry.utils import metrics, snuba
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +37,14 @@ def schedule_digests():
     timeout = 300
     digests.maintenance(deadline - timeout)
 
-    for entry in digests.schedule(deadline):
-        deliver_digest.delay(entry.key, entry.timestamp)
+    batch_size = options.get("digests.delivery-batch-size")
+    if not batch_size:
+        for entry in digests.schedule(deadline):
+            deliver_digest.delay(entry.key, entry.timestamp)
+        return
+
+    for entries in chunked(digests.schedule(deadline), batch_size):
+        deliver_digests.delay([entry.key for entry in entries])
 
 
 @instrumented_task(
@@ -91,6 +100,85 @@ def deliver_digest(key, schedule_timestamp=None, notification_uuid: str | None =
             )
 
 
+@instrumented_task(
+    name="sentry.tasks.digests.deliver_digests",
+    queue="digests.delivery",
+    silo_mode=SiloMode.REGION,
+)
+def deliver_digests(keys: Sequence[str], schedule_timestamp: float | None = None) -> None:
+    """
+    Delivers the digests of many timelines like `deliver_digest`, but opens
+    and closes the timelines of a Redis host together and loads projects,
+    groups and rules with one query each for all of them.
+    """
+    from sentry import digests
+    from sentry.mail import mail_adapter
+
+    split_keys_by_key = split_keys(keys)
+    for key in keys:
+        if key not in split_keys_by_key:
+            logger.info("Cannot deliver digest %s as its project does not exist", key)
+            digests.delete(key)
+
+    minimum_delays = {}
+    for key, (project, _, _, _) in split_keys_by_key.items():
+        minimum_delays[key] = ProjectOption.objects.get_value(
+            project, get_option_key("mail", "minimum_delay")
+        )
+
+    built_digests = {}
+    with snuba.options_override({"consistent": True}):
+        with digests.digest_many(minimum_delays) as records_by_key:
+            metrics.distribution("digests.delivery.batch_size", len(records_by_key))
+
+            states = fetch_states(
+                {
+                    key: (split_keys_by_key[key][0], records)
+                    for key, records in records_by_key.items()
+                }
+            )
+            for key, records in list(records_by_key.items()):
+                try:
+                    built_digests[key] = (
+                        *build_digest(split_keys_by_key[key][0], records, states.get(key)),
+                        get_notification_uuid_from_records(records),
+                    )
+                except Exception:
+                    # Keeps the records of the timeline for the next delivery.
+                    logger.exception("Failed to build digest", extra={"key": key})
+                    del records_by_key[key]
+
+        for key in records_by_key:
+            project, target_type, target_identifier, fallthrough_choice = split_keys_by_key[key]
+            digest, logs, notification_uuid = built_digests[key]
+            if not digest:
+                logger.info(
+                    "Skipped digest delivery due to empty digest",
+                    extra={
+                        "project": project.id,
+                        "target_type": target_type.value,
+                        "target_identifier": target_identifier,
+                        "build_digest_logs": logs,
+                        "fallthrough_choice": (
+                            fallthrough_choice.value if fallthrough_choice else None
+                        ),
+                    },
+                )
+                continue
+
+            try:
+                mail_adapter.notify_digest(
+                    project,
+                    digest,
+                    target_type,
+                    target_identifier,
+                    fallthrough_choice=fallthrough_choice,
+                    notification_uuid=notification_uuid,
+                )
+            except Exception:
+                logger.exception("Failed to deliver digest", extra={"key": key})
+
+
 def get_notification_uuid_from_records(records: list[Record]) -> str | None:
     for record in records:
         try:
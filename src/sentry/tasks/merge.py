@@ -32,6 +32,7 @@ def merge_groups(
     **kwargs,
 ):
     # TODO(mattrobenolt): Write tests for all of this
+    from sentry.grouping.grouphash_cache import invalidate_grouphashes
     from sentry.models.activity import Activity
     from sentry.models.environment import Environment
     from sentry.models.eventattachment import EventAttachment
@@ -100,9 +101,15 @@ def merge_groups(
             GroupMeta,
         )
 
+        grouphashes = list(
+            GroupHash.objects.filter(project_id=group.project_id, group=group).values_list(
+                "hash", flat=True
+            )
+        )
         has_more = merge_objects(
             model_list, group, new_group, logger=logger, transaction_id=transaction_id
         )
+        invalidate_grouphashes(group.project_id, grouphashes)
 
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 import logging
+import random
 import uuid
 from collections.abc import Mapping, Sequence
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from time import time
 from typing import TYPE_CHECKING, Any, TypedDict
 
 import sentry_sdk
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
 from django.db.models.signals import post_save
 from django.utils import timezone
 from google.api_core.exceptions import ServiceUnavailable
 
-from sentry import features, projectoptions
+from sentry import features, options, projectoptions
 from sentry.exceptions import PluginError
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.issue_occurrence import IssueOccurrence
@@ -27,10 +30,12 @@ from sentry.silo import SiloMode
 from sentry.tasks.base import instrumented_task
 from sentry.types.group import GroupSubStatus
 from sentry.utils import json, metrics
+from sentry.utils.batch_cache import batch_cache_scope, batch_cached, batch_get_or_fetch
 from sentry.utils.cache import cache
 from sentry.utils.event_frames import get_sdk_name
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.manager import LockManager
+from sentry.utils.resource_usage import ResourceUsage, record_resource_usage
 from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path, safe_execute
 from sentry.utils.sdk import bind_organization_context, set_current_event_project
@@ -52,6 +57,9 @@ locks = LockManager(build_instance_from_options(settings.SENTRY_POST_PROCESS_LOC
 
 ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT = 50
 HIGHER_ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT = 200
+# Seconds a `post_process_group_batch` task may spend on its events before it
+# dispatches the rest in a new batch, well within its soft time limit.
+POST_PROCESS_BATCH_TIME_BUDGET = 240
 
 
 class PostProcessJob(TypedDict, total=False):
@@ -63,6 +71,7 @@ class PostProcessJob(TypedDict, total=False):
     has_escalated: bool
 
 
+@batch_cached
 def _get_service_hooks(project_id):
     from sentry.models.servicehook import ServiceHook
 
@@ -76,6 +85,19 @@ def _get_service_hooks(project_id):
     return result
 
 
+@batch_cached
+def _get_project_with_organization(project_id: int) -> Project:
+    from sentry.models.organization import Organization
+    from sentry.models.project import Project
+
+    project = Project.objects.get_from_cache(id=project_id)
+    project.set_cached_field_value(
+        "organization",
+        Organization.objects.get_from_cache(id=project.organization_id),
+    )
+    return project
+
+
 def _should_send_error_created_hooks(project):
     from sentry.models.organization import Organization
     from sentry.models.servicehook import ServiceHook
@@ -550,19 +572,9 @@ def post_process_group(
     from sentry.utils import snuba
 
     with snuba.options_override({"consistent": True}):
-        from sentry import eventstore
         from sentry.eventstore.processing import event_processing_store
-        from sentry.ingest.transaction_clusterer.datasource.redis import (
-            record_span_descriptions as record_span_descriptions_for_clustering,
-        )
-        from sentry.ingest.transaction_clusterer.datasource.redis import (
-            record_transaction_name as record_transaction_name_for_clustering,
-        )
-        from sentry.issues.occurrence_consumer import EventLookupError
-        from sentry.models.organization import Organization
-        from sentry.models.project import Project
-        from sentry.reprocessing2 import is_reprocessed_event
 
+        data = None
         if occurrence_id is None:
             # We use the data being present/missing in the processing store
             # to ensure that we don't duplicate work should the forwarding consumers
@@ -577,182 +589,308 @@ def post_process_group(
             with metrics.timer("tasks.post_process.delete_event_cache"):
                 event_processing_store.delete_by_key(cache_key)
 
-            occurrence = None
-            event = process_event(data, group_id)
-        else:
-            # Note: We attempt to acquire the lock here, but we don't release it and instead just
-            # rely on the ttl. The goal here is to make sure we only ever run post process group
-            # at most once per occurrence. Even though we don't use retries on the task, this is
-            # still necessary since the consumer that sends these might reprocess a batch.
-            # TODO: It might be better to instead set a value that we delete here, similar to what
-            # we do with `event_processing_store`. If we could do this *before* the occurrence ends
-            # up in Kafka (IE via the api that will sit in front of it), then we could guarantee at
-            # most once running of post process group.
-            lock = locks.get(
-                f"ppg:{occurrence_id}-once",
-                duration=600,
-                name="post_process_w_o",
-            )
+        _post_process_group(
+            is_new=is_new,
+            is_regression=is_regression,
+            is_new_group_environment=is_new_group_environment,
+            data=data,
+            group_id=group_id,
+            group_states=group_states,
+            occurrence_id=occurrence_id,
+            project_id=project_id,
+        )
 
-            try:
-                lock.acquire()
-            except Exception:
-                # If we fail to acquire the lock, we've already run post process group for this
-                # occurrence
-                return
 
-            occurrence = (
-                IssueOccurrence.fetch(occurrence_id, project_id=project_id) if project_id else None
-            )
-            if not occurrence:
-                logger.error(
-                    "Failed to fetch occurrence",
-                    extra={"occurrence_id": occurrence_id, "project_id": project_id},
-                )
+@instrumented_task(
+    name="sentry.tasks.post_process.post_process_group_batch",
+    time_limit=300,
+    soft_time_limit=290,
+    silo_mode=SiloMode.REGION,
+)
+def post_process_group_batch(
+    events: Sequence[Mapping[str, Any]], queue: str | None = None, **kwargs: Any
+) -> None:
+    """
+    Fires post processing hooks for a batch of events, see
+    `PostProcessGroupBatch`. Every entry of ``events`` holds the arguments
+    that would have been passed to `post_process_group` for that event, and
+    ``queue`` is the queue the batch was dispatched to.
+
+    The events are fetched from the processing store at once, and project
+    level state (the project and organization, rules, ownership, service hooks
+    and plugins) is loaded once per project of the batch rather than once per
+    event. Like in `post_process_group`, an event is deleted from the
+    processing store right before it is processed. Once the task has spent
+    `POST_PROCESS_BATCH_TIME_BUDGET` seconds on the batch, the events it did
+    not get to are dispatched in a new batch.
+    """
+    from sentry.utils import snuba
+
+    with snuba.options_override({"consistent": True}), batch_cache_scope():
+        from sentry.eventstore.processing import event_processing_store
+
+        cache_keys = [event["cache_key"] for event in events if event.get("occurrence_id") is None]
+        with metrics.timer("tasks.post_process.get_event_cache_batch"):
+            data_by_key = event_processing_store.get_many(cache_keys)
+
+        metrics.distribution("tasks.post_process.batch.size", len(events))
+
+        start_time = time()
+        for i, event in enumerate(events):
+            # The soft time limit can't be relied on to stop the batch, as the
+            # steps of `_post_process_group` swallow it like any exception.
+            if time() - start_time > POST_PROCESS_BATCH_TIME_BUDGET:
+                _requeue_post_process_batch(events[i:], queue)
                 return
-            # Issue platform events don't use `event_processing_store`. Fetch from eventstore
-            # instead.
-
-            def get_event_raise_exception() -> Event:
-                retrieved = eventstore.backend.get_event_by_id(
-                    project_id,
-                    occurrence.event_id,
-                    group_id=group_id,
-                    skip_transaction_groupevent=True,
+
+            cache_key = event["cache_key"]
+            occurrence_id = event.get("occurrence_id")
+
+            data = None
+            if occurrence_id is None:
+                data = data_by_key.get(cache_key)
+                if not data:
+                    logger.info(
+                        "post_process.skipped",
+                        extra={"cache_key": cache_key, "reason": "missing_cache"},
+                    )
+                    continue
+                # The event was read at the start of the batch, so another task
+                # may have processed it since.
+                if not event_processing_store.delete_by_key_if_present(cache_key):
+                    logger.info(
+                        "post_process.skipped",
+                        extra={"cache_key": cache_key, "reason": "already_processed"},
+                    )
+                    continue
+
+            try:
+                _post_process_group(
+                    is_new=event["is_new"],
+                    is_regression=event["is_regression"],
+                    is_new_group_environment=event["is_new_group_environment"],
+                    data=data,
+                    group_id=event.get("group_id"),
+                    group_states=event.get("group_states"),
                     occurrence_id=occurrence_id,
+                    project_id=event.get("project_id"),
+                )
+            except SoftTimeLimitExceeded:
+                _requeue_post_process_batch(events[i + 1 :], queue)
+                raise
+            except Exception:
+                # The event is already gone from the processing store, so like
+                # in `post_process_group` it is not retried, but it must not
+                # take the rest of the batch with it.
+                metrics.incr("tasks.post_process.batch.event_failed")
+                logger.exception(
+                    "post_process.batch.event_failed",
+                    extra={"cache_key": cache_key, "occurrence_id": occurrence_id},
                 )
-                if retrieved is None:
-                    raise EventLookupError(
-                        f"failed to retrieve event(project_id={project_id}, event_id={occurrence.event_id}, group_id={group_id}) from eventstore"
-                    )
-                return retrieved
 
-            event = fetch_retry_policy(get_event_raise_exception)
 
-        set_current_event_project(event.project_id)
+def _requeue_post_process_batch(events: Sequence[Mapping[str, Any]], queue: str | None) -> None:
+    # The events are still in the processing store.
+    metrics.incr("tasks.post_process.batch.requeued", amount=len(events))
+    if events:
+        post_process_group_batch.apply_async(kwargs={"events": events, "queue": queue}, queue=queue)
 
-        # Re-bind Project and Org since we're reading the Event object
-        # from cache which may contain stale parent models.
-        with sentry_sdk.start_span(op="tasks.post_process_group.project_get_from_cache"):
-            try:
-                event.project = Project.objects.get_from_cache(id=event.project_id)
-            except Project.DoesNotExist:
-                # project probably got deleted while this task was sitting in the queue
-                return
-            event.project.set_cached_field_value(
-                "organization",
-                Organization.objects.get_from_cache(id=event.project.organization_id),
-            )
 
-        is_reprocessed = is_reprocessed_event(event.data)
-        sentry_sdk.set_tag("is_reprocessed", is_reprocessed)
-
-        is_transaction_event = event.get_event_type() == "transaction"
-
-        # Simplified post processing for transaction events.
-        # This should eventually be completely removed and transactions
-        # will not go through any post processing.
-        if is_transaction_event:
-            record_transaction_name_for_clustering(event.project, event.data)
-            record_span_descriptions_for_clustering(event.project, event.data)
-            with sentry_sdk.start_span(op="tasks.post_process_group.transaction_processed_signal"):
-                transaction_processed.send_robust(
-                    sender=post_process_group,
-                    project=event.project,
-                    event=event,
-                )
+def _post_process_group(
+    is_new: bool,
+    is_regression: bool,
+    is_new_group_environment: bool,
+    data: dict[str, Any] | None,
+    group_id: int | None,
+    group_states: GroupStates | None,
+    occurrence_id: str | None,
+    project_id: int | None,
+) -> None:
+    """
+    Fires post processing hooks for one event, given either its ``data`` from
+    the processing store or its ``occurrence_id``.
+    """
+    from sentry import eventstore
+    from sentry.ingest.transaction_clusterer.datasource.redis import (
+        record_span_descriptions as record_span_descriptions_for_clustering,
+    )
+    from sentry.ingest.transaction_clusterer.datasource.redis import (
+        record_transaction_name as record_transaction_name_for_clustering,
+    )
+    from sentry.issues.occurrence_consumer import EventLookupError
+    from sentry.models.project import Project
+    from sentry.reprocessing2 import is_reprocessed_event
 
-        # TODO: Remove this check once we're sending all group ids as `group_states` and treat all
-        # events the same way
-        if not is_transaction_event and group_states is None:
-            # error issue
-            group_states = [
-                {
-                    "id": group_id,
-                    "is_new": is_new,
-                    "is_regression": is_regression,
-                    "is_new_group_environment": is_new_group_environment,
-                }
-            ]
+    if occurrence_id is None:
+        assert data is not None
+        occurrence = None
+        event = process_event(data, group_id)
+    else:
+        # Note: We attempt to acquire the lock here, but we don't release it and instead just
+        # rely on the ttl. The goal here is to make sure we only ever run post process group
+        # at most once per occurrence. Even though we don't use retries on the task, this is
+        # still necessary since the consumer that sends these might reprocess a batch.
+        # TODO: It might be better to instead set a value that we delete here, similar to what
+        # we do with `event_processing_store`. If we could do this *before* the occurrence ends
+        # up in Kafka (IE via the api that will sit in front of it), then we could guarantee at
+        # most once running of post process group.
+        lock = locks.get(
+            f"ppg:{occurrence_id}-once",
+            duration=600,
+            name="post_process_w_o",
+        )
 
         try:
-            if group_states is not None:
-                if not is_transaction_event:
-                    if len(group_states) == 0:
-                        metrics.incr("sentry.tasks.post_process.error_empty_group_states")
-                    elif len(group_states) > 1:
-                        metrics.incr("sentry.tasks.post_process.error_too_many_group_states")
-                    elif group_id != group_states[0]["id"]:
-                        metrics.incr(
-                            "sentry.tasks.post_process.error_group_states_dont_match_group"
-                        )
-                else:
-                    if len(group_states) == 1:
-                        metrics.incr("sentry.tasks.post_process.transaction_has_group_state")
-                        if group_id != group_states[0]["id"]:
-                            metrics.incr(
-                                "sentry.tasks.post_process.transaction_group_states_dont_match_group"
-                            )
-                    if len(group_states) > 1:
-                        metrics.incr(
-                            "sentry.tasks.post_process.transaction_has_too_many_group_states"
-                        )
+            lock.acquire()
         except Exception:
-            logger.exception(
-                "Error logging group_states stats. If this happens it's noisy but not critical, nothing is broken"
+            # If we fail to acquire the lock, we've already run post process group for this
+            # occurrence
+            return
+
+        occurrence = (
+            IssueOccurrence.fetch(occurrence_id, project_id=project_id) if project_id else None
+        )
+        if not occurrence:
+            logger.error(
+                "Failed to fetch occurrence",
+                extra={"occurrence_id": occurrence_id, "project_id": project_id},
+            )
+            return
+        # Issue platform events don't use `event_processing_store`. Fetch from eventstore
+        # instead.
+
+        def get_event_raise_exception() -> Event:
+            retrieved = eventstore.backend.get_event_by_id(
+                project_id,
+                occurrence.event_id,
+                group_id=group_id,
+                skip_transaction_groupevent=True,
+                occurrence_id=occurrence_id,
             )
+            if retrieved is None:
+                raise EventLookupError(
+                    f"failed to retrieve event(project_id={project_id}, event_id={occurrence.event_id}, group_id={group_id}) from eventstore"
+                )
+            return retrieved
 
-        update_event_groups(event, group_states)
-        bind_organization_context(event.project.organization)
-        _capture_event_stats(event)
-        if should_update_escalating_metrics(event, is_transaction_event):
-            _update_escalating_metrics(event)
+        event = fetch_retry_policy(get_event_raise_exception)
 
-        group_events: Mapping[int, GroupEvent] = {
-            ge.group_id: ge for ge in list(event.build_group_events())
-        }
-        if occurrence is not None:
-            for ge in group_events.values():
-                ge.occurrence = occurrence
-
-        multi_groups = []
-        if group_states:
-            for gs in group_states:
-                gs_id = gs.get("id")
-                if gs_id:
-                    associated_event = group_events.get(gs_id)
-                    if associated_event:
-                        multi_groups.append((associated_event, gs))
-
-        group_jobs: Sequence[PostProcessJob] = [
+    set_current_event_project(event.project_id)
+
+    # Re-bind Project and Org since we're reading the Event object
+    # from cache which may contain stale parent models.
+    with sentry_sdk.start_span(op="tasks.post_process_group.project_get_from_cache"):
+        try:
+            event.project = _get_project_with_organization(event.project_id)
+        except Project.DoesNotExist:
+            # project probably got deleted while this task was sitting in the queue
+            return
+
+    is_reprocessed = is_reprocessed_event(event.data)
+    sentry_sdk.set_tag("is_reprocessed", is_reprocessed)
+
+    is_transaction_event = event.get_event_type() == "transaction"
+
+    # Simplified post processing for transaction events.
+    # This should eventually be completely removed and transactions
+    # will not go through any post processing.
+    if is_transaction_event:
+        record_transaction_name_for_clustering(event.project, event.data)
+        record_span_descriptions_for_clustering(event.project, event.data)
+        with sentry_sdk.start_span(op="tasks.post_process_group.transaction_processed_signal"):
+            transaction_processed.send_robust(
+                sender=post_process_group,
+                project=event.project,
+                event=event,
+            )
+
+    # TODO: Remove this check once we're sending all group ids as `group_states` and treat all
+    # events the same way
+    if not is_transaction_event and group_states is None:
+        # error issue
+        group_states = [
             {
-                "event": ge,
-                "group_state": gs,
-                "is_reprocessed": is_reprocessed,
-                "has_reappeared": bool(not gs["is_new"]),
-                "has_alert": False,
-                "has_escalated": False,
+                "id": group_id,
+                "is_new": is_new,
+                "is_regression": is_regression,
+                "is_new_group_environment": is_new_group_environment,
             }
-            for ge, gs in multi_groups
         ]
 
-        for job in group_jobs:
-            run_post_process_job(job)
-
-        metric_tags = {}
-        if group_events:
-            # In practice, we only have one group here and will be removing the list of jobs. For now, just grab a
-            # random one
-            group_event = list(group_events.values())[0]
-            metric_tags["occurrence_type"] = group_event.group.issue_type.slug
-
-        if not is_reprocessed and event.data.get("received"):
-            metrics.timing(
-                "events.time-to-post-process",
-                time() - event.data["received"],
-                instance=event.data["platform"],
-                tags=metric_tags,
-            )
+    try:
+        if group_states is not None:
+            if not is_transaction_event:
+                if len(group_states) == 0:
+                    metrics.incr("sentry.tasks.post_process.error_empty_group_states")
+                elif len(group_states) > 1:
+                    metrics.incr("sentry.tasks.post_process.error_too_many_group_states")
+                elif group_id != group_states[0]["id"]:
+                    metrics.incr("sentry.tasks.post_process.error_group_states_dont_match_group")
+            else:
+                if len(group_states) == 1:
+                    metrics.incr("sentry.tasks.post_process.transaction_has_group_state")
+                    if group_id != group_states[0]["id"]:
+                        metrics.incr(
+                            "sentry.tasks.post_process.transaction_group_states_dont_match_group"
+                        )
+                if len(group_states) > 1:
+                    metrics.incr("sentry.tasks.post_process.transaction_has_too_many_group_states")
+    except Exception:
+        logger.exception(
+            "Error logging group_states stats. If this happens it's noisy but not critical, nothing is broken"
+        )
+
+    update_event_groups(event, group_states)
+    bind_organization_context(event.project.organization)
+    _capture_event_stats(event)
+    if should_update_escalating_metrics(event, is_transaction_event):
+        _update_escalating_metrics(event)
+
+    group_events: Mapping[int, GroupEvent] = {
+        ge.group_id: ge for ge in list(event.build_group_events())
+    }
+    if occurrence is not None:
+        for ge in group_events.values():
+            ge.occurrence = occurrence
+
+    multi_groups = []
+    if group_states:
+        for gs in group_states:
+            gs_id = gs.get("id")
+            if gs_id:
+                associated_event = group_events.get(gs_id)
+                if associated_event:
+                    multi_groups.append((associated_event, gs))
+
+    group_jobs: Sequence[PostProcessJob] = [
+        {
+            "event": ge,
+            "group_state": gs,
+            "is_reprocessed": is_reprocessed,
+            "has_reappeared": bool(not gs["is_new"]),
+            "has_alert": False,
+            "has_escalated": False,
+        }
+        for ge, gs in multi_groups
+    ]
+
+    for job in group_jobs:
+        run_post_process_job(job)
+
+    metric_tags = {}
+    if group_events:
+        # In practice, we only have one group here and will be removing the list of jobs. For now, just grab a
+        # random one
+        group_event = list(group_events.values())[0]
+        metric_tags["occurrence_type"] = group_event.group.issue_type.slug
+
+    if not is_reprocessed and event.data.get("received"):
+        metrics.timing(
+            "events.time-to-post-process",
+            time() - event.data["received"],
+            instance=event.data["platform"],
+            tags=metric_tags,
+        )
 
 
 def run_post_process_job(job: PostProcessJob):
@@ -772,7 +910,12 @@ def run_post_process_job(job: PostProcessJob):
         # specific pipelines for issue types
         pipeline = GROUP_CATEGORY_POST_PROCESS_PIPELINE[issue_category]
 
+    # Resources used by every step, if the job is sampled for profiling
+    step_usages: dict[str, ResourceUsage] = {}
+    profile_steps = random.random() < options.get("post-process.step-profiling.sample-rate")
+
     for pipeline_step in pipeline:
+        usage = None
         try:
             with (
                 metrics.timer(
@@ -784,6 +927,7 @@ def run_post_process_job(job: PostProcessJob):
                     },
                 ),
                 sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"),
+                record_resource_usage() if profile_steps else nullcontext() as usage,
             ):
                 pipeline_step(job)
         except Exception:
@@ -808,6 +952,41 @@ def run_post_process_job(job: PostProcessJob):
                 },
             )
 
+        if usage is not None:
+            step_usages[pipeline_step.__name__] = usage
+            _record_pipeline_step_usage(pipeline_step.__name__, issue_category_metric, usage)
+
+    if step_usages and options.get("post-process.step-profiling.log-summary"):
+        logger.info(
+            "post_process.pipeline_profile",
+            extra={
+                "event_id": group_event.event_id,
+                "group_id": group_event.group_id,
+                "project_id": group_event.project_id,
+                "issue_category": issue_category_metric,
+                "steps": {name: usage.to_dict() for name, usage in step_usages.items()},
+            },
+        )
+
+
+def _record_pipeline_step_usage(
+    step_name: str, issue_category_metric: str | None, usage: ResourceUsage
+) -> None:
+    tags = {"pipeline": step_name, "issue_category": issue_category_metric}
+    metrics.distribution(
+        "tasks.post_process.run_post_process_job.pipeline.db_queries", usage.db_queries, tags=tags
+    )
+    metrics.distribution(
+        "tasks.post_process.run_post_process_job.pipeline.redis_commands",
+        usage.redis_commands,
+        tags=tags,
+    )
+    metrics.distribution(
+        "tasks.post_process.run_post_process_job.pipeline.snuba_queries",
+        usage.snuba_queries,
+        tags=tags,
+    )
+
 
 def process_event(data: dict, group_id: int | None) -> Event:
     from sentry.eventstore.models import Event
@@ -1322,7 +1501,10 @@ def process_plugins(job: PostProcessJob) -> None:
             job["group_state"]["is_regression"],
         )
 
-        for plugin in plugins.for_project(event.project):
+        project_plugins = batch_get_or_fetch(
+            ("plugins", event.project_id), lambda: list(plugins.for_project(event.project))
+        )
+        for plugin in project_plugins:
             plugin_post_process_group(
                 plugin_slug=plugin.slug, event=event, is_new=is_new, is_regresion=is_regression
             )
@@ -1,5 +1,6 @@
 import logging
 import random
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from time import time
@@ -841,6 +842,97 @@ def _do_save_event(
             time_synthetic_monitoring_event(data, project_id, start_time)
 
 
+def _do_save_event_transaction_batch(project_id: int, events: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Saves a batch of transaction events of one project at once. Every entry of
+    ``events`` holds the ``cache_key``, ``start_time`` and ``event_id`` that
+    would have been passed to `save_event_transaction` for that event.
+
+    If saving the batch fails, its events are saved one by one instead, so
+    that an event that fails to save doesn't take the rest of the batch with
+    it.
+    """
+
+    set_current_event_project(project_id)
+
+    from sentry.event_manager import save_transaction_batch
+
+    batch = []
+    for event in events:
+        cache_key = event["cache_key"]
+        with metrics.timer("tasks.store.do_save_event_batch.get_cache"):
+            data = processing.event_processing_store.get(cache_key)
+
+        if not data:
+            metrics.incr(
+                "events.failed", tags={"reason": "cache", "stage": "post"}, skip_internal=False
+            )
+            attachment_cache.delete(cache_key)
+            continue
+
+        if killswitch_matches_context(
+            "store.load-shed-save-event-projects",
+            {
+                "project_id": project_id,
+                "event_type": data.get("type") or "none",
+                "platform": data.get("platform") or "none",
+            },
+        ):
+            processing.event_processing_store.delete_by_key(cache_key)
+            attachment_cache.delete(cache_key)
+            continue
+
+        data = CanonicalKeyDict(data)
+        data.pop("project", None)
+        batch.append((cache_key, event["start_time"], event["event_id"], data))
+
+    if not batch:
+        return
+
+    try:
+        with metrics.timer("tasks.store.do_save_event_batch.event_manager.save"):
+            saved_events = save_transaction_batch(
+                project_id, [(data, start_time) for _, start_time, _, data in batch]
+            )
+    except Exception:
+        error_logger.exception(
+            "tasks.store.save_event_batch.failed",
+            extra={"project_id": project_id, "batch_size": len(batch)},
+        )
+        metrics.incr("tasks.store.do_save_event_batch.fallback", amount=len(batch))
+        for cache_key, start_time, event_id, _ in batch:
+            # The event is still in the processing store, as it is only
+            # deleted by post_process.
+            try:
+                _do_save_event(cache_key, None, start_time, event_id, project_id)
+            except Exception:
+                error_logger.exception(
+                    "tasks.store.save_event_batch.event_failed",
+                    extra={"project_id": project_id, "cache_key": cache_key},
+                )
+        return
+
+    try:
+        # Put the updated events back into the cache so that post_process
+        # has the most recent data.
+        with metrics.timer("tasks.store.do_save_event_batch.write_processing_cache"):
+            for saved_event in saved_events:
+                processing.event_processing_store.store(dict(saved_event.data.items()))
+    finally:
+        for cache_key, start_time, _, data in batch:
+            attachment_cache.delete(cache_key)
+
+            if start_time:
+                metrics.timing(
+                    "events.time-to-process",
+                    time() - start_time,
+                    instance=data["platform"],
+                    tags={"is_reprocessing2": "false"},
+                )
+
+            time_synthetic_monitoring_event(data, project_id, start_time)
+
+
 @sentry_sdk.tracing.trace
 def time_synthetic_monitoring_event(data: Event, project_id: int, start_time: float | None) -> bool:
     """
@@ -926,6 +1018,21 @@ def save_event_transaction(
     _do_save_event(cache_key, data, start_time, event_id, project_id, **kwargs)
 
 
+@instrumented_task(
+    name="sentry.tasks.store.save_event_transaction_batch",
+    queue="events.save_event_transaction",
+    time_limit=65,
+    soft_time_limit=60,
+    silo_mode=SiloMode.REGION,
+)
+def save_event_transaction_batch(
+    project_id: int,
+    events: Sequence[Mapping[str, Any]],
+    **kwargs: Any,
+) -> None:
+    _do_save_event_transaction_batch(project_id, events)
+
+
 @instrumented_task(
     name="sentry.tasks.store.save_event_feedback",
     time_limit=65,
@@ -366,6 +366,20 @@ def pytest_runtest_teardown(item: pytest.Item) -> None:
     for model in (OrganizationOption, ProjectOption, UserOption):
         model.objects.clear_local_cache()
 
+    from sentry.grouping.api import clear_loaded_config_caches
+    from sentry.grouping.grouphash_cache import clear_local_grouphash_cache
+    from sentry.grouping.hash_memo import clear_local_hash_memo
+    from sentry.ingest.consumer.projects import clear_project_snapshot
+    from sentry.ownership.grammar import clear_compiled_schemas
+    from sentry.rules.processor import clear_compiled_rules
+
+    clear_loaded_config_caches()
+    clear_local_grouphash_cache()
+    clear_local_hash_memo()
+    clear_project_snapshot()
+    clear_compiled_schemas()
+    clear_compiled_rules()
+
     Hub.main.bind_client(None)
 
 
@@ -6,6 +6,7 @@ from typing import Any, TypedDict
 from django.conf import settings
 from django.utils import timezone
 
+from sentry.tsdb.series import TSDBSeries
 from sentry.utils.dates import to_datetime
 from sentry.utils.services import Service
 
@@ -111,8 +112,10 @@ class BaseTSDB(Service):
     __read_methods__ = frozenset(
         [
             "get_range",
+            "get_range_array",
             "get_sums",
             "get_distinct_counts_series",
+            "get_distinct_counts_series_array",
             "get_distinct_counts_totals",
             "get_distinct_counts_union",
             "get_most_frequent",
@@ -435,6 +438,37 @@ class BaseTSDB(Service):
         """
         raise NotImplementedError
 
+    def get_range_array(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_ids: list[int] | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+    ) -> TSDBSeries:
+        """
+        Same as ``get_range``, but returns a ``TSDBSeries`` with one row per
+        key in ``keys``. Keys without data have a row of zeros.
+        """
+        range_set = self.get_range(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=environment_ids,
+            use_cache=use_cache,
+            jitter_value=jitter_value,
+            tenant_ids=tenant_ids,
+            referrer_suffix=referrer_suffix,
+        )
+        return TSDBSeries.from_dict(range_set, keys)
+
     def get_sums(
         self,
         model: TSDBModel,
@@ -534,6 +568,27 @@ class BaseTSDB(Service):
         """
         raise NotImplementedError
 
+    def get_distinct_counts_series_array(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        start: datetime,
+        end: datetime | None = None,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+    ) -> TSDBSeries:
+        """
+        Same as ``get_distinct_counts_series``, but returns a ``TSDBSeries``
+        with one row per key in ``keys``.
+        """
+        return TSDBSeries.from_dict(
+            self.get_distinct_counts_series(
+                model, keys, start, end, rollup, environment_id, tenant_ids=tenant_ids
+            ),
+            keys,
+        )
+
     def get_distinct_counts_totals(
         self,
         model: TSDBModel,
@@ -16,6 +16,7 @@ from django.utils.encoding import force_bytes
 from redis.client import Script
 
 from sentry.tsdb.base import BaseTSDB, IncrMultiOptions, TSDBModel
+from sentry.tsdb.series import TSDBSeries
 from sentry.utils.compat import crc32
 from sentry.utils.dates import to_datetime
 from sentry.utils.redis import (
@@ -35,6 +36,29 @@ CountMinScript = Script(
     None, importlib.resources.files("sentry").joinpath("scripts/tsdb/cmsketch.lua").read_bytes()
 )
 
+CountersScript = Script(
+    None, importlib.resources.files("sentry").joinpath("scripts/tsdb/counters.lua").read_bytes()
+)
+
+
+def make_counters_script_arguments(
+    operations: dict[str, dict[str | int, int]], expiries: dict[str, float]
+) -> tuple[list[str], list[int | float | str]]:
+    """
+    Flattens per-hash field increments and expiries into the ``KEYS`` and
+    ``ARGV`` of ``CountersScript``.
+    """
+    keys: list[str] = []
+    arguments: list[int | float | str] = []
+    for hash_key in operations.keys() | expiries.keys():
+        fields = operations.get(hash_key, {})
+        keys.append(hash_key)
+        arguments.append(int(expiries.get(hash_key, 0)))
+        arguments.append(len(fields))
+        for hash_field, count in fields.items():
+            arguments.extend((hash_field, count))
+    return keys, arguments
+
 
 class SuppressionWrapper(Generic[T]):
     """\
@@ -128,6 +152,9 @@ class RedisTSDB(BaseTSDB):
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        # Apply all counter updates routed to a host with a single script call
+        # in ``incr_multi`` and ``record_frequency_multi``.
+        self.enable_scripted_writes = options.pop("enable_scripted_writes", False)
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -267,47 +294,84 @@ class RedisTSDB(BaseTSDB):
             default_timestamp = timezone.now()
 
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
-            manager = cluster.map()
-            if not durable:
-                manager = SuppressionWrapper(manager)
+            # (hash_key) -> (hash_field) -> count
+            key_operations: dict[str, dict[str | int, int]] = defaultdict(lambda: defaultdict(int))
+            # (hash_key) -> "max expiration encountered"
+            key_expiries: dict[str, float] = defaultdict(float)
+
+            for rollup, max_values in self.rollups.items():
+                for item in items:
+                    if len(item) == 2:
+                        model, key = item
+                        options: IncrMultiOptions = {
+                            "timestamp": default_timestamp,
+                            "count": default_count,
+                        }
+                    else:
+                        model, key, options = item
+
+                    count = options.get("count", default_count)
+                    _timestamp = options.get("timestamp", default_timestamp)
+
+                    expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+
+                    for _environment_id in environment_ids:
+                        hash_key, hash_field = self.make_counter_key(
+                            model, rollup, _timestamp, key, _environment_id
+                        )
 
-            with manager as client:
-                # (hash_key, hash_field) -> count
-                key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
-                # (hash_key) -> "max expiration encountered"
-                key_expiries: dict[str, float] = defaultdict(float)
-
-                for rollup, max_values in self.rollups.items():
-                    for item in items:
-                        if len(item) == 2:
-                            model, key = item
-                            options: IncrMultiOptions = {
-                                "timestamp": default_timestamp,
-                                "count": default_count,
-                            }
-                        else:
-                            model, key, options = item
-
-                        count = options.get("count", default_count)
-                        _timestamp = options.get("timestamp", default_timestamp)
-
-                        expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+                        if key_expiries[hash_key] < expiry:
+                            key_expiries[hash_key] = expiry
 
-                        for _environment_id in environment_ids:
-                            hash_key, hash_field = self.make_counter_key(
-                                model, rollup, _timestamp, key, _environment_id
-                            )
+                        key_operations[hash_key][hash_field] += count
 
-                            if key_expiries[hash_key] < expiry:
-                                key_expiries[hash_key] = expiry
+            if self.enable_scripted_writes:
+                self._execute_counters_script(cluster, durable, key_operations, key_expiries)
+                continue
 
-                            key_operations[(hash_key, hash_field)] += count
+            manager = cluster.map()
+            if not durable:
+                manager = SuppressionWrapper(manager)
 
-                for (hash_key, hash_field), count in key_operations.items():
-                    client.hincrby(hash_key, hash_field, count)
+            with manager as client:
+                for hash_key, fields in key_operations.items():
+                    for hash_field, count in fields.items():
+                        client.hincrby(hash_key, hash_field, count)
                     if key_expiries.get(hash_key):
                         client.expireat(hash_key, key_expiries.pop(hash_key))
 
+    def _execute_counters_script(
+        self,
+        cluster: rb.Cluster,
+        durable: bool,
+        operations: dict[str, dict[str | int, int]],
+        expiries: dict[str, float],
+    ) -> None:
+        """
+        Applies counter increments and expiries with one ``CountersScript``
+        call per host.
+        """
+        router = cluster.get_router()
+        keys_by_host: dict[int, list[str]] = defaultdict(list)
+        for hash_key in operations.keys() | expiries.keys():
+            keys_by_host[router.get_host_for_key(hash_key)].append(hash_key)
+
+        commands: dict[str, list[tuple[Script, list[str], list[int | float | str]]]] = {}
+        for host_keys in keys_by_host.values():
+            keys, arguments = make_counters_script_arguments(
+                {k: operations[k] for k in host_keys if k in operations},
+                {k: expiries[k] for k in host_keys if k in expiries},
+            )
+            # all keys live on the same host, so any of them can be used to
+            # route the script call
+            commands[host_keys[0]] = [(CountersScript, keys, arguments)]
+
+        try:
+            cluster.execute_commands(commands)
+        except Exception:
+            if durable:
+                raise
+
     def get_range(
         self,
         model: TSDBModel,
@@ -329,34 +393,77 @@ class RedisTSDB(BaseTSDB):
         >>>          start=now - timedelta(days=1),
         >>>          end=now)
         """
-        # redis backend doesn't support multiple envs
-        if environment_ids is not None and len(environment_ids) > 1:
-            raise NotImplementedError
-        environment_id = environment_ids[0] if environment_ids else None
+        return self.get_range_array(
+            model, keys, start, end, rollup, environment_ids=environment_ids
+        ).to_dict(float_timestamps=True)
 
-        self.validate_arguments([model], [environment_id])
+    def get_range_array(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_ids: list[int] | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+    ) -> TSDBSeries:
+        """
+        Unlike ``get_range`` in other backends, this supports multiple
+        environments, whose counts are added up.
+        """
+        _environment_ids: list[int | None] = list(environment_ids) if environment_ids else [None]
+
+        self.validate_arguments([model], _environment_ids)
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         _series: list[datetime] = [to_datetime(item) for item in series]
+        # dedupe keys, but keep their order
+        keys = list(dict.fromkeys(keys))
 
-        results: list[tuple[float, int, Any]] = []
-        cluster, _ = self.get_cluster(environment_id)
-        with cluster.map() as client:
-            for key in keys:
-                for timestamp in _series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
+        result = None
+        for environment_id in _environment_ids:
+            cluster, _ = self.get_cluster(environment_id)
+            with cluster.map() as client:
+                promises = [
+                    client.hget(
+                        *self.make_counter_key(model, rollup, timestamp, key, environment_id)
                     )
-                    results.append((timestamp.timestamp(), key, client.hget(hash_key, hash_field)))
+                    for key in keys
+                    for timestamp in _series
+                ]
 
-        results_by_key: dict[int, dict[float, int]] = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+            environment_result = TSDBSeries.from_flat(
+                series, keys, (int(promise.value or 0) for promise in promises)
+            )
+            result = environment_result if result is None else result + environment_result
+
+        assert result is not None
+        return result
 
-        output: dict[int, list[tuple[float, int]]] = {}
-        for key, points in results_by_key.items():
-            output[key] = sorted(points.items())
-        return output
+    def get_sums(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+    ) -> dict[int, int]:
+        return self.get_range_array(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=[environment_id] if environment_id is not None else None,
+        ).sums()
 
     def merge(
         self,
@@ -498,28 +605,36 @@ class RedisTSDB(BaseTSDB):
         """
         Fetch counts of distinct items for each rollup interval within the range.
         """
+        return self.get_distinct_counts_series_array(
+            model, keys, start, end, rollup, environment_id
+        ).to_dict()
+
+    def get_distinct_counts_series_array(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        start: datetime,
+        end: datetime | None = None,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+    ) -> TSDBSeries:
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+        keys = list(dict.fromkeys(keys))
 
-        responses: dict[int, list[tuple[int, Any]]] = {}
         cluster, _ = self.get_cluster(environment_id)
         with cluster.fanout() as client:
+            promises = []
             for key in keys:
                 c = client.target_key(key)
-                r = responses[key] = []
                 for timestamp in series:
-                    r.append(
-                        (
-                            timestamp,
-                            c.pfcount(self.make_key(model, rollup, timestamp, key, environment_id)),
-                        )
+                    promises.append(
+                        c.pfcount(self.make_key(model, rollup, timestamp, key, environment_id))
                     )
 
-        return {
-            key: [(timestamp, promise.value) for timestamp, promise in value]
-            for key, value in responses.items()
-        }
+        return TSDBSeries.from_flat(series, keys, (promise.value for promise in promises))
 
     def get_distinct_counts_totals(
         self,
@@ -815,8 +930,14 @@ class RedisTSDB(BaseTSDB):
                     # append this to any value that already exists at the key.
                     cmds = commands.setdefault(key, [])
                     cmds.append((CountMinScript, keys, arguments))
-                    for k, t in expirations.items():
-                        cmds.append(("EXPIREAT", k, t))
+                    if self.enable_scripted_writes:
+                        # one script call instead of one EXPIREAT per key
+                        cmds.append(
+                            (CountersScript, *make_counters_script_arguments({}, expirations))
+                        )
+                    else:
+                        for k, t in expirations.items():
+                            cmds.append(("EXPIREAT", k, t))
 
             try:
                 cluster.execute_commands(commands)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import operator
+from array import array
+from collections.abc import Iterable, Sequence
+from itertools import groupby
+
+
+class TSDBSeries:
+    """
+    Array-backed result of a range query for many keys: one vector of epoch
+    timestamps shared by all keys and one row of counts per key, in the order
+    of ``keys``.
+
+    Compared to the ``{key: [(timestamp, count), ...]}`` mappings returned by
+    ``get_range``, this avoids allocating a tuple per data point and lets the
+    aggregations below run over whole rows at once.
+    """
+
+    __slots__ = ("timestamps", "keys", "counts")
+
+    def __init__(
+        self,
+        timestamps: Sequence[int],
+        keys: Sequence[int],
+        counts: Sequence[Sequence[int]],
+    ):
+        assert len(keys) == len(counts)
+        self.timestamps = array("q", timestamps)
+        self.keys = list(keys)
+        self.counts = [array("q", row) for row in counts]
+        assert all(len(row) == len(self.timestamps) for row in self.counts)
+
+    @classmethod
+    def _from_arrays(cls, timestamps: array, keys: list[int], counts: list[array]) -> TSDBSeries:
+        """
+        Wraps arrays that are already owned by the caller without copying them.
+        """
+        assert len(keys) == len(counts)
+        assert all(len(row) == len(timestamps) for row in counts)
+        series = cls.__new__(cls)
+        series.timestamps = timestamps
+        series.keys = keys
+        series.counts = counts
+        return series
+
+    @classmethod
+    def from_flat(
+        cls, timestamps: Sequence[int], keys: Sequence[int], values: Iterable[int]
+    ) -> TSDBSeries:
+        """
+        Builds a series from counts given key by key, and timestamp by
+        timestamp within each key.
+        """
+        flat = array("q", values)
+        width = len(timestamps)
+        return cls._from_arrays(
+            array("q", timestamps),
+            list(keys),
+            [flat[i * width : (i + 1) * width] for i in range(len(keys))],
+        )
+
+    @classmethod
+    def from_dict(
+        cls,
+        values: dict[int, list[tuple[float, int]]],
+        keys: Sequence[int] | None = None,
+    ) -> TSDBSeries:
+        """
+        Adapts the result of ``get_range``. All keys must share the same
+        timestamps. When ``keys`` is given, rows follow that order and keys
+        missing from ``values`` get a row of zeros.
+        """
+        if keys is None:
+            keys = list(values)
+        timestamps = next(([int(ts) for ts, _ in points] for points in values.values()), [])
+        empty = [0] * len(timestamps)
+        return cls(
+            timestamps,
+            keys,
+            [[count for _, count in values[key]] if key in values else empty for key in keys],
+        )
+
+    def to_dict(self, float_timestamps: bool = False) -> dict[int, list[tuple[float, int]]]:
+        """
+        Returns the series in the format of ``get_range``.
+        """
+        timestamps: Sequence[float] = (
+            [float(ts) for ts in self.timestamps] if float_timestamps else self.timestamps
+        )
+        return {key: list(zip(timestamps, row)) for key, row in zip(self.keys, self.counts)}
+
+    def sums(self) -> dict[int, int]:
+        """
+        Total count per key, as returned by ``get_sums``.
+        """
+        return {key: sum(row) for key, row in zip(self.keys, self.counts)}
+
+    def totals(self) -> array:
+        """
+        Count per timestamp across all keys.
+        """
+        if not self.counts:
+            return array("q", [0] * len(self.timestamps))
+        return array("q", map(sum, zip(*self.counts)))
+
+    def __add__(self, other: TSDBSeries) -> TSDBSeries:
+        """
+        Adds up the counts of two series over the same keys and timestamps,
+        for example the results for different environments.
+        """
+        assert self.keys == other.keys and self.timestamps == other.timestamps
+        return TSDBSeries._from_arrays(
+            array("q", self.timestamps),
+            list(self.keys),
+            [array("q", map(operator.add, a, b)) for a, b in zip(self.counts, other.counts)],
+        )
+
+    def rollup(self, seconds: int) -> TSDBSeries:
+        """
+        Sums up adjacent data points into buckets of ``seconds``, the same way
+        as ``BaseTSDB.rollup``.
+        """
+        buckets: list[int] = []
+        widths: list[int] = []
+        for bucket, group in groupby(self.timestamps, key=lambda ts: ts - ts % seconds):
+            buckets.append(bucket)
+            widths.append(sum(1 for _ in group))
+
+        bounds = []
+        start = 0
+        for width in widths:
+            bounds.append((start, start + width))
+            start += width
+
+        return TSDBSeries(
+            buckets,
+            self.keys,
+            [[sum(row[lo:hi]) for lo, hi in bounds] for row in self.counts],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TSDBSeries):
+            return NotImplemented
+        return (
+            self.timestamps == other.timestamps
+            and self.keys == other.keys
+            and self.counts == other.counts
+        )
+
+    def __repr__(self) -> str:
+        return f"<TSDBSeries keys={len(self.keys)} points={len(self.timestamps)}>"
@@ -0,0 +1,72 @@
+"""
+Memoization of lookups for the duration of a batch of work.
+
+Tasks that handle many events at once, like `post_process_group_batch`, open
+a scope with `batch_cache_scope` around the batch. Within the scope, functions
+decorated with `batch_cached` (and `batch_get_or_fetch` calls) only run once
+per set of arguments, so that project level state like rules or ownership is
+loaded once per project instead of once per event. Outside of a scope they are
+called as usual.
+
+Memoized values are shared between the events of a batch and must not be
+modified.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections.abc import Callable, Generator, Hashable
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_scope = threading.local()
+
+
+@contextmanager
+def batch_cache_scope() -> Generator[None, None, None]:
+    """
+    Memoizes `batch_cached` functions until the block exits. Nested scopes
+    share the values of the outermost scope.
+    """
+    if getattr(_scope, "items", None) is not None:
+        yield
+        return
+
+    _scope.items = {}
+    try:
+        yield
+    finally:
+        _scope.items = None
+
+
+def batch_get_or_fetch(key: Hashable, fetch: Callable[[], T]) -> T:
+    """
+    Returns the value memoized for ``key`` in the current scope, calling
+    ``fetch`` if there is none. Exceptions raised by ``fetch`` are not
+    memoized.
+    """
+    items: dict[Hashable, Any] | None = getattr(_scope, "items", None)
+    if items is None:
+        return fetch()
+
+    try:
+        return items[key]
+    except KeyError:
+        value = items[key] = fetch()
+        return value
+
+
+def batch_cached(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    A decorator to memoize functions per batch, see `batch_cache_scope`.
+    Like with `request_cache`, arguments should be primitive types.
+    """
+
+    @functools.wraps(func)
+    def wrapped(*args: Any, **kwargs: Any) -> T:
+        return batch_get_or_fetch((func, repr(args), repr(kwargs)), lambda: func(*args, **kwargs))
+
+    return wrapped
@@ -17,7 +17,7 @@ from django.utils.functional import Promise
 from django.utils.safestring import SafeString, mark_safe
 from django.utils.timezone import is_aware
 from simplejson import _default_decoder  # type: ignore[attr-defined]  # noqa: S003
-from simplejson import JSONDecodeError, JSONEncoder  # noqa: S003
+from simplejson import JSONDecodeError, JSONEncoder, RawJSON  # noqa: S003
 
 from bitfield.types import BitHandler
 
@@ -177,6 +177,7 @@ __all__ = (
     "JSONData",
     "JSONDecodeError",
     "JSONEncoder",
+    "RawJSON",
     "dump",
     "dumps",
     "dumps_htmlsafe",
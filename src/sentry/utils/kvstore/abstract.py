@@ -55,6 +55,19 @@ class KVStorage(ABC, Generic[K, V]):
         """
         raise NotImplementedError
 
+    def delete_if_present(self, key: K) -> bool:
+        """
+        Delete the value at key (if it exists), and return whether it existed.
+
+        This operation is not guaranteed to be atomic, two concurrent callers
+        may both see the value as existing.
+        """
+        # This implementation can/should be overridden by concrete subclasses
+        # where the backend reports the result of the delete.
+        present = self.get(key) is not None
+        self.delete(key)
+        return present
+
     def delete_many(self, keys: Sequence[K]) -> None:
         """
         Delete the values at the provided keys (if they exist.)
@@ -95,6 +95,9 @@ class CacheKeyWrapper(KVStorage[str, V]):
     def delete(self, key: str) -> None:
         self.storage.delete(wrap_key(self.prefix, self.version, key))
 
+    def delete_if_present(self, key: str) -> bool:
+        return self.storage.delete_if_present(wrap_key(self.prefix, self.version, key))
+
     def delete_many(self, keys: Sequence[str]) -> None:
         return self.storage.delete_many([wrap_key(self.prefix, self.version, key) for key in keys])
 
@@ -37,6 +37,9 @@ class KVStorageCodecWrapper(KVStorage[K, TDecoded]):
     def delete(self, key: K) -> None:
         return self.store.delete(key)
 
+    def delete_if_present(self, key: K) -> bool:
+        return self.store.delete_if_present(key)
+
     def delete_many(self, keys: Sequence[K]) -> None:
         return self.store.delete_many(keys)
 
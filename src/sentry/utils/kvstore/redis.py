@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
 from datetime import timedelta
 from typing import TypeVar
 
@@ -23,12 +24,33 @@ class RedisKVStorage(KVStorage[str, T]):
     def get(self, key: str) -> T | None:
         return self.client.get(key.encode("utf8"))
 
+    def get_many(self, keys: Sequence[str]) -> Iterator[tuple[str, T]]:
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.get(key.encode("utf8"))
+            values = pipeline.execute()
+
+        for key, value in zip(keys, values):
+            if value is not None:
+                yield key, value
+
     def set(self, key: str, value: T, ttl: timedelta | None = None) -> None:
         self.client.set(key.encode("utf8"), value, ex=ttl)
 
     def delete(self, key: str) -> None:
         self.client.delete(key.encode("utf8"))
 
+    def delete_if_present(self, key: str) -> bool:
+        return self.client.delete(key.encode("utf8")) > 0
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        # Single key commands, as the keys may belong to different slots of a
+        # cluster.
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.delete(key.encode("utf8"))
+            pipeline.execute()
+
     def bootstrap(self) -> None:
         pass  # nothing to do
 
@@ -0,0 +1,129 @@
+"""
+Accounting of the resources a block of code uses: wall time, database
+queries, Redis commands and Snuba queries.
+
+`record_resource_usage` counts for the current thread only. Database queries
+are counted with a Django execute wrapper, Redis commands (including the ones
+sent by Redis backed caches and in pipelines) by wrapping the packing of
+commands in the Redis client, and Snuba queries where they are sent in
+`sentry.utils.snuba`. The Redis client is only wrapped while a recording is
+active in any thread of the process.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from django.db import connections
+
+_local = threading.local()
+
+_redis_wrapper_lock = threading.Lock()
+# The number of recordings active in the process, and the `pack_command` that
+# was wrapped while there are any.
+_redis_recordings = 0
+_redis_pack_command: Callable[..., Any] | None = None
+
+
+@dataclass(eq=False)
+class ResourceUsage:
+    duration: float = 0.0
+    db_queries: int = 0
+    redis_commands: int = 0
+    snuba_queries: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _get_active_usages() -> list[ResourceUsage]:
+    try:
+        return _local.usages
+    except AttributeError:
+        _local.usages = []
+        return _local.usages
+
+
+def record_snuba_queries(count: int) -> None:
+    for usage in _get_active_usages():
+        usage.snuba_queries += count
+
+
+def _count_db_query(
+    usage: ResourceUsage,
+    execute: Callable[..., Any],
+    sql: Any,
+    params: Any,
+    many: bool,
+    context: Any,
+) -> Any:
+    usage.db_queries += 1
+    return execute(sql, params, many, context)
+
+
+def _install_redis_wrapper() -> None:
+    global _redis_recordings, _redis_pack_command
+
+    with _redis_wrapper_lock:
+        _redis_recordings += 1
+        if _redis_recordings > 1:
+            return
+
+        from redis.connection import Connection
+
+        pack_command = _redis_pack_command = Connection.pack_command
+
+        @functools.wraps(pack_command)
+        def counting_pack_command(self: Connection, *args: Any) -> Any:
+            for usage in _get_active_usages():
+                usage.redis_commands += 1
+            return pack_command(self, *args)
+
+        # Pipelines pack their commands one by one as well.
+        Connection.pack_command = counting_pack_command  # type: ignore[method-assign]
+
+
+def _uninstall_redis_wrapper() -> None:
+    global _redis_recordings, _redis_pack_command
+
+    with _redis_wrapper_lock:
+        _redis_recordings -= 1
+        if _redis_recordings > 0:
+            return
+
+        from redis.connection import Connection
+
+        Connection.pack_command = _redis_pack_command  # type: ignore[method-assign]
+        _redis_pack_command = None
+
+
+@contextmanager
+def record_resource_usage() -> Generator[ResourceUsage, None, None]:
+    """
+    Records the resources used by the current thread until the block exits.
+    Recordings can be nested, in which case the outer recording includes the
+    usage of the inner one.
+    """
+    _install_redis_wrapper()
+
+    usage = ResourceUsage()
+    active_usages = _get_active_usages()
+    active_usages.append(usage)
+    start = time.monotonic()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(functools.partial(_count_db_query, usage))
+                )
+            yield usage
+    finally:
+        usage.duration = time.monotonic() - start
+        _uninstall_redis_wrapper()
+        active_usages.remove(usage)
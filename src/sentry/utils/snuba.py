@@ -38,6 +38,7 @@ from sentry.snuba.events import Columns
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.resource_usage import record_snuba_queries
 
 logger = logging.getLogger(__name__)
 
@@ -966,6 +967,7 @@ def _bulk_snuba_query(
     headers: Mapping[str, str],
 ) -> ResultSet:
     query_referrer = headers.get("referer", "<unknown>")
+    record_snuba_queries(len(snuba_param_list))
 
     with sentry_sdk.start_span(
         op="snuba_query",
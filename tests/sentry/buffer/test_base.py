@@ -3,7 +3,7 @@ from unittest import mock
 
 from django.utils import timezone
 
-from sentry.buffer.base import Buffer
+from sentry.buffer.base import Buffer, BufferedUpdate
 from sentry.db import models
 from sentry.models.group import Group
 from sentry.models.organization import Organization
@@ -77,3 +77,35 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch_updates_by_pk(self):
+        groups = [Group.objects.create(project=Project(id=1)) for _ in range(3)]
+        the_date = timezone.now() + timedelta(days=5)
+        updates = [
+            BufferedUpdate({"times_seen": i + 1}, {"id": group.id}, {"last_seen": the_date})
+            for i, group in enumerate(groups)
+        ]
+        with self.assertNumQueries(1):
+            self.buf.process_batch(Group, updates)
+
+        for i, group in enumerate(groups):
+            group_ = Group.objects.get(id=group.id)
+            assert group_.times_seen == group.times_seen + i + 1
+            assert group_.last_seen == the_date
+
+    def test_process_batch_falls_back_to_process(self):
+        group = Group.objects.create(project=Project(id=1))
+        filters = {"project_id": self.project.id, "release_id": self.release.id}
+        updates = [
+            BufferedUpdate({"new_groups": 1}, filters),
+            BufferedUpdate({"times_seen": 1}, {"id": group.id}),
+            # deleted rows are skipped
+            BufferedUpdate({"times_seen": 1}, {"id": group.id + 1000}),
+        ]
+        with mock.patch.object(self.buf, "process", wraps=self.buf.process) as process:
+            self.buf.process_batch(ReleaseProject, updates[:1])
+            self.buf.process_batch(Group, updates[1:])
+        process.assert_called_once_with(ReleaseProject, {"new_groups": 1}, filters, None, None)
+
+        assert ReleaseProject.objects.filter(new_groups=1, **filters).exists()
+        assert Group.objects.get(id=group.id).times_seen == group.times_seen + 1
@@ -1,11 +1,13 @@
 import datetime
 import pickle
+import time
 from unittest import mock
 
 import pytest
 from django.utils import timezone
 
 from sentry import options
+from sentry.buffer.base import BufferedUpdate
 from sentry.buffer.redis import RedisBuffer
 from sentry.models.group import Group
 from sentry.models.project import Project
@@ -108,6 +110,41 @@ class TestRedisBuffer:
         self.buf.process("foo")
         process.assert_called_once_with(Group, columns, filters, extra, signal_only)
 
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_bulk(self, process, process_batch):
+        self.buf.process_bulk = True
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        keys = []
+        for pk in range(3):
+            filters = {"pk": pk}
+            keys.append(self.buf._make_key(model, filters=filters))
+            self.buf.incr(model, {"times_seen": pk + 1}, filters, extra={"foo": "bar"})
+        client.set(self.buf._make_lock_key(keys[2]), "1")
+
+        self.buf.process(batch_keys=keys)
+
+        assert not process.called
+        process_batch.assert_called_once_with(
+            mock.Mock,
+            [
+                BufferedUpdate({"times_seen": 1}, {"pk": 0}, {"foo": "bar"}, None),
+                BufferedUpdate({"times_seen": 2}, {"pk": 1}, {"foo": "bar"}, None),
+            ],
+        )
+        # the locked key is left for the next run
+        assert not client.exists(keys[0])
+        assert not client.exists(keys[1])
+        assert client.exists(keys[2])
+        assert not client.exists(self.buf._make_lock_key(keys[0]))
+        pending = client.zrange("b:p", 0, -1)
+        if self.buf.is_redis_cluster:
+            assert pending == [keys[2]]
+        else:
+            assert pending == [keys[2].encode("utf-8")]
+
     @django_db_all
     @freeze_time()
     def test_group_cache_updated(self, default_group, task_runner):
@@ -137,6 +174,34 @@ class TestRedisBuffer:
         self.buf.incr(model, {"times_seen": 5}, filters)
         assert self.buf.get(model, columns, filters=filters) == {"times_seen": 6}
 
+    def test_sorted_set(self):
+        with freeze_time("2024-01-01 00:00:00"):
+            self.buf.push_to_sorted_set(key="project_ids", value=1)
+            self.buf.push_to_sorted_set(key="project_ids", value=2)
+        with freeze_time("2024-01-01 00:01:00"):
+            self.buf.push_to_sorted_set(key="project_ids", value=3)
+
+        cutoff = datetime.datetime(2024, 1, 1, 0, 0, 30, tzinfo=datetime.UTC).timestamp()
+        assert [value for value, _ in self.buf.get_sorted_set("project_ids", 0, cutoff)] == [1, 2]
+
+        self.buf.delete_key("project_ids", min=0, max=cutoff)
+        assert [value for value, _ in self.buf.get_sorted_set("project_ids", 0, time.time())] == [3]
+
+    def test_hash(self):
+        filters = {"project_id": 1}
+        self.buf.push_to_hash(Project, filters, "1:2", '{"event_id": "a"}')
+        self.buf.push_to_hash(Project, filters, "1:3", '{"event_id": "b"}')
+        self.buf.push_to_hash(Project, filters, "1:2", '{"event_id": "c"}')
+        assert self.buf.get_hash(Project, filters) == {
+            "1:2": '{"event_id": "c"}',
+            "1:3": '{"event_id": "b"}',
+        }
+        # The hash is not mistaken for buffered increments
+        assert self.buf.get(Project, ["times_seen"], filters) == {"times_seen": 0}
+
+        self.buf.delete_hash(Project, filters, fields=["1:2"])
+        assert self.buf.get_hash(Project, filters) == {"1:3": '{"event_id": "b"}'}
+
     def test_incr_saves_to_redis(self):
         now = datetime.datetime(2017, 5, 3, 6, 6, 6, tzinfo=datetime.UTC)
         client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
@@ -194,6 +259,104 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    @mock.patch("sentry.buffer.redis.RedisBuffer._start_flusher", mock.Mock())
+    def test_incr_coalesces_until_size(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        self.buf.incr_coalesce_size = 3
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1}
+        key = self.buf._make_key(model, filters=filters)
+
+        self.buf.incr(model, {"times_seen": 1}, filters, extra={"foo": "bar"})
+        self.buf.incr(model, {"times_seen": 2}, filters, extra={"foo": "baz"})
+        assert not client.exists(key)
+        # buffered increments are still visible through `get`
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 3}
+
+        self.buf.incr(model, {"times_seen": 4}, filters)
+        # the write is left to the flusher thread
+        assert self.buf._flush_requested.is_set()
+        with mock.patch("sentry.buffer.redis.metrics") as metrics:
+            self.buf._flush_due()
+        metrics.distribution.assert_any_call("buffer.incr.coalesced-calls", 3)
+        metrics.distribution.assert_any_call("buffer.incr.coalesced-keys", 1)
+        metrics.distribution.assert_any_call("buffer.incr.coalesce-ratio", 3.0)
+
+        result = client.hgetall(key)
+        if not self.buf.is_redis_cluster:
+            result = {k.decode(): v for k, v in result.items()}
+        assert int(result["i+times_seen"]) == 7
+        if self.buf.is_redis_cluster:
+            assert self.buf._load_value(json.loads(result["e+foo"])) == "baz"
+        else:
+            assert pickle.loads(result["e+foo"]) == "baz"
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 7}
+
+        pending = client.zrange("b:p", 0, -1)
+        if self.buf.is_redis_cluster:
+            assert pending == [key]
+        else:
+            assert pending == [key.encode("utf-8")]
+
+    @mock.patch("sentry.buffer.redis.RedisBuffer._start_flusher", mock.Mock())
+    def test_incr_coalesce_flush(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        self.buf.incr_coalesce_size = 100
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        keys = []
+        for pk in range(5):
+            keys.append(self.buf._make_key(model, filters={"pk": pk}))
+            self.buf.incr(model, {"times_seen": 1}, {"pk": pk}, signal_only=pk == 0)
+
+        assert client.zrange("b:p", 0, -1) == []
+        self.buf.flush()
+
+        for pk, key in enumerate(keys):
+            assert self.buf.get(model, ["times_seen"], filters={"pk": pk}) == {"times_seen": 1}
+        assert bool(client.hget(keys[0], "s")) is True
+        assert client.hget(keys[1], "s") is None
+        assert len(client.zrange("b:p", 0, -1)) == 5
+
+        # nothing left to write
+        self.buf.flush()
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 0}) == {"times_seen": 1}
+
+    def test_incr_coalesce_flush_in_background(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        buf = RedisBuffer(incr_coalesce_window=0.05)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        key = buf._make_key(model, filters={"pk": 1})
+
+        buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        assert not client.exists(key)
+
+        # a quiet key is written out once the window has passed, not on the next `incr`
+        deadline = time.time() + 5
+        while not client.exists(key) and time.time() < deadline:
+            time.sleep(0.01)
+        assert client.exists(key)
+        assert len(client.zrange("b:p", 0, -1)) == 1
+
+    @mock.patch("sentry.buffer.redis.RedisBuffer._start_flusher", mock.Mock())
+    def test_incr_coalesce_flush_failure_keeps_increments(self):
+        self.buf.incr_coalesce_size = 100
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1}
+
+        self.buf.incr(model, {"times_seen": 1}, filters, extra={"foo": "bar"})
+        with mock.patch.object(self.buf, "_queue_incr", side_effect=ConnectionError):
+            # a failing write is not raised to the caller
+            self.buf.flush()
+
+        self.buf.incr(model, {"times_seen": 2}, filters, extra={"foo": "baz"})
+        assert self.buf._coalesced_calls == 2
+        self.buf.flush()
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 3}
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     @mock.patch("sentry.buffer.redis.process_pending")
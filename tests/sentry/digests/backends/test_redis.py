@@ -1,4 +1,5 @@
 import time
+from unittest import mock
 
 import pytest
 
@@ -151,3 +152,44 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        record_1 = Record("record:1", "value", time.time())
+        backend.add("timeline:1", record_1)
+        record_2 = Record("record:2", "value", time.time())
+        backend.add("timeline:2", record_2)
+        backend.add("timeline:3", Record("record:3", "value", time.time()))
+        backend.delete("timeline:3")
+
+        with backend.digest_many({"timeline:1": 0, "timeline:2": 0, "timeline:3": 0}) as digests:
+            # The deleted timeline is not in the ready state.
+            assert digests == {"timeline:1": [record_1], "timeline:2": [record_2]}
+
+            # This causes the digest of the second timeline to not be closed.
+            del digests["timeline:2"]
+
+        assert digests == {"timeline:1": [record_1]}
+
+        # Only the closed timeline is back in the waiting state.
+        assert {entry.key for entry in backend.schedule(time.time())} == {"timeline:1"}
+        with backend.digest("timeline:2", 0) as records:
+            assert set(records) == {record_2}
+
+    def test_digest_many_lock_expired(self):
+        backend = RedisBackend()
+
+        record = Record("record:1", "value", time.time())
+        backend.add("timeline:1", record)
+
+        with mock.patch("sentry.digests.backends.redis.time") as mock_time:
+            mock_time.time.side_effect = time.time
+            mock_time.monotonic.side_effect = [0, 30]
+            with backend.digest_many({"timeline:1": 0}) as digests:
+                assert digests == {"timeline:1": [record]}
+
+        # The timeline is neither closed nor delivered once its lock may have expired.
+        assert digests == {}
+        with backend.digest("timeline:1", 0) as records:
+            assert set(records) == {record}
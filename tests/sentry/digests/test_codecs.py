@@ -0,0 +1,95 @@
+import uuid
+from unittest import mock
+
+import pytest
+
+from sentry.digests.codecs import CompressedPickleCodec, NotificationCodec
+from sentry.digests.notifications import Notification, bind_records, event_to_record
+from sentry.eventstore.models import GroupEvent
+from sentry.issues.issue_occurrence import IssueOccurrence
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_snuba
+from tests.sentry.issues.test_utils import OccurrenceTestMixin
+
+pytestmark = [requires_snuba]
+
+
+class NotificationCodecTestCase(TestCase, OccurrenceTestMixin):
+    @pytest.fixture(autouse=True)
+    def enable_notification_codec(self):
+        with override_options({"digests.notification-codec.write": True}):
+            yield
+
+    def setUp(self):
+        self.codec = NotificationCodec()
+        self.notification_uuid = str(uuid.uuid4())
+        self.event = self.store_event(
+            data={"timestamp": iso_format(before_now(minutes=1)), "message": "Hello world"},
+            project_id=self.project.id,
+        )
+        self.rule = self.create_project_rule(project=self.project)
+
+    def test_roundtrip(self):
+        record = event_to_record(self.event, [self.rule], self.notification_uuid)
+        encoded = self.codec.encode(record.value)
+        assert encoded[:1] == NotificationCodec.VERSION
+
+        value = self.codec.decode(encoded)
+        assert value.rules == [self.rule.id]
+        assert value.notification_uuid == self.notification_uuid
+        assert isinstance(value.event, GroupEvent)
+        assert value.event.project_id == self.project.id
+        assert value.event.event_id == self.event.event_id
+        assert value.event.group_id == self.event.group_id
+        assert not value.event.data.bound
+
+    def test_bind_records(self):
+        record = event_to_record(self.event, [self.rule], self.notification_uuid)
+        record = record._replace(value=self.codec.decode(self.codec.encode(record.value)))
+
+        bind_records([record])
+        assert record.value.event.data.bound
+        assert record.value.event.data["logentry"] == self.event.data["logentry"]
+
+    def test_occurrence(self):
+        occurrence, group_info = self.process_occurrence(
+            project_id=self.project.id,
+            event_data={"timestamp": before_now(minutes=1).isoformat()},
+        )
+        assert group_info is not None
+        event = group_info.group.get_latest_event()
+        assert isinstance(event, GroupEvent)
+        assert event.occurrence is not None
+
+        record = event_to_record(event, [self.rule], self.notification_uuid)
+        record = record._replace(value=self.codec.decode(self.codec.encode(record.value)))
+        assert isinstance(record.value.event, GroupEvent)
+        assert record.value.event.occurrence_id == occurrence.id
+
+        with mock.patch.object(
+            IssueOccurrence, "fetch_multi", wraps=IssueOccurrence.fetch_multi
+        ) as fetch_multi:
+            bind_records([record])
+        assert fetch_multi.call_count == 1
+        assert record.value.event.occurrence.id == occurrence.id
+        assert record.value.event.occurrence.issue_title == occurrence.issue_title
+
+    def test_legacy_records(self):
+        notification = Notification(self.event, [self.rule.id], self.notification_uuid)
+        value = self.codec.decode(CompressedPickleCodec().encode(notification))
+        assert value.event.event_id == self.event.event_id
+        assert value.event.data.bound
+        assert value.rules == [self.rule.id]
+        assert value.notification_uuid == self.notification_uuid
+
+    def test_other_values(self):
+        assert self.codec.decode(self.codec.encode("value")) == "value"
+
+    def test_write_disabled(self):
+        record = event_to_record(self.event, [self.rule], self.notification_uuid)
+        with override_options({"digests.notification-codec.write": False}):
+            encoded = self.codec.encode(record.value)
+        assert encoded[:1] != NotificationCodec.VERSION
+        assert self.codec.decode(encoded).event.event_id == self.event.event_id
@@ -0,0 +1,127 @@
+"""
+Benchmarks for the path of an event from ingestion to post processing:
+`EventManager.normalize`, `EventManager.save` and `post_process_group`.
+
+Every benchmark replays a sample event of one platform with a fresh event id,
+against the Postgres and Redis instances of the test environment. Besides the
+timings of pytest-benchmark (``ops`` being events per second), the benchmarks
+record the p50 and p99 latency as well as the number of database queries and
+Redis commands per event in ``extra_info``.
+
+To compare two runs, save them and diff them with pytest-benchmark::
+
+    pytest tests/sentry/event_manager/test_benchmark.py --benchmark-autosave
+    # ... change things ...
+    pytest tests/sentry/event_manager/test_benchmark.py --benchmark-autosave
+    pytest-benchmark compare 0001 0002 --group-by=name --columns=median,ops
+"""
+
+from __future__ import annotations
+
+import copy
+import uuid
+from collections.abc import Generator
+from contextlib import ExitStack, contextmanager
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from redis.connection import Connection
+
+from sentry.event_manager import EventManager
+from sentry.tasks.post_process import post_process_group
+from sentry.testutils.helpers.eventprocessing import write_event_to_cache
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_benchmark, requires_snuba
+from sentry.utils.samples import load_data
+
+pytestmark = [requires_snuba]
+
+ROUNDS = 50
+
+# Sample events by benchmark name, see `sentry.utils.samples.load_data`. Source
+# maps and symbolication happen before `EventManager`, so these events are
+# saved as they are.
+CORPUS = {
+    "python": "python",
+    "javascript": "javascript",
+    "native": "native",
+    "java": "java",
+    "cocoa": "cocoa",
+    "transaction": "python-transaction",
+}
+
+
+class IngestCounters:
+    def __init__(self) -> None:
+        self.queries = 0
+        self.redis_commands = 0
+
+
+@contextmanager
+def count_queries_and_redis_commands() -> Generator[IngestCounters, None, None]:
+    counters = IngestCounters()
+    pack_command = Connection.pack_command
+
+    def counting_pack_command(self: Connection, *args: Any) -> Any:
+        counters.redis_commands += 1
+        return pack_command(self, *args)
+
+    with ExitStack() as stack:
+        contexts = [
+            stack.enter_context(CaptureQueriesContext(connection))
+            for connection in connections.all()
+        ]
+        stack.enter_context(mock.patch.object(Connection, "pack_command", counting_pack_command))
+        yield counters
+
+    counters.queries = sum(len(context) for context in contexts)
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def ingest_event(data: dict[str, Any], project_id: int) -> None:
+    manager = EventManager(data)
+    manager.normalize()
+    event = manager.save(project_id)
+
+    post_process_group(
+        is_new=False,
+        is_regression=False,
+        is_new_group_environment=False,
+        cache_key=write_event_to_cache(event),
+        group_id=event.group_id,
+        project_id=project_id,
+    )
+
+
+@requires_benchmark
+@pytest.mark.parametrize("name", sorted(CORPUS))
+@django_db_all
+def test_benchmark_ingest(name, default_project, benchmark):
+    sample = load_data(CORPUS[name])
+
+    def setup():
+        data = copy.deepcopy(dict(sample))
+        data["event_id"] = uuid.uuid4().hex
+        return (data, default_project.id), {}
+
+    # The first event creates the group, release, environment etc.
+    ingest_event(*setup()[0])
+
+    with count_queries_and_redis_commands() as counters:
+        ingest_event(*setup()[0])
+    benchmark.extra_info["queries_per_event"] = counters.queries
+    benchmark.extra_info["redis_commands_per_event"] = counters.redis_commands
+
+    benchmark.pedantic(ingest_event, setup=setup, rounds=ROUNDS)
+
+    if benchmark.stats is not None:
+        timings = benchmark.stats.stats.data
+        benchmark.extra_info["p50"] = percentile(timings, 0.5)
+        benchmark.extra_info["p99"] = percentile(timings, 0.99)
@@ -1,7 +1,10 @@
 from datetime import datetime
 
+from sentry.eventstore.processing.redis import RedisClusterEventProcessingStore
 from sentry.eventstore.reprocessing.redis import RedisReprocessingStore
 from sentry.testutils.helpers.redis import use_redis_cluster
+from sentry.utils import json
+from sentry.utils.cache import cache_key_for_event
 
 
 @use_redis_cluster()
@@ -20,3 +23,30 @@ def test_mark_event_reprocessed():
     assert progress is not None
     assert progress.get("syncCount") == 10
     assert progress.get("totalEvents") == 20
+
+
+@use_redis_cluster()
+def test_store_encoded():
+    store = RedisClusterEventProcessingStore()
+    # Not how the payload would be encoded again
+    payload = b'{"event_id": "a", "project": 1, "type": "transaction", "spans": [{"op": "db"}]}'
+    event = json.loads(payload)
+
+    key = store.store_encoded(event, payload)
+
+    assert key == cache_key_for_event(event)
+    assert store.inner.store.get(key) in (payload, payload.decode())
+    assert store.get(key) == event
+
+
+@use_redis_cluster()
+def test_get_many():
+    store = RedisClusterEventProcessingStore()
+    events = [{"event_id": event_id, "project": 1} for event_id in ("a", "b")]
+    keys = [store.store(event) for event in events]
+    missing_key = cache_key_for_event({"event_id": "c", "project": 1})
+
+    assert store.get_many([*keys, missing_key]) == dict(zip(keys, events))
+
+    store.delete_by_key(keys[0])
+    assert store.get_many(keys) == {keys[1]: events[1]}
@@ -4,9 +4,13 @@ from unittest.mock import Mock, patch
 
 import pytest
 from arroyo.backends.kafka import KafkaPayload
-from arroyo.types import BrokerValue, Message, Partition, Topic
+from arroyo.processing.strategies.batching import ValuesBatch
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 
-from sentry.eventstream.kafka.dispatch import _get_task_kwargs_and_dispatch
+from sentry.eventstream.kafka.dispatch import (
+    _get_task_kwargs_and_dispatch,
+    _get_task_kwargs_and_dispatch_batch,
+)
 from sentry.utils import json
 
 
@@ -127,3 +131,50 @@ def test_dispatch_task_with_occurrence(mock_post_process_group: Mock) -> None:
         },
         "queue": "post_process_issue_platform",
     }
+
+
+@pytest.mark.django_db
+@patch("sentry.tasks.post_process.post_process_group_batch.apply_async")
+def test_dispatch_batch(mock_post_process_group_batch: Mock) -> None:
+    partition = Partition(Topic("test"), 0)
+    payloads = [get_kafka_payload(), get_occurrence_kafka_payload(), get_kafka_payload()]
+    batch: ValuesBatch[KafkaPayload] = [
+        BrokerValue(payload, partition, offset, datetime.now())
+        for offset, payload in enumerate(payloads)
+    ]
+
+    _get_task_kwargs_and_dispatch_batch(Message(Value(batch, {})), max_batch_size=1000)
+
+    assert mock_post_process_group_batch.call_count == 2
+    events_by_queue = {
+        call.kwargs["queue"]: call.kwargs["kwargs"]["events"]
+        for call in mock_post_process_group_batch.call_args_list
+    }
+    assert [event["cache_key"] for event in events_by_queue["post_process_errors"]] == [
+        "e:fe0ee9a2bc3b415497bad68aaf70dc7f:1",
+        "e:fe0ee9a2bc3b415497bad68aaf70dc7f:1",
+    ]
+    assert [event["occurrence_id"] for event in events_by_queue["post_process_issue_platform"]] == [
+        "0c6d75ac396941e0bc4b33c2ff7f3657"
+    ]
+    # The queue is passed on, so that the task can requeue events to it
+    assert all(
+        call.kwargs["kwargs"]["queue"] == call.kwargs["queue"]
+        for call in mock_post_process_group_batch.call_args_list
+    )
+
+
+@pytest.mark.django_db
+@patch("sentry.tasks.post_process.post_process_group_batch.apply_async")
+def test_dispatch_batch_max_size(mock_post_process_group_batch: Mock) -> None:
+    partition = Partition(Topic("test"), 0)
+    batch: ValuesBatch[KafkaPayload] = [
+        BrokerValue(get_kafka_payload(), partition, offset, datetime.now()) for offset in range(5)
+    ]
+
+    _get_task_kwargs_and_dispatch_batch(Message(Value(batch, {})), max_batch_size=2)
+
+    assert [
+        len(call.kwargs["kwargs"]["events"])
+        for call in mock_post_process_group_batch.call_args_list
+    ] == [2, 2, 1]
@@ -1,22 +1,19 @@
+import tracemalloc
+
 import pytest
 
-from sentry.grouping.api import get_default_grouping_config_dict
+from sentry import eventstore
+from sentry.event_manager import EventManager
+from sentry.grouping.api import get_default_grouping_config_dict, load_grouping_config
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.stacktraces.processing import normalize_stacktraces_for_grouping
+from sentry.testutils.skips import requires_benchmark
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +34,62 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def make_deep_stacktrace_event(platform, config, num_frames=500):
+    if platform == "java":
+        frames = [
+            {
+                "function": f"handle{i % 50}",
+                "module": f"io.sentry.example.pkg{i % 7}.Handler{i % 13}",
+                "filename": f"Handler{i % 13}.java",
+                "lineno": i,
+                "in_app": i % 3 == 0,
+            }
+            for i in range(num_frames)
+        ]
+    else:
+        frames = [
+            {
+                "function": f"handle_{i % 50}(int, char const*)",
+                "package": f"/usr/lib/libexample{i % 5}.so",
+                "instruction_addr": hex(0x1000 + i * 16),
+                "in_app": i % 3 == 0,
+            }
+            for i in range(num_frames)
+        ]
+
+    data = {
+        "platform": platform,
+        "exception": {
+            "values": [{"type": "RuntimeError", "value": "oops", "stacktrace": {"frames": frames}}]
+        },
+    }
+    mgr = EventManager(data=data, grouping_config=config)
+    mgr.normalize()
+    data = mgr.get_data()
+    normalize_stacktraces_for_grouping(data, load_grouping_config(config))
+    return eventstore.backend.create_event(data=data)
+
+
+def group_event(event, config):
+    variants = event.get_grouping_variants(force_config=config, normalize_stacktraces=False)
+    return {key: variant.get_hash() for key, variant in variants.items()}
+
+
+@requires_benchmark
+@pytest.mark.parametrize("platform", ["java", "native"])
+def test_benchmark_grouping_deep_stacktrace(platform, benchmark):
+    config = get_default_grouping_config_dict()
+    event = make_deep_stacktrace_event(platform, config)
+    event.project = None
+
+    tracemalloc.start()
+    try:
+        group_event(event, config)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_allocated_bytes"] = peak
+
+    benchmark(group_event, event, config)
@@ -0,0 +1,44 @@
+from sentry.grouping.component import GroupingComponent
+
+
+def make_frame(function, filename):
+    return GroupingComponent(
+        id="frame",
+        values=[
+            GroupingComponent(id="function", values=[function]),
+            GroupingComponent(id="filename", values=[filename]),
+        ],
+    )
+
+
+def test_slots():
+    component = GroupingComponent(id="function", values=["foo"])
+    assert not hasattr(component, "__dict__")
+    assert component.id is GroupingComponent(id="".join(["func", "tion"])).id
+
+
+def test_hash_follows_subcomponent_updates():
+    frame = make_frame("foo", "foo.py")
+    stacktrace = GroupingComponent(id="stacktrace", values=[frame, make_frame("bar", "bar.py")])
+
+    hash = stacktrace.get_hash()
+    assert stacktrace.get_hash() == hash
+    assert list(stacktrace.iter_values()) == ["foo", "foo.py", "bar", "bar.py"]
+
+    frame.update(contributes=False, hint="ignored")
+    assert stacktrace.get_hash() != hash
+    assert list(stacktrace.iter_values()) == ["bar", "bar.py"]
+
+    stacktrace.update(contributes=False)
+    assert stacktrace.get_hash() is None
+
+
+def test_shallow_copy():
+    frame = make_frame("foo", "foo.py")
+    copy = frame.shallow_copy()
+    assert copy.values == frame.values
+    assert copy.values is not frame.values
+
+    copy.update(values=copy.values[:1])
+    assert list(copy.iter_values()) == ["foo"]
+    assert list(frame.iter_values()) == ["foo", "foo.py"]
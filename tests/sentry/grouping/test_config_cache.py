@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.core.cache import cache
+
+from sentry.grouping.api import (
+    LoadedConfigCache,
+    get_default_grouping_config_dict,
+    get_fingerprinting_config_for_project,
+    get_grouping_config_dict_for_project,
+    load_grouping_config,
+)
+from sentry.grouping.enhancer import Enhancements
+from sentry.testutils.cases import TestCase
+
+
+def test_loaded_config_cache():
+    cache = LoadedConfigCache[str]("test", maxsize=2)
+    load = mock.Mock(side_effect=lambda: "loaded")
+
+    assert cache.get_or_load("a", load) == "loaded"
+    assert cache.get_or_load("a", load) == "loaded"
+    assert load.call_count == 1
+
+    cache.get_or_load("b", load)
+    cache.get_or_load("c", load)
+    # "a" was evicted
+    cache.get_or_load("a", load)
+    assert load.call_count == 4
+
+    cache.clear()
+    cache.get_or_load("a", load)
+    assert load.call_count == 5
+
+
+def test_load_grouping_config_cached():
+    config_dict = get_default_grouping_config_dict()
+    with mock.patch.object(Enhancements, "loads", wraps=Enhancements.loads) as loads:
+        config = load_grouping_config(config_dict)
+        assert load_grouping_config(dict(config_dict)) is config
+    assert loads.call_count == 1
+
+    other = load_grouping_config(get_default_grouping_config_dict("mobile:2021-02-12"))
+    assert other is not config
+    assert other.id == "mobile:2021-02-12"
+
+
+class GroupingConfigCacheTest(TestCase):
+    def test_enhancements_cached(self):
+        self.project.update_option("sentry:grouping_enhancements", "function:foo -app")
+        config = get_grouping_config_dict_for_project(self.project)
+
+        # Neither the shared cache nor parsing is needed anymore
+        cache.clear()
+        with mock.patch.object(
+            Enhancements, "from_config_string", wraps=Enhancements.from_config_string
+        ) as from_config_string:
+            assert get_grouping_config_dict_for_project(self.project) == config
+        assert from_config_string.call_count == 0
+
+        self.project.update_option("sentry:grouping_enhancements", "function:bar -app")
+        assert get_grouping_config_dict_for_project(self.project) != config
+
+    def test_fingerprinting_cached(self):
+        self.project.update_option(
+            "sentry:fingerprinting_rules", "error.type:DatabaseUnavailable -> database"
+        )
+        rules = get_fingerprinting_config_for_project(self.project)
+        assert get_fingerprinting_config_for_project(self.project) is rules
+
+        self.project.update_option(
+            "sentry:fingerprinting_rules", "error.type:ConnectionError -> connection"
+        )
+        other = get_fingerprinting_config_for_project(self.project)
+        assert other is not rules
+        assert [rule.fingerprint for rule in other.rules] == [["connection"]]
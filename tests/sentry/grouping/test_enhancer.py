@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Any
+from unittest import mock
 
 import pytest
 
@@ -494,3 +495,45 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", {})
     assert frame.get("in_app")
+
+
+def test_apply_modifications_to_frames_batched():
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo* +app
+        module:lib.* -app category=library
+        error.type:KeyError function:bar +app
+        """
+    )
+
+    def make_stacktraces():
+        frames = [
+            {"function": "foo_a"},
+            {"function": "bar", "module": "lib.utils", "in_app": True},
+            {"function": "main"},
+        ]
+        return [
+            ([dict(frame) for frame in frames], {"type": "ValueError"}),
+            ([dict(frame) for frame in frames], {"type": "KeyError"}),
+            ([dict(frame) for frame in frames], {}),
+            ([dict(frame) for frame in frames], {}),
+        ]
+
+    expected = make_stacktraces()
+    for frames, exception_data in expected:
+        enhancements.apply_modifications_to_frame(frames, "python", exception_data)
+
+    stacktraces = make_stacktraces()
+    enhancements.rust_enhancements = mock.Mock(wraps=enhancements.rust_enhancements)
+    enhancements.apply_modifications_to_frames(stacktraces, "python")
+
+    assert stacktraces == expected
+    assert stacktraces[0][0][1] == {
+        "function": "bar",
+        "module": "lib.utils",
+        "in_app": False,
+        "data": {"orig_in_app": 1, "category": "library"},
+    }
+    assert stacktraces[1][0][1]["in_app"] is True
+    # The last two stacktraces are identical
+    assert enhancements.rust_enhancements.apply_modifications_to_frames.call_count == 3
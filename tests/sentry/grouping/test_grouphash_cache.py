@@ -0,0 +1,105 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from sentry.grouping.grouphash_cache import (
+    cache_grouphashes,
+    get_cached_grouphashes,
+    get_generation,
+    get_grouphashes,
+    get_or_create_grouphashes,
+    invalidate_grouphashes,
+)
+from sentry.models.grouphash import GroupHash
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.eventprocessing import save_new_event
+from sentry.testutils.skips import requires_snuba
+
+pytestmark = [requires_snuba]
+
+CACHE_OPTIONS = {
+    "grouping.grouphash-cache.enabled": True,
+    "grouping.grouphash-cache.local-enabled": True,
+}
+
+
+class GroupHashCacheTest(TestCase):
+    def test_caches_assigned_grouphashes(self):
+        group = self.create_group()
+        with self.options(CACHE_OPTIONS):
+            grouphash, new_grouphash = get_or_create_grouphashes(self.project, ["a" * 32, "b" * 32])
+            assert get_cached_grouphashes(self.project, ["a" * 32, "b" * 32]) == {}
+
+            GroupHash.objects.filter(id=grouphash.id).update(group=group)
+            assert get_grouphashes(self.project, ["a" * 32])["a" * 32].group_id == group.id
+
+            with self.assertNumQueries(0):
+                (cached,) = get_or_create_grouphashes(self.project, ["a" * 32])
+            assert cached.id == grouphash.id
+            assert cached.group_id == group.id
+            assert cached.project == self.project
+
+            # Unassigned grouphashes are always read from the database
+            with self.assertNumQueries(1):
+                (uncached,) = get_or_create_grouphashes(self.project, ["b" * 32])
+            assert uncached.id == new_grouphash.id
+
+    def test_invalidate(self):
+        group = self.create_group()
+        other_group = self.create_group()
+        grouphash = GroupHash.objects.create(project=self.project, hash="a" * 32, group=group)
+
+        with self.options(CACHE_OPTIONS):
+            assert get_grouphashes(self.project, ["a" * 32])["a" * 32].group_id == group.id
+
+            with self.captureOnCommitCallbacks(execute=True):
+                grouphash.update(group=other_group)
+                invalidate_grouphashes(self.project.id, ["a" * 32])
+
+            assert get_cached_grouphashes(self.project, ["a" * 32]) == {}
+            assert get_grouphashes(self.project, ["a" * 32])["a" * 32].group_id == other_group.id
+
+    def test_invalidate_during_lookup(self):
+        group = self.create_group()
+        other_group = self.create_group()
+        grouphash = GroupHash.objects.create(project=self.project, hash="a" * 32, group=group)
+
+        with self.options({"grouping.grouphash-cache.enabled": True}):
+            # A lookup reads the row before it is changed, but only caches it
+            # once the change has been committed and invalidated
+            generation = get_generation(self.project.id)
+            stale = list(GroupHash.objects.filter(project=self.project, hash="a" * 32))
+
+            with self.captureOnCommitCallbacks(execute=True):
+                grouphash.update(group=other_group)
+                invalidate_grouphashes(self.project.id, ["a" * 32])
+
+            cache_grouphashes(self.project.id, stale, generation)
+
+            assert get_cached_grouphashes(self.project, ["a" * 32]) == {}
+            assert get_grouphashes(self.project, ["a" * 32])["a" * 32].group_id == other_group.id
+
+    def test_disabled(self):
+        group = self.create_group()
+        GroupHash.objects.create(project=self.project, hash="a" * 32, group=group)
+
+        get_or_create_grouphashes(self.project, ["a" * 32])
+        with self.options(CACHE_OPTIONS):
+            assert get_cached_grouphashes(self.project, ["a" * 32]) == {}
+
+    def test_grouphash_queries_per_event(self):
+        def count_grouphash_queries(data):
+            with CaptureQueriesContext(connection) as queries:
+                save_new_event(data, self.project)
+            return sum(1 for query in queries if "sentry_grouphash" in query["sql"])
+
+        data = {"message": "Dogs are great!", "fingerprint": ["maisey", "charlie"]}
+        save_new_event(data, self.project)
+
+        uncached = count_grouphash_queries(data)
+        with self.options(CACHE_OPTIONS):
+            # The first event populates the cache
+            count_grouphash_queries(data)
+            cached = count_grouphash_queries(data)
+
+        assert uncached > 0
+        assert cached == 0
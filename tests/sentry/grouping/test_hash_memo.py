@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any
+from unittest import mock
+
+from sentry.event_manager import EventManager
+from sentry.eventstore.models import Event
+from sentry.grouping.api import get_grouping_config_dict_for_project
+from sentry.grouping.ingest import _calculate_event_grouping
+from sentry.testutils.cases import TestCase
+
+MEMO_OPTIONS = {"grouping.hash-memo.enabled": True}
+
+
+def make_exception_data(function: str = "run", **frame: Any) -> dict[str, Any]:
+    return {
+        "platform": "python",
+        "exception": {
+            "values": [
+                {
+                    "type": "ValueError",
+                    "value": "invalid literal",
+                    "stacktrace": {
+                        "frames": [
+                            {"function": "main", "module": "app", "in_app": True},
+                            {"function": function, "module": "app.worker", "in_app": True, **frame},
+                        ]
+                    },
+                }
+            ]
+        },
+    }
+
+
+class HashMemoTest(TestCase):
+    def calculate_grouping(self, data: dict[str, Any]) -> tuple[Event, list[str]]:
+        manager = EventManager(data)
+        manager.normalize()
+        event = Event(self.project.id, uuid.uuid4().hex, data=manager.get_data())
+        config = get_grouping_config_dict_for_project(self.project)
+        return event, list(_calculate_event_grouping(self.project, event, config).hashes)
+
+    def test_reuses_hashes(self):
+        _, expected = self.calculate_grouping(make_exception_data())
+
+        with self.options(MEMO_OPTIONS):
+            self.calculate_grouping(make_exception_data(vars={"x": "1"}))
+            with mock.patch.object(Event, "get_hashes") as get_hashes:
+                event, hashes = self.calculate_grouping(make_exception_data(vars={"x": "2"}))
+
+            assert get_hashes.call_count == 0
+            assert hashes == expected
+            assert event.data["hashes"] == expected
+
+            _, other = self.calculate_grouping(make_exception_data(function="stop"))
+            assert other != expected
+
+    def test_custom_fingerprint(self):
+        with self.options(MEMO_OPTIONS):
+            data = {**make_exception_data(), "fingerprint": ["{{ tags.server_name }}"]}
+            _, a = self.calculate_grouping({**data, "tags": {"server_name": "a"}})
+            _, b = self.calculate_grouping({**data, "tags": {"server_name": "b"}})
+            _, a2 = self.calculate_grouping({**data, "tags": {"server_name": "a"}})
+
+        assert a != b
+        assert a == a2
+
+    def test_server_side_fingerprinting(self):
+        with self.options(MEMO_OPTIONS):
+            _, expected = self.calculate_grouping(make_exception_data())
+
+            self.project.update_option(
+                "sentry:fingerprinting_rules", "error.type:ValueError -> value-error"
+            )
+            event, hashes = self.calculate_grouping(make_exception_data())
+
+        assert hashes != expected
+        assert event.data["_fingerprint_info"]["matched_rule"]["fingerprint"] == ["value-error"]
+
+    def test_main_exception_id_restored(self):
+        data = {
+            "platform": "python",
+            "exception": {
+                "values": [
+                    {
+                        "type": "ValueError",
+                        "value": "inner",
+                        "mechanism": {"type": "chained", "exception_id": 1, "parent_id": 0},
+                    },
+                    {
+                        "type": "ExceptionGroup",
+                        "value": "outer",
+                        "mechanism": {
+                            "type": "generic",
+                            "exception_id": 0,
+                            "is_exception_group": True,
+                        },
+                    },
+                ]
+            },
+        }
+
+        with self.options(MEMO_OPTIONS):
+            first, expected = self.calculate_grouping(data)
+            second, hashes = self.calculate_grouping(data)
+
+        assert first.data["main_exception_id"] == 1
+        assert second.data["main_exception_id"] == 1
+        assert hashes == expected
@@ -80,3 +80,28 @@ def test_dlq_invalid_messages(factories, topic_name, consumer_type) -> None:
 
     assert exc_info.value.partition == partition
     assert exc_info.value.offset == offset
+
+
+@django_db_all
+def test_dlq_invalid_messages_save_batch() -> None:
+    # Messages are validated before transaction events are batched for saving
+    partition = Partition(Topic(TopicNames.INGEST_TRANSACTIONS.value), 0)
+    offset = 5
+
+    factory = IngestStrategyFactory(
+        ConsumerType.Transactions,
+        reprocess_only_stuck_events=False,
+        num_processes=1,
+        max_batch_size=1,
+        max_batch_time=1,
+        input_block_size=None,
+        output_block_size=None,
+        save_batch_size=10,
+    )
+    strategy = factory.create_with_partitions(Mock(), Mock())
+
+    with pytest.raises(InvalidMessage) as exc_info:
+        strategy.submit(make_message(b"bogus message", partition, offset))
+
+    assert exc_info.value.partition == partition
+    assert exc_info.value.offset == offset
@@ -17,7 +17,9 @@ from django.conf import settings
 
 from sentry import eventstore
 from sentry.event_manager import EventManager
+from sentry.eventstore.processing import event_processing_store
 from sentry.ingest.consumer.processors import (
+    SaveEventBatch,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
@@ -27,6 +29,7 @@ from sentry.models.debugfile import create_files_from_dif_zip
 from sentry.models.eventattachment import EventAttachment
 from sentry.models.userreport import UserReport
 from sentry.options import set
+from sentry.tasks import store
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.testutils.skips import requires_snuba
 from sentry.usage_accountant import accountant
@@ -156,6 +159,141 @@ def test_transactions_spawn_save_event_transaction(
     )
 
 
+@pytest.fixture
+def save_event_transaction_batch(monkeypatch):
+    mock = Mock()
+    monkeypatch.setattr("sentry.ingest.consumer.processors.save_event_transaction_batch", mock)
+    return mock
+
+
+def get_transaction_payload(project):
+    now = datetime.datetime.now()
+    event = {
+        "type": "transaction",
+        "timestamp": now.isoformat(),
+        "start_timestamp": now.isoformat(),
+        "spans": [],
+        "contexts": {
+            "trace": {
+                "parent_span_id": "8988cec7cc0779c1",
+                "type": "trace",
+                "op": "foobar",
+                "trace_id": "a7d67cf796774551a95be6543cacd459",
+                "span_id": "babaae0d4b7512d9",
+                "status": "ok",
+            }
+        },
+    }
+    return get_normalized_event(event, project)
+
+
+@django_db_all
+def test_transactions_batched(
+    default_project, save_event_transaction, save_event_transaction_batch
+):
+    project_id = default_project.id
+    start_time = time.time() - 3600
+    save_batch = SaveEventBatch(max_size=2)
+
+    def process(payload):
+        process_event(
+            {
+                "payload": json.dumps(payload),
+                "start_time": start_time,
+                "event_id": payload["event_id"],
+                "project_id": project_id,
+                "remote_addr": "127.0.0.1",
+            },
+            project=default_project,
+            save_batch=save_batch,
+        )
+
+    payloads = [get_transaction_payload(default_project) for _ in range(3)]
+    for payload in payloads:
+        process(payload)
+
+    assert not save_event_transaction.delay.called
+    assert save_event_transaction_batch.delay.call_count == 1
+
+    save_batch.flush()
+    assert [call.kwargs for call in save_event_transaction_batch.delay.call_args_list] == [
+        {
+            "project_id": project_id,
+            "events": [
+                {
+                    "cache_key": f"e:{payload['event_id']}:{project_id}",
+                    "start_time": start_time,
+                    "event_id": payload["event_id"],
+                }
+                for payload in batch
+            ],
+        }
+        for batch in (payloads[:2], payloads[2:])
+    ]
+
+    # The events are deduplicated once their batch has been dispatched
+    process(payloads[0])
+    save_batch.flush()
+    assert save_event_transaction_batch.delay.call_count == 2
+
+
+@django_db_all
+def test_transactions_batched_duplicate(
+    default_project, save_event_transaction, save_event_transaction_batch
+):
+    project_id = default_project.id
+    start_time = time.time() - 3600
+    save_batch = SaveEventBatch(max_size=10)
+    payload = get_transaction_payload(default_project)
+
+    for _ in range(2):
+        process_event(
+            {
+                "payload": json.dumps(payload),
+                "start_time": start_time,
+                "event_id": payload["event_id"],
+                "project_id": project_id,
+                "remote_addr": "127.0.0.1",
+            },
+            project=default_project,
+            save_batch=save_batch,
+        )
+
+    save_batch.flush()
+    assert [call.kwargs for call in save_event_transaction_batch.delay.call_args_list] == [
+        {
+            "project_id": project_id,
+            "events": [
+                {
+                    "cache_key": f"e:{payload['event_id']}:{project_id}",
+                    "start_time": start_time,
+                    "event_id": payload["event_id"],
+                }
+            ],
+        }
+    ]
+
+
+@django_db_all
+def test_save_event_transaction_batch(default_project):
+    payloads = [get_transaction_payload(default_project) for _ in range(3)]
+    events = [
+        {
+            "cache_key": event_processing_store.store(payload),
+            "start_time": time.time() - 3600,
+            "event_id": payload["event_id"],
+        }
+        for payload in payloads
+    ]
+
+    store.save_event_transaction_batch(default_project.id, events)
+
+    for payload in payloads:
+        event = eventstore.backend.get_event_by_id(default_project.id, payload["event_id"])
+        assert event is not None
+        assert event.get_event_type() == "transaction"
+
+
 @django_db_all
 def test_accountant_transaction(default_project):
     storage: MemoryMessageStorage[KafkaPayload] = MemoryMessageStorage()
@@ -0,0 +1,50 @@
+from unittest import mock
+
+import pytest
+
+from sentry.ingest.consumer.projects import get_project
+from sentry.models.project import Project
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+
+
+@django_db_all
+def test_get_project_disabled(default_project):
+    with mock.patch.object(
+        Project.objects, "get_from_cache", wraps=Project.objects.get_from_cache
+    ) as get_from_cache:
+        assert get_project(default_project.id) == default_project
+        assert get_project(default_project.id) == default_project
+
+    assert get_from_cache.call_count == 2
+
+
+@django_db_all
+def test_get_project_snapshot(default_project):
+    with (
+        override_options({"store.ingest-project-snapshot-ttl": 10}),
+        mock.patch.object(
+            Project.objects, "get_from_cache", wraps=Project.objects.get_from_cache
+        ) as get_from_cache,
+        mock.patch("sentry.ingest.consumer.projects.time.monotonic", return_value=100.0) as now,
+    ):
+        project = get_project(default_project.id)
+        assert project == default_project
+
+        # The organization is part of the snapshot
+        assert Project.organization.is_cached(project)
+        assert project.organization == default_project.organization
+
+        assert get_project(default_project.id) is project
+        assert get_from_cache.call_count == 1
+
+        now.return_value = 111.0
+        assert get_project(default_project.id) is not project
+        assert get_from_cache.call_count == 2
+
+
+@django_db_all
+def test_get_project_does_not_exist():
+    with override_options({"store.ingest-project-snapshot-ttl": 10}):
+        with pytest.raises(Project.DoesNotExist):
+            get_project(1234567)
@@ -0,0 +1,43 @@
+import copy
+
+import pytest
+
+from sentry.nodestore import dictionaries
+from sentry.nodestore.base import NodeStorage
+from sentry.testutils.helpers import override_options
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+from tests.sentry.nodestore.test_dictionaries import dictionary_dir, make_samples  # noqa: F401
+
+ns = NodeStorage()
+
+
+def encode_all(nodes):
+    return [ns._encode({None: copy.copy(node)}) for node in nodes]
+
+
+def decode_all(values):
+    return [ns._decode(value, subkey=None) for value in values]
+
+
+@requires_benchmark
+@pytest.mark.parametrize("use_dictionaries", [False, True], ids=["legacy", "zstd_dictionary"])
+@pytest.mark.parametrize("operation", ["encode", "decode"])
+def test_benchmark_nodestore_encoding(
+    use_dictionaries, operation, dictionary_dir, benchmark  # noqa: F811
+):
+    # fresh nodes, so that the dictionary was not trained on them
+    nodes = make_samples("python", count=100)
+
+    with override_options({"nodestore.use-zstd-dictionaries": use_dictionaries}):
+        values = encode_all(nodes)
+        if operation == "encode":
+            benchmark(encode_all, nodes)
+        else:
+            benchmark(decode_all, values)
+
+    legacy_size = sum(len(json.dumps(node).encode("utf8")) for node in nodes)
+    benchmark.extra_info["bytes_per_event"] = sum(len(v) for v in values) / len(nodes)
+    benchmark.extra_info["json_bytes_per_event"] = legacy_size / len(nodes)
+    benchmark.extra_info["us_per_event"] = benchmark.stats.stats.mean / len(nodes) * 1e6
+    assert all(dictionaries.is_compressed(v) == use_dictionaries for v in values)
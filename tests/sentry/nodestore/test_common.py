@@ -3,9 +3,13 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
+from django.test import override_settings
 
+from sentry.db.models.fields.node import NodeData, NodeIntegrityFailure
+from sentry.nodestore.base import NodeStorage
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
@@ -91,3 +95,105 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@pytest.fixture
+def local_node_cache():
+    with override_settings(SENTRY_NODESTORE_LOCAL_CACHE_SIZE=1024 * 1024):
+        with mock.patch("sentry.nodestore.base._local_node_cache", None):
+            yield
+
+
+@pytest.mark.usefixtures("local_node_cache")
+def test_local_cache(ns):
+    nodes = [("a" * 32, {"foo": "a"}), ("b" * 32, {"foo": "b"})]
+    for node_id, data in nodes:
+        ns.set(node_id, data)
+
+    with mock.patch.object(ns, "_get_cache_items", return_value={}):
+        with mock.patch.object(ns, "_get_cache_item", return_value=None):
+            assert ns.get(nodes[0][0]) == nodes[0][1]
+            with mock.patch.object(ns, "_get_bytes") as get_bytes:
+                assert ns.get(nodes[0][0]) == nodes[0][1]
+            assert not get_bytes.called
+
+            assert ns.get_multi([n[0] for n in nodes]) == dict(nodes)
+            with mock.patch.object(ns, "_get_bytes_multi") as get_bytes_multi:
+                assert ns.get_multi([n[0] for n in nodes]) == dict(nodes)
+            assert not get_bytes_multi.called
+
+            # writes update and deletes invalidate the local cache
+            ns.set(nodes[0][0], {"foo": "c"})
+            with mock.patch.object(ns, "_get_bytes") as get_bytes:
+                assert ns.get(nodes[0][0]) == {"foo": "c"}
+            assert not get_bytes.called
+            ns.delete(nodes[1][0])
+            assert ns.get(nodes[1][0]) is None
+
+
+@pytest.mark.usefixtures("local_node_cache")
+def test_local_cache_promotes_shared_cache_hits(ns):
+    node_id = "d" * 32
+    with mock.patch.object(ns, "_get_cache_item", return_value={"foo": "d"}):
+        assert ns.get(node_id) == {"foo": "d"}
+
+    with mock.patch.object(ns, "_get_cache_item", return_value=None):
+        with mock.patch.object(ns, "_get_bytes") as get_bytes:
+            assert ns.get(node_id) == {"foo": "d"}
+        assert not get_bytes.called
+
+
+@pytest.mark.usefixtures("local_node_cache")
+def test_local_cache_returns_copies(ns):
+    node_id = "c" * 32
+    ns.set(node_id, {"foo": {"bar": 1}, "_ref": 1, "_ref_version": 2})
+
+    with mock.patch.object(ns, "_get_cache_items", return_value={}):
+        with mock.patch.object(ns, "_get_cache_item", return_value=None):
+            # binding pops the reference from the payload it is given
+            NodeData(node_id, ref_version=2).bind_data(ns.get(node_id), ref=1)
+
+            # the reference is still checked for the locally cached payload
+            with mock.patch.object(ns, "_get_bytes") as get_bytes:
+                with pytest.raises(NodeIntegrityFailure):
+                    NodeData(node_id, ref_version=2).bind_data(ns.get(node_id), ref=2)
+                NodeData(node_id, ref_version=2).bind_data(ns.get(node_id), ref=1)
+            assert not get_bytes.called
+
+            ns.get(node_id)["foo"]["bar"] = 2
+            assert ns.get(node_id)["foo"] == {"bar": 1}
+            assert ns.get_multi([node_id])[node_id]["foo"] == {"bar": 1}
+
+
+def test_get_multi_iter(ns):
+    nodes = [(f"node_{i}", {"foo": i}) for i in range(25)]
+    for node_id, data in nodes:
+        ns.set(node_id, data)
+
+    with (
+        mock.patch.object(ns, "multi_get_shard_size", 4),
+        mock.patch.object(ns, "multi_get_concurrency", 1),
+    ):
+        result = dict(ns.get_multi_iter([n[0] for n in nodes] + ["missing"]))
+        assert ns.get_multi([n[0] for n in nodes]) == dict(nodes)
+
+    assert {k: v for k, v in result.items() if v is not None} == dict(nodes)
+
+
+class InMemoryNodeStorage(NodeStorage):
+    # class level, so that it is shared with the thread pool
+    nodes: dict[str, bytes] = {}
+    multi_get_shard_size = 3
+    multi_get_concurrency = 4
+
+    def _get_bytes_multi(self, id_list):
+        return {id: self.nodes.get(id) for id in id_list}
+
+
+def test_get_multi_concurrent():
+    ns = InMemoryNodeStorage()
+    nodes = {f"node_{i}": {"foo": i} for i in range(20)}
+    InMemoryNodeStorage.nodes = {k: ns._encode({None: dict(v)}) for k, v in nodes.items()}
+
+    assert ns.get_multi(list(nodes)) == nodes
+    assert dict(ns.get_multi_iter(list(nodes))) == nodes
@@ -0,0 +1,86 @@
+import copy
+import uuid
+
+import pytest
+from django.test import override_settings
+
+from sentry.nodestore import dictionaries
+from sentry.nodestore.base import NodeStorage
+from sentry.testutils.helpers import override_options
+from sentry.utils import json
+from sentry.utils.samples import load_data
+
+
+def make_samples(platform, count=300):
+    data = load_data(platform)
+    samples = []
+    for i in range(count):
+        node = copy.deepcopy(data)
+        node["event_id"] = uuid.uuid4().hex
+        node["extra"] = {"i": i}
+        samples.append(node)
+    return samples
+
+
+@pytest.fixture
+def dictionary_dir(tmp_path):
+    samples = [json.dumps(node).encode("utf8") for node in make_samples("python")]
+    dictionary = dictionaries.train_dictionary(samples, 16 * 1024)
+    dictionaries.save_dictionary(str(tmp_path), "python", dictionary)
+
+    with override_settings(SENTRY_NODESTORE_DICTIONARY_DIR=str(tmp_path)):
+        dictionaries.reset_registry()
+        yield tmp_path
+    dictionaries.reset_registry()
+
+
+def test_roundtrip(dictionary_dir):
+    ns = NodeStorage()
+    node = make_samples("python", count=1)[0]
+    legacy = ns._encode({None: copy.deepcopy(node), "unprocessed": {"foo": "bar"}})
+
+    with override_options({"nodestore.use-zstd-dictionaries": True}):
+        encoded = ns._encode({None: copy.deepcopy(node), "unprocessed": {"foo": "bar"}})
+
+    assert dictionaries.is_compressed(encoded)
+    assert len(encoded) < len(legacy)
+    assert ns._decode(encoded, subkey=None) == node
+    assert ns._decode(encoded, subkey="unprocessed") == {"foo": "bar"}
+    # legacy values are still readable
+    assert ns._decode(legacy, subkey=None) == node
+
+
+def test_platform_without_dictionary(dictionary_dir):
+    ns = NodeStorage()
+    with override_options({"nodestore.use-zstd-dictionaries": True}):
+        encoded = ns._encode({None: {"platform": "ruby", "foo": "bar"}})
+
+    assert not dictionaries.is_compressed(encoded)
+    assert ns._decode(encoded, subkey=None) == {"platform": "ruby", "foo": "bar"}
+
+
+def test_default_dictionary(dictionary_dir):
+    samples = [json.dumps(node).encode("utf8") for node in make_samples("javascript")]
+    dictionary = dictionaries.train_dictionary(samples, 16 * 1024)
+    dict_id = dictionaries.save_dictionary(
+        str(dictionary_dir), dictionaries.DEFAULT_PLATFORM, dictionary
+    )
+    dictionaries.reset_registry()
+
+    ns = NodeStorage()
+    with override_options({"nodestore.use-zstd-dictionaries": True}):
+        encoded = ns._encode({None: {"platform": "ruby", "foo": "bar"}})
+
+    assert dictionaries.HEADER.unpack_from(encoded)[2] == dict_id
+    assert ns._decode(encoded, subkey=None) == {"platform": "ruby", "foo": "bar"}
+
+
+def test_missing_dictionary(dictionary_dir):
+    ns = NodeStorage()
+    with override_options({"nodestore.use-zstd-dictionaries": True}):
+        encoded = ns._encode({None: {"platform": "python"}})
+
+    with override_settings(SENTRY_NODESTORE_DICTIONARY_DIR=None):
+        dictionaries.reset_registry()
+        with pytest.raises(dictionaries.DictionaryNotFound):
+            ns._decode(encoded, subkey=None)
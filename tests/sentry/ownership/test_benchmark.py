@@ -0,0 +1,55 @@
+import pytest
+
+from sentry.ownership.grammar import Matcher, Owner, Rule, compile_schema, dump_schema, load_schema
+from sentry.testutils.skips import requires_benchmark
+
+NUM_RULES = 1000
+NUM_FRAMES = 200
+
+
+def make_codeowners_schema():
+    rules = []
+    for i in range(NUM_RULES):
+        if i % 3 == 0:
+            pattern = f"/usr/src/app/components/module{i}/"
+        elif i % 3 == 1:
+            pattern = f"/usr/src/app/views/*{i}.py"
+        else:
+            pattern = f"*.ext{i}"
+        rules.append(Rule(Matcher("codeowners", pattern), [Owner("team", f"team-{i % 20}")]))
+    return dump_schema(rules)
+
+
+def make_event_data():
+    frames = [
+        {
+            "filename": f"app/components/module{i * 7}/file{i % 10}.py",
+            "abs_path": f"/usr/src/app/components/module{i * 7}/file{i % 10}.py",
+            "module": f"app.components.module{i * 7}",
+        }
+        for i in range(NUM_FRAMES)
+    ]
+    return {"platform": "python", "exception": {"values": [{"stacktrace": {"frames": frames}}]}}
+
+
+def match_uncompiled(schema, data):
+    return [rule for rule in load_schema(schema) if rule.test(data)]
+
+
+def match_compiled(schema, data):
+    return compile_schema(schema).matching_rules(data)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("implementation", ["uncompiled", "compiled"])
+def test_benchmark_codeowners_matching(implementation, benchmark):
+    schema = make_codeowners_schema()
+    data = make_event_data()
+
+    expected = match_uncompiled(schema, data)
+    assert expected
+
+    if implementation == "uncompiled":
+        assert benchmark(match_uncompiled, schema, data) == expected
+    else:
+        assert benchmark(match_compiled, schema, data) == expected
@@ -1,9 +1,13 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ownership.grammar import (
+    CompiledSchema,
     Matcher,
     Owner,
     Rule,
+    compile_schema,
     convert_codeowners_syntax,
     convert_schema_to_rules_text,
     dump_schema,
@@ -198,6 +202,44 @@ def test_matcher_test_stacktrace():
     assert not Matcher("path", "*.py").test({})
 
 
+def test_compiled_schema():
+    schema = dump_schema(parse_rules(fixture_data))
+    rules = load_schema(schema)
+    data = {
+        "request": {"url": "http://google.com/search"},
+        "tags": [["foo", "bar"]],
+        "exception": {
+            "values": [
+                {
+                    "stacktrace": {
+                        "frames": [
+                            {"filename": "src/components/app.js", "module": "foo.bar"},
+                            {"filename": "src/sentry/api.py", "module": "foo.bar"},
+                            {"filename": "src/sentry/api.py", "module": "sentry.api"},
+                        ]
+                    }
+                }
+            ]
+        },
+    }
+
+    compiled = compile_schema(schema)
+    assert isinstance(compiled, CompiledSchema)
+    assert compile_schema(dict(schema)) is compiled
+    # The digest of a schema object is only computed once
+    with mock.patch("sentry.ownership.grammar.md5") as mock_md5:
+        assert compile_schema(schema) is compiled
+    assert not mock_md5.called
+
+    matching = compiled.matching_rules(data)
+    assert matching == [rule for rule in rules if rule.test(data)]
+    matchers = [str(rule.matcher) for rule in matching]
+    for matcher in ("path:*.js", "url:http://google.com/*", "tags.foo:bar", "module:foo.bar"):
+        assert matcher in matchers
+    assert "module:foo bar" not in matchers
+    assert compiled.matching_rules({}) == []
+
+
 def test_matcher_test_threads():
     data = {
         "threads": {
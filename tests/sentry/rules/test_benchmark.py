@@ -0,0 +1,94 @@
+import uuid
+
+import pytest
+
+from sentry.eventstore.models import Event
+from sentry.models.rule import Rule
+from sentry.rules.match import MatchType
+from sentry.rules.processor import RuleProcessor
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_benchmark
+
+NUM_RULES = 100
+
+
+def make_rules(project):
+    return [
+        Rule(
+            id=i,
+            project=project,
+            data={
+                "conditions": [
+                    {"id": "sentry.rules.conditions.every_event.EveryEventCondition"},
+                    {
+                        "id": "sentry.rules.filters.tagged_event.TaggedEventFilter",
+                        "key": "server_name",
+                        "match": MatchType.STARTS_WITH,
+                        "value": f"Web-{i % 10}",
+                    },
+                    {
+                        "id": "sentry.rules.filters.event_attribute.EventAttributeFilter",
+                        "attribute": "exception.type",
+                        "match": MatchType.CONTAINS,
+                        "value": "Error",
+                    },
+                    {
+                        "id": "sentry.rules.filters.level.LevelFilter",
+                        "match": MatchType.GREATER_OR_EQUAL,
+                        "level": "40",
+                    },
+                ],
+                "filter_match": "all",
+                "actions": [],
+            },
+        )
+        for i in range(NUM_RULES)
+    ]
+
+
+def evaluate_uncompiled(rp, rules):
+    state = rp.get_state()
+    return [
+        all(rp.condition_matches(condition, state, rule) for condition in rule.data["conditions"])
+        for rule in rules
+    ]
+
+
+def evaluate_compiled(rp, rules):
+    state = rp.get_state()
+    results = []
+    for rule in rules:
+        compiled = rp.get_compiled_rule(rule)
+        results.append(
+            all(
+                rp.predicate_matches(predicate, state, rule)
+                for predicate in compiled.filters + compiled.conditions
+            )
+        )
+    return results
+
+
+@requires_benchmark
+@pytest.mark.parametrize("implementation", ["uncompiled", "compiled"])
+@django_db_all
+def test_benchmark_rule_predicates(implementation, default_project, default_group, benchmark):
+    event = Event(
+        project_id=default_project.id,
+        event_id=uuid.uuid4().hex,
+        data={
+            "platform": "python",
+            "level": "error",
+            "tags": [["level", "error"], ["server_name", "web-3.example.com"]],
+            "exception": {"values": [{"type": "ValueError", "value": "invalid literal"}]},
+        },
+    )
+    rp = RuleProcessor(event.for_group(default_group), False, False, False, False)
+    rules = make_rules(default_project)
+
+    expected = evaluate_uncompiled(rp, rules)
+    assert expected.count(True) == NUM_RULES // 10
+
+    if implementation == "uncompiled":
+        assert benchmark(evaluate_uncompiled, rp, rules) == expected
+    else:
+        assert benchmark(evaluate_compiled, rp, rules) == expected
@@ -0,0 +1,140 @@
+from unittest.mock import patch
+
+from sentry import buffer
+from sentry.buffer.redis import RedisBuffer
+from sentry.models.project import Project
+from sentry.models.rule import Rule
+from sentry.models.rulefirehistory import RuleFireHistory
+from sentry.notifications.types import ActionTargetType
+from sentry.rules.delayed_processing import (
+    PROJECT_ID_BUFFER_LIST_KEY,
+    apply_delayed,
+    process_delayed_alert_conditions,
+)
+from sentry.rules.processor import RuleProcessor
+from sentry.testutils.cases import TestCase
+from sentry.testutils.skips import requires_snuba
+
+pytestmark = [requires_snuba]
+
+EMAIL_ACTION_DATA = {
+    "id": "sentry.mail.actions.NotifyEmailAction",
+    "targetType": ActionTargetType.ISSUE_OWNERS.value,
+    "targetIdentifier": None,
+}
+EVENT_FREQUENCY_CONDITION = "sentry.rules.conditions.event_frequency.EventFrequencyCondition"
+
+
+class DelayedProcessingTest(TestCase):
+    def setUp(self):
+        event = self.store_event(data={}, project_id=self.project.id)
+        self.group_event = next(event.build_group_events())
+        self.group = self.group_event.group
+
+        Rule.objects.filter(project=self.project).delete()
+        self.rule = Rule.objects.create(
+            project=self.project,
+            data={
+                "conditions": [{"id": EVENT_FREQUENCY_CONDITION, "interval": "1h", "value": 1}],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+
+        self.buffer = RedisBuffer()
+        buffer_patch = patch.object(buffer, "backend", self.buffer)
+        buffer_patch.start()
+        self.addCleanup(buffer_patch.stop)
+
+    def apply_rules(self):
+        with self.options({"rules.delayed-processing.projects-allowlist": [self.project.id]}):
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=False,
+                is_regression=False,
+                is_new_group_environment=False,
+                has_reappeared=False,
+            )
+            return list(rp.apply())
+
+    def get_pending(self):
+        return self.buffer.get_hash(model=Project, field={"project_id": self.project.id})
+
+    def test_enqueues_slow_conditions(self):
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook"
+        ) as query_hook:
+            assert self.apply_rules() == []
+
+        assert query_hook.call_count == 0
+        assert list(self.get_pending()) == [f"{self.rule.id}:{self.group.id}"]
+        assert [
+            project_id
+            for project_id, _ in self.buffer.get_sorted_set(
+                PROJECT_ID_BUFFER_LIST_KEY, min=0, max=float("inf")
+            )
+        ] == [self.project.id]
+
+    def test_cheap_conditions_decide_rule(self):
+        self.rule.update(
+            data={
+                "conditions": [
+                    {"id": EVENT_FREQUENCY_CONDITION, "interval": "1h", "value": 1},
+                    {"id": "sentry.rules.conditions.every_event.EveryEventCondition"},
+                ],
+                "action_match": "any",
+                "actions": [EMAIL_ACTION_DATA],
+            }
+        )
+        assert len(self.apply_rules()) == 1
+        assert self.get_pending() == {}
+
+    def test_process_delayed_alert_conditions(self):
+        self.apply_rules()
+        with patch("sentry.rules.delayed_processing.apply_delayed") as mock_apply_delayed:
+            process_delayed_alert_conditions()
+
+        mock_apply_delayed.delay.assert_called_once_with(self.project.id)
+        assert self.buffer.get_sorted_set(PROJECT_ID_BUFFER_LIST_KEY, min=0, max=float("inf")) == []
+
+    def test_apply_delayed_fires(self):
+        self.apply_rules()
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.batch_query_hook",
+            return_value={self.group.id: 5},
+        ) as batch_query_hook:
+            apply_delayed(self.project.id)
+
+        assert batch_query_hook.call_count == 1
+        assert RuleFireHistory.objects.filter(rule=self.rule, group=self.group).count() == 1
+        assert self.get_pending() == {}
+
+    def test_apply_delayed_does_not_fire(self):
+        self.apply_rules()
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.batch_query_hook",
+            return_value={self.group.id: 1},
+        ):
+            apply_delayed(self.project.id)
+
+        assert not RuleFireHistory.objects.filter(rule=self.rule, group=self.group).exists()
+        assert self.get_pending() == {}
+
+    def test_apply_delayed_shares_queries(self):
+        rule_2 = Rule.objects.create(
+            project=self.project,
+            data={
+                "conditions": [{"id": EVENT_FREQUENCY_CONDITION, "interval": "1h", "value": 10}],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        self.apply_rules()
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.batch_query_hook",
+            return_value={self.group.id: 5},
+        ) as batch_query_hook:
+            apply_delayed(self.project.id)
+
+        # The rules only differ in the threshold, so the counts are queried once.
+        assert batch_query_hook.call_count == 1
+        assert RuleFireHistory.objects.filter(rule=self.rule, group=self.group).count() == 1
+        assert not RuleFireHistory.objects.filter(rule=rule_2, group=self.group).exists()
@@ -10,6 +10,7 @@ from django.utils import timezone
 from sentry.constants import ObjectStatus
 from sentry.models.group import GroupStatus
 from sentry.models.grouprulestatus import GroupRuleStatus
+from sentry.models.project import Project
 from sentry.models.projectownership import ProjectOwnership
 from sentry.models.rule import Rule
 from sentry.models.rulefirehistory import RuleFireHistory
@@ -370,6 +371,98 @@ class RuleProcessorTest(TestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    def test_compiled_rules_reused(self):
+        def apply():
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            return rp.apply()
+
+        with patch.object(
+            RuleProcessor, "compile_rule", autospec=True, side_effect=RuleProcessor.compile_rule
+        ) as compile_rule:
+            assert len(apply()) == 1
+            GroupRuleStatus.objects.filter(rule=self.rule).update(last_active=None)
+            assert len(apply()) == 1
+            assert compile_rule.call_count == 1
+
+            # Changing the rule compiles it again
+            self.rule.data = {
+                "conditions": [EVERY_EVENT_COND_DATA],
+                "actions": [EMAIL_ACTION_DATA],
+                "frequency": 5,
+            }
+            self.rule.save()
+            GroupRuleStatus.objects.filter(rule=self.rule).update(last_active=None)
+            assert len(apply()) == 1
+            assert compile_rule.call_count == 2
+
+    def test_compiled_rules_use_current_project(self):
+        from sentry.rules.conditions.every_event import EveryEventCondition
+
+        projects = []
+
+        def passes(condition, event, state):
+            projects.append(condition.project)
+            return True
+
+        with patch.object(EveryEventCondition, "passes", autospec=True, side_effect=passes):
+            for _ in range(2):
+                self.group_event.project = Project.objects.get(id=self.project.id)
+                RuleProcessor(
+                    self.group_event,
+                    is_new=True,
+                    is_regression=True,
+                    is_new_group_environment=True,
+                    has_reappeared=True,
+                ).apply()
+                GroupRuleStatus.objects.filter(rule=self.rule).update(last_active=None)
+
+        # The conditions are bound to the project of the event they evaluate
+        assert len(projects) == 2
+        assert projects[1] is self.group_event.project
+
+    def test_frequency_queries_shared_between_rules(self):
+        frequency_condition = {
+            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "interval": "1h",
+            "value": 0,
+        }
+        self.rule.update(data={"conditions": [frequency_condition], "actions": [EMAIL_ACTION_DATA]})
+        Rule.objects.create(
+            project=self.group_event.project,
+            data={
+                "conditions": [{**frequency_condition, "value": 10}],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        Rule.objects.create(
+            project=self.group_event.project,
+            data={
+                "conditions": [{**frequency_condition, "interval": "1d"}],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook",
+            return_value=5,
+        ) as query_hook:
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=False,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            rp.apply()
+
+        # Both "1h" conditions share a single query, the "1d" one needs its own.
+        assert query_hook.call_count == 2
+
 
 class MockFilterTrue(EventFilter):
     id = "tests.sentry.rules.test_processor.MockFilterTrue"
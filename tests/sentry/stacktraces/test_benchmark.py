@@ -0,0 +1,44 @@
+import pytest
+
+from sentry.stacktraces.functions import trim_native_function_name
+from sentry.stacktraces.platform import get_behavior_family_for_platform
+from sentry.stacktraces.processing import find_stacktraces_in_data
+from sentry.testutils.skips import requires_benchmark
+from tests.sentry.grouping import grouping_input as grouping_inputs
+
+
+def get_native_symbols():
+    """
+    All native function names from the grouping inputs, as ``(function,
+    platform)`` pairs, in the order they appear in the events.
+    """
+    symbols = []
+    for grouping_input in grouping_inputs:
+        data = grouping_input.data
+        for stacktrace_info in find_stacktraces_in_data(data):
+            for frame in stacktrace_info.get_frames():
+                platform = frame.get("platform") or data.get("platform")
+                if frame.get("function") and get_behavior_family_for_platform(platform) == "native":
+                    symbols.append((frame["function"], platform))
+    return symbols
+
+
+def trim_all(trim, symbols):
+    return [trim(function, platform) for function, platform in symbols]
+
+
+@requires_benchmark
+@pytest.mark.parametrize("implementation", ["uncached", "cached"])
+def test_benchmark_trim_native_function_name(implementation, benchmark):
+    symbols = get_native_symbols()
+    assert symbols
+
+    uncached = trim_native_function_name.__wrapped__
+    expected = trim_all(uncached, symbols)
+
+    if implementation == "uncached":
+        assert benchmark(trim_all, uncached, symbols) == expected
+    else:
+        trim_native_function_name.cache_clear()
+        assert benchmark(trim_all, trim_native_function_name, symbols) == expected
+        benchmark.extra_info.update(trim_native_function_name.cache_info()._asdict())
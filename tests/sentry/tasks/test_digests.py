@@ -9,7 +9,7 @@ from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.notifications import event_to_record
 from sentry.models.projectownership import ProjectOwnership
 from sentry.models.rule import Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.tasks.digests import deliver_digest, deliver_digests
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.skips import requires_snuba
@@ -77,3 +77,49 @@ class DeliverDigestTest(TestCase):
     def test_no_records(self):
         # This shouldn't error if no records are present
         deliver_digest(f"mail:p:{self.project.id}:IssueOwners:")
+
+
+class DeliverDigestsTest(TestCase):
+    def add_records(self, backend: RedisBackend, key: str, rule: Rule) -> None:
+        for fingerprint in ["group-1", "group-2"]:
+            event = self.store_event(
+                data={"timestamp": iso_format(before_now(days=1)), "fingerprint": [fingerprint]},
+                project_id=self.project.id,
+            )
+            backend.add(
+                key,
+                event_to_record(event, [rule], str(uuid.uuid4())),
+                increment_delay=0,
+                maximum_delay=0,
+            )
+
+    def test_deliver_digests(self):
+        with mock.patch.object(sentry, "digests") as digests:
+            backend = RedisBackend()
+            digests.digest_many = backend.digest_many
+
+            rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+            ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
+            keys = [
+                f"mail:p:{self.project.id}:IssueOwners::AllMembers",
+                f"mail:p:{self.project.id}:Member:{self.user.id}",
+            ]
+            for key in keys:
+                self.add_records(backend, key, rule)
+
+            with self.tasks():
+                deliver_digests(keys)
+
+        assert len(mail.outbox) == 2
+        for message in mail.outbox:
+            assert "2 new alerts since" in message.subject
+
+    def test_missing_project(self):
+        with mock.patch.object(sentry, "digests") as digests:
+            deliver_digests(["mail:p:1234567:IssueOwners:"])
+
+        digests.delete.assert_called_once_with("mail:p:1234567:IssueOwners:")
+
+    def test_no_records(self):
+        # This shouldn't error if no records are present
+        deliver_digests([f"mail:p:{self.project.id}:IssueOwners:"])
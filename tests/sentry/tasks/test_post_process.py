@@ -10,6 +10,7 @@ from unittest import mock
 from unittest.mock import Mock, patch
 
 import pytest
+from celery.exceptions import SoftTimeLimitExceeded
 from django.db import router
 from django.test import override_settings
 from django.utils import timezone
@@ -60,6 +61,7 @@ from sentry.tasks.post_process import (
     feedback_filter_decorator,
     locks,
     post_process_group,
+    post_process_group_batch,
     process_event,
     run_post_process_job,
 )
@@ -2333,6 +2335,221 @@ class PostProcessGroupErrorTest(
             },
         )
 
+    @override_options(
+        {
+            "post-process.step-profiling.sample-rate": 1.0,
+            "post-process.step-profiling.log-summary": True,
+        }
+    )
+    @patch("sentry.utils.metrics.distribution")
+    @patch("sentry.tasks.post_process.logger")
+    def test_step_profiling(self, mock_logger, mock_distribution):
+        event = self.create_event(data={"message": "hello"}, project_id=self.project.id)
+        self.call_post_process_group(
+            is_new=True, is_regression=False, is_new_group_environment=True, event=event
+        )
+
+        mock_distribution.assert_any_call(
+            "tasks.post_process.run_post_process_job.pipeline.db_queries",
+            mock.ANY,
+            tags={"pipeline": "process_rules", "issue_category": "error"},
+        )
+
+        [summary] = [
+            call
+            for call in mock_logger.info.call_args_list
+            if call.args == ("post_process.pipeline_profile",)
+        ]
+        steps = summary.kwargs["extra"]["steps"]
+        assert summary.kwargs["extra"]["event_id"] == event.event_id
+        assert set(steps) >= {"process_rules", "process_inbox_adds", "handle_owner_assignment"}
+        assert set(steps["process_rules"]) == {
+            "duration",
+            "db_queries",
+            "redis_commands",
+            "snuba_queries",
+        }
+        # Creating the inbox entry of a new group takes a query at least
+        assert steps["process_inbox_adds"]["db_queries"] > 0
+
+    @patch("sentry.tasks.post_process.logger")
+    def test_step_profiling_disabled(self, mock_logger):
+        event = self.create_event(data={"message": "hello"}, project_id=self.project.id)
+        with patch("sentry.tasks.post_process.record_resource_usage") as mock_record:
+            self.call_post_process_group(
+                is_new=True, is_regression=False, is_new_group_environment=True, event=event
+            )
+
+        assert mock_record.call_count == 0
+        assert ("post_process.pipeline_profile",) not in [
+            call.args for call in mock_logger.info.call_args_list
+        ]
+
+
+class PostProcessGroupBatchErrorTest(
+    TestCase,
+    AssignmentTestMixin,
+    CorePostProcessGroupTestMixin,
+    InboxTestMixin,
+    RuleProcessorTestMixin,
+    ServiceHooksTestMixin,
+):
+    def create_event(self, data, project_id, assert_no_errors=True):
+        return self.store_event(data=data, project_id=project_id, assert_no_errors=assert_no_errors)
+
+    def call_post_process_group(
+        self, is_new, is_regression, is_new_group_environment, event, cache_key=None
+    ):
+        if cache_key is None:
+            cache_key = write_event_to_cache(event)
+        post_process_group_batch(
+            events=[
+                {
+                    "is_new": is_new,
+                    "is_regression": is_regression,
+                    "is_new_group_environment": is_new_group_environment,
+                    "cache_key": cache_key,
+                    "group_id": event.group_id,
+                    "project_id": event.project_id,
+                }
+            ]
+        )
+        return cache_key
+
+    def batch_kwargs(self, event):
+        return {
+            "is_new": False,
+            "is_regression": False,
+            "is_new_group_environment": False,
+            "cache_key": write_event_to_cache(event),
+            "group_id": event.group_id,
+            "project_id": event.project_id,
+        }
+
+    @patch("sentry.tasks.servicehooks.process_service_hook")
+    def test_loads_project_state_once(self, mock_process_service_hook):
+        events = [
+            self.create_event(data={"message": f"hello {i}"}, project_id=self.project.id)
+            for i in range(3)
+        ]
+        hook = self.create_service_hook(
+            project=self.project,
+            organization=self.project.organization,
+            actor=self.user,
+            events=["event.created"],
+        )
+
+        with (
+            self.feature("projects:servicehooks"),
+            patch.object(cache, "get", wraps=cache.get) as cache_get,
+        ):
+            post_process_group_batch(events=[self.batch_kwargs(event) for event in events])
+
+        assert mock_process_service_hook.delay.call_count == 3
+        mock_process_service_hook.delay.assert_any_call(
+            servicehook_id=hook.id, event=EventMatcher(events[0])
+        )
+
+        cache_keys = [call.args[0] for call in cache_get.call_args_list]
+        assert cache_keys.count(f"project:{self.project.id}:rules") == 1
+        assert cache_keys.count(f"servicehooks:1:{self.project.id}") == 1
+        assert cache_keys.count(ProjectOwnership.get_cache_key(self.project.id)) == 1
+
+    def test_deletes_processing_store_keys(self):
+        events = [
+            self.create_event(data={"message": f"hello {i}"}, project_id=self.project.id)
+            for i in range(2)
+        ]
+        batch = [self.batch_kwargs(event) for event in events]
+
+        with patch("sentry.tasks.post_process._post_process_group") as mock_post_process:
+            post_process_group_batch(events=batch)
+            assert mock_post_process.call_count == 2
+
+            # Replaying the batch doesn't post process the events again
+            post_process_group_batch(events=batch)
+            assert mock_post_process.call_count == 2
+
+        for kwargs in batch:
+            assert event_processing_store.get(kwargs["cache_key"]) is None
+
+    def test_skips_events_processed_since_batch_start(self):
+        events = [
+            self.create_event(data={"message": f"hello {i}"}, project_id=self.project.id)
+            for i in range(2)
+        ]
+        batch = [self.batch_kwargs(event) for event in events]
+
+        def process_other_event(**kwargs):
+            # Another task picks up the second event while the first is processed
+            event_processing_store.delete_by_key(batch[1]["cache_key"])
+
+        with patch(
+            "sentry.tasks.post_process._post_process_group", side_effect=process_other_event
+        ) as mock_post_process:
+            post_process_group_batch(events=batch)
+
+        assert mock_post_process.call_count == 1
+
+    def test_failing_event_does_not_fail_batch(self):
+        events = [
+            self.create_event(data={"message": f"hello {i}"}, project_id=self.project.id)
+            for i in range(2)
+        ]
+
+        with patch(
+            "sentry.tasks.post_process._post_process_group", side_effect=[Exception, None]
+        ) as mock_post_process:
+            post_process_group_batch(events=[self.batch_kwargs(event) for event in events])
+
+        assert mock_post_process.call_count == 2
+
+    def test_time_limit_requeues_remaining_events(self):
+        events = [
+            self.create_event(data={"message": f"hello {i}"}, project_id=self.project.id)
+            for i in range(3)
+        ]
+        batch = [self.batch_kwargs(event) for event in events]
+
+        with (
+            patch(
+                "sentry.tasks.post_process._post_process_group",
+                side_effect=[None, SoftTimeLimitExceeded],
+            ),
+            patch.object(post_process_group_batch, "apply_async") as mock_apply_async,
+            pytest.raises(SoftTimeLimitExceeded),
+        ):
+            post_process_group_batch(events=batch, queue="post_process_errors")
+
+        mock_apply_async.assert_called_once_with(
+            kwargs={"events": batch[2:], "queue": "post_process_errors"},
+            queue="post_process_errors",
+        )
+        # The unprocessed event is still in the processing store
+        assert event_processing_store.get(batch[2]["cache_key"]) is not None
+        assert event_processing_store.get(batch[1]["cache_key"]) is None
+
+    def test_time_budget_requeues_remaining_events(self):
+        events = [
+            self.create_event(data={"message": f"hello {i}"}, project_id=self.project.id)
+            for i in range(3)
+        ]
+        batch = [self.batch_kwargs(event) for event in events]
+
+        with (
+            patch("sentry.tasks.post_process.time", side_effect=[0, 0, 0, 1000]),
+            patch("sentry.tasks.post_process._post_process_group") as mock_post_process,
+            patch.object(post_process_group_batch, "apply_async") as mock_apply_async,
+        ):
+            post_process_group_batch(events=batch, queue="post_process_errors")
+
+        assert mock_post_process.call_count == 2
+        mock_apply_async.assert_called_once_with(
+            kwargs={"events": batch[2:], "queue": "post_process_errors"},
+            queue="post_process_errors",
+        )
+        assert event_processing_store.get(batch[2]["cache_key"]) is not None
+
 
 class PostProcessGroupPerformanceTest(
     TestCase,
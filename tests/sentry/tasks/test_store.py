@@ -1,3 +1,4 @@
+import uuid
 from time import time
 from unittest import mock
 
@@ -6,6 +7,7 @@ from django.test.utils import override_settings
 
 from sentry import options, quotas
 from sentry.event_manager import EventManager
+from sentry.eventstore.processing import event_processing_store
 from sentry.exceptions import HashDiscarded
 from sentry.plugins.base.v2 import Plugin2
 from sentry.tasks.store import (
@@ -13,6 +15,7 @@ from sentry.tasks.store import (
     preprocess_event,
     process_event,
     save_event,
+    save_event_transaction_batch,
     time_synthetic_monitoring_event,
 )
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -235,6 +238,36 @@ def test_hash_discarded_raised(default_project, mock_refund, register_plugin):
         # should be caught
 
 
+@django_db_all
+def test_save_event_transaction_batch_falls_back_to_single_saves(default_project):
+    events = []
+    for _ in range(2):
+        event_id = uuid.uuid4().hex
+        cache_key = event_processing_store.store(
+            {
+                "project": default_project.id,
+                "event_id": event_id,
+                "type": "transaction",
+                "platform": "python",
+            }
+        )
+        events.append({"cache_key": cache_key, "start_time": time(), "event_id": event_id})
+
+    with (
+        mock.patch("sentry.event_manager.save_transaction_batch", side_effect=Exception),
+        mock.patch(
+            "sentry.tasks.store._do_save_event", side_effect=[Exception, None]
+        ) as mock_do_save_event,
+    ):
+        save_event_transaction_batch(project_id=default_project.id, events=events)
+
+    # An event that fails to save on its own doesn't keep the others from being saved
+    assert [call.args for call in mock_do_save_event.call_args_list] == [
+        (event["cache_key"], None, event["start_time"], event["event_id"], default_project.id)
+        for event in events
+    ]
+
+
 @pytest.fixture(params=["org", "project"])
 def options_model(request, default_organization, default_project):
     if request.param == "org":
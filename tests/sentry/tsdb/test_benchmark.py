@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from sentry.testutils.skips import requires_benchmark
+from sentry.tsdb.base import BaseTSDB
+from sentry.tsdb.series import TSDBSeries
+
+tsdb = BaseTSDB(rollups=[(3600, 24 * 7)])
+
+# the issue stream serializes stats of up to 100 groups for 24 hours or 14 days
+SHAPES = {"25_keys_24h": (25, 24), "100_keys_24h": (100, 24), "100_keys_14d": (100, 14 * 24)}
+
+
+def make_range(num_keys, num_points):
+    rng = random.Random(num_keys * num_points)
+    timestamps = [i * 3600 for i in range(num_points)]
+    return {
+        key: [(float(ts), rng.randint(0, 1000)) for ts in timestamps] for key in range(num_keys)
+    }
+
+
+def aggregate_dicts(values):
+    sums = {key: sum(p for _, p in points) for key, points in values.items()}
+    return sums, tsdb.rollup(values, 86400)
+
+
+def aggregate_series(series):
+    return series.sums(), series.rollup(86400)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+@pytest.mark.parametrize("implementation", ["dict", "series"])
+def test_benchmark_tsdb_aggregation(shape, implementation, benchmark):
+    values = make_range(*SHAPES[shape])
+    series = TSDBSeries.from_dict(values)
+
+    if implementation == "dict":
+        sums, _ = benchmark(aggregate_dicts, values)
+    else:
+        sums, _ = benchmark(aggregate_series, series)
+
+    assert sums == series.sums()
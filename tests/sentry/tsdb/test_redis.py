@@ -135,6 +135,14 @@ class RedisTSDBTest(TestCase):
             ],
         }
 
+        series = self.db.get_range_array(
+            TSDBModel.project, [1, 2], dts[0], dts[-1], environment_ids=[1, 2]
+        )
+        assert list(series.timestamps) == [timestamp(d) for d in dts]
+        assert series.keys == [1, 2]
+        assert [list(row) for row in series.counts] == [[0, 1, 0, 4], [0, 0, 0, 4]]
+        assert list(series.totals()) == [0, 1, 0, 8]
+
         sum_results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1])
         assert sum_results == {1: 9, 2: 4}
 
@@ -188,6 +196,50 @@ class RedisTSDBTest(TestCase):
         sum_results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert sum_results == {1: 0, 2: 0}
 
+    def test_scripted_writes(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+        self.db.enable_scripted_writes = True
+
+        self.db.incr(TSDBModel.project, 1, dts[0])
+        self.db.incr(TSDBModel.project, 1, dts[1], count=2)
+        self.db.incr_multi(
+            [
+                (TSDBModel.project, 1),
+                (TSDBModel.project, 2),
+                (TSDBModel.group, 3, {"timestamp": dts[2], "count": 5}),
+            ],
+            dts[3],
+            count=3,
+            environment_id=1,
+        )
+
+        assert self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1]) == {1: 6, 2: 3}
+        assert self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1) == {
+            1: 3,
+            2: 3,
+        }
+        assert self.db.get_sums(TSDBModel.group, [3], dts[0], dts[-1]) == {3: 5}
+
+        hash_key, _ = self.db.make_counter_key(TSDBModel.project, 3600, dts[3], 1, None)
+        with self.db.cluster.map() as client:
+            ttl = client.ttl(hash_key)
+        assert ttl.value > 0
+
+        model = TSDBModel.frequent_issues_by_project
+        self.db.record_frequency_multi(
+            ((model, {"organization:1": {"project:1": 1, "project:2": 2}}),), dts[3]
+        )
+        assert self.db.get_most_frequent(
+            model, ("organization:1",), dts[3], dts[3], rollup=3600
+        ) == {"organization:1": [("project:2", 2.0), ("project:1", 1.0)]}
+        key = self.db.make_frequency_table_keys(
+            model, 3600, dts[3].timestamp(), "organization:1", None
+        )[0]
+        with self.db.cluster.map() as client:
+            ttl = client.ttl(key)
+        assert ttl.value > 0
+
     def test_count_distinct(self):
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -0,0 +1,45 @@
+from sentry.tsdb.base import BaseTSDB
+from sentry.tsdb.series import TSDBSeries
+
+RANGE = {
+    1: [(0, 1), (10, 2), (20, 3), (30, 4)],
+    2: [(0, 0), (10, 0), (20, 5), (30, 0)],
+}
+
+
+def test_from_dict_roundtrip():
+    series = TSDBSeries.from_dict(RANGE)
+    assert series.keys == [1, 2]
+    assert list(series.timestamps) == [0, 10, 20, 30]
+    assert series.to_dict() == RANGE
+    assert series.to_dict(float_timestamps=True) == {
+        key: [(float(ts), count) for ts, count in points] for key, points in RANGE.items()
+    }
+
+
+def test_from_dict_with_keys():
+    series = TSDBSeries.from_dict(RANGE, [2, 3, 1])
+    assert series.keys == [2, 3, 1]
+    assert series.sums() == {2: 5, 3: 0, 1: 10}
+
+
+def test_from_flat():
+    series = TSDBSeries.from_flat([0, 10, 20, 30], [1, 2], [1, 2, 3, 4, 0, 0, 5, 0])
+    assert series == TSDBSeries.from_dict(RANGE)
+
+
+def test_aggregations():
+    series = TSDBSeries.from_dict(RANGE)
+    assert series.sums() == {1: 10, 2: 5}
+    assert list(series.totals()) == [1, 2, 8, 4]
+    assert (series + series).sums() == {1: 20, 2: 10}
+    assert TSDBSeries([0, 10], [], []).sums() == {}
+    assert list(TSDBSeries([0, 10], [], []).totals()) == [0, 0]
+
+
+def test_rollup_matches_base():
+    series = TSDBSeries.from_dict(RANGE)
+    expected = BaseTSDB(rollups=[(10, 4)]).rollup(RANGE, 20)
+    assert series.rollup(20).to_dict() == {
+        key: [tuple(point) for point in points] for key, points in expected.items()
+    }
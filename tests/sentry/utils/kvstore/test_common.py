@@ -109,6 +109,12 @@ def test_single_key_operations(properties: Properties) -> None:
     # Test deleting a missing key.
     store.delete(missing_key)
 
+    # Test deleting a key and checking whether it was present.
+    store.set(key, value)
+    assert store.delete_if_present(key) is True
+    assert store.get(key) is None
+    assert store.delete_if_present(key) is False
+
 
 def test_multiple_key_operations(properties: Properties) -> None:
     store = properties.store
@@ -0,0 +1,60 @@
+from unittest import mock
+
+import pytest
+
+from sentry.utils.batch_cache import batch_cache_scope, batch_cached, batch_get_or_fetch
+
+fetch = mock.Mock()
+
+
+@batch_cached
+def cached_fn(arg1, arg2=None):
+    fetch(arg1, arg2)
+    return (arg1, arg2)
+
+
+@pytest.fixture(autouse=True)
+def reset_fetch():
+    fetch.reset_mock()
+
+
+def test_outside_of_scope():
+    assert cached_fn("cat") == ("cat", None)
+    assert cached_fn("cat") == ("cat", None)
+    assert fetch.call_count == 2
+
+
+def test_memoized_in_scope():
+    with batch_cache_scope():
+        assert cached_fn("cat", arg2="dog") == ("cat", "dog")
+        assert cached_fn("cat", arg2="dog") == ("cat", "dog")
+        assert fetch.call_count == 1
+
+        assert cached_fn("cat", arg2="hat") == ("cat", "hat")
+        assert cached_fn("hey") == ("hey", None)
+        assert fetch.call_count == 3
+
+    assert cached_fn("cat", arg2="dog") == ("cat", "dog")
+    assert fetch.call_count == 4
+
+
+def test_nested_scopes():
+    with batch_cache_scope():
+        cached_fn("cat")
+        with batch_cache_scope():
+            cached_fn("cat")
+        cached_fn("cat")
+
+    assert fetch.call_count == 1
+
+
+def test_exceptions_not_memoized():
+    fetch_value = mock.Mock(side_effect=[ValueError, 1])
+
+    with batch_cache_scope():
+        with pytest.raises(ValueError):
+            batch_get_or_fetch("key", fetch_value)
+        assert batch_get_or_fetch("key", fetch_value) == 1
+        assert batch_get_or_fetch("key", fetch_value) == 1
+
+    assert fetch_value.call_count == 2
@@ -0,0 +1,62 @@
+from redis.connection import Connection
+
+from sentry.models.project import Project
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils.redis import redis_clusters
+from sentry.utils.resource_usage import record_resource_usage, record_snuba_queries
+
+
+@django_db_all
+def test_record_resource_usage(default_project):
+    client = redis_clusters.get("default")
+
+    with record_resource_usage() as usage:
+        Project.objects.get(id=default_project.id)
+        client.set("resource-usage", "1")
+        client.get("resource-usage")
+        record_snuba_queries(2)
+
+    assert usage.db_queries == 1
+    assert usage.redis_commands == 2
+    assert usage.snuba_queries == 2
+    assert usage.duration > 0
+
+    # Nothing is recorded after the block exits
+    Project.objects.get(id=default_project.id)
+    client.get("resource-usage")
+    record_snuba_queries(1)
+    assert usage.to_dict() == {
+        "duration": usage.duration,
+        "db_queries": 1,
+        "redis_commands": 2,
+        "snuba_queries": 2,
+    }
+
+
+@django_db_all
+def test_record_resource_usage_nested(default_project):
+    client = redis_clusters.get("default")
+
+    with record_resource_usage() as outer:
+        Project.objects.get(id=default_project.id)
+        with record_resource_usage() as inner:
+            Project.objects.get(id=default_project.id)
+            with client.pipeline(transaction=False) as pipeline:
+                pipeline.get("resource-usage")
+                pipeline.get("resource-usage")
+                pipeline.execute()
+
+    assert (outer.db_queries, outer.redis_commands) == (2, 2)
+    assert (inner.db_queries, inner.redis_commands) == (1, 2)
+
+
+def test_record_resource_usage_unwraps_redis():
+    pack_command = Connection.pack_command
+
+    with record_resource_usage():
+        with record_resource_usage():
+            assert Connection.pack_command is not pack_command
+        assert Connection.pack_command is not pack_command
+
+    # The Redis client is only wrapped while usage is recorded
+    assert Connection.pack_command is pack_command